@@ -1,5 +1,5 @@
 """Configuration package for customer support pipeline."""
 
-from .config import Config, NVIDIAConfig, QdrantConfig, ProcessingConfig
+from .config import Config, NVIDIAConfig, QdrantConfig, ProcessingConfig, RetrievalConfig
 
-__all__ = ["Config", "NVIDIAConfig", "QdrantConfig", "ProcessingConfig"]
+__all__ = ["Config", "NVIDIAConfig", "QdrantConfig", "ProcessingConfig", "RetrievalConfig"]
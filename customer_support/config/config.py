@@ -1,7 +1,7 @@
 """Configuration module for customer support document pipeline."""
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
 
@@ -21,6 +21,11 @@ class NVIDIAConfig:
     embedding_model: str
     rerank_model: str
     request_timeout: int = 60
+    max_concurrent_requests: int = 4
+    max_tokens_per_request: int = 16384
+    max_retries: int = 4
+    embedding_rpm: int = 3000
+    rerank_rpm: int = 3000
     
     def __post_init__(self):
         """Validate required configuration."""
@@ -28,6 +33,16 @@ class NVIDIAConfig:
             raise ValueError("NVIDIA_API_KEY must be set in .env file")
         if not self.api_key.startswith("nvapi-"):
             raise ValueError("NVIDIA_API_KEY must start with 'nvapi-'")
+        if self.max_concurrent_requests <= 0:
+            raise ValueError("EMBEDDING_MAX_CONCURRENCY must be positive")
+        if self.max_tokens_per_request <= 0:
+            raise ValueError("EMBEDDING_MAX_TOKENS_PER_REQUEST must be positive")
+        if self.max_retries < 0:
+            raise ValueError("EMBEDDING_MAX_RETRIES must be non-negative")
+        if self.embedding_rpm < 0:
+            raise ValueError("EMBEDDING_RPM must be non-negative")
+        if self.rerank_rpm < 0:
+            raise ValueError("RERANK_RPM must be non-negative")
 
 
 @dataclass
@@ -37,6 +52,12 @@ class QdrantConfig:
     url: str
     collection_name: str
     embedding_dim: int
+    prefer_grpc: bool = True
+    grpc_port: int = 6334
+    max_concurrent_upserts: int = 8
+    upsert_batch_size: int = 256
+    upsert_retries: int = 2
+    on_disk: bool = True
     
     def __post_init__(self):
         """Validate required configuration."""
@@ -44,6 +65,14 @@ class QdrantConfig:
             raise ValueError("QDRANT_URL must be set in .env file")
         if self.embedding_dim <= 0:
             raise ValueError("EMBEDDING_DIM must be positive")
+        if self.grpc_port <= 0:
+            raise ValueError("QDRANT_GRPC_PORT must be positive")
+        if self.max_concurrent_upserts <= 0:
+            raise ValueError("QDRANT_MAX_CONCURRENT_UPSERTS must be positive")
+        if self.upsert_batch_size <= 0:
+            raise ValueError("QDRANT_UPSERT_BATCH_SIZE must be positive")
+        if self.upsert_retries < 0:
+            raise ValueError("QDRANT_UPSERT_RETRIES must be non-negative")
 
 
 @dataclass
@@ -53,6 +82,8 @@ class ProcessingConfig:
     chunk_size: int
     chunk_overlap: int
     batch_size: int
+    embedding_cache_size: int = 10000
+    pdf_workers: int = 0
     
     def __post_init__(self):
         """Validate required configuration."""
@@ -64,6 +95,39 @@ class ProcessingConfig:
             raise ValueError("CHUNK_OVERLAP must be less than CHUNK_SIZE")
         if self.batch_size <= 0:
             raise ValueError("BATCH_SIZE must be positive")
+        if self.embedding_cache_size < 0:
+            raise ValueError("EMBEDDING_CACHE_SIZE must be non-negative")
+        if self.pdf_workers < 0:
+            raise ValueError("PDF_WORKERS must be non-negative")
+
+
+@dataclass
+class RetrievalConfig:
+    """Retrieval and reranking configuration."""
+    
+    rerank_skip_margin: float = 0.15
+    rerank_max_chars: int = 2000
+    cache_capacity: int = 1000
+    cache_ttl_seconds: float = 3600.0
+    local_search: bool = False
+    local_search_max_points: int = 100000
+    rerank_onnx_path: Optional[str] = None
+    rerank_tokenizer_path: Optional[str] = None
+    
+    def __post_init__(self):
+        """Validate required configuration."""
+        if self.rerank_skip_margin < 0:
+            raise ValueError("RERANK_SKIP_MARGIN must be non-negative")
+        if self.rerank_max_chars <= 0:
+            raise ValueError("RERANK_MAX_CHARS must be positive")
+        if self.cache_capacity <= 0:
+            raise ValueError("QUERY_CACHE_SIZE must be positive")
+        if self.cache_ttl_seconds < 0:
+            raise ValueError("QUERY_CACHE_TTL must be non-negative")
+        if self.local_search_max_points <= 0:
+            raise ValueError("LOCAL_SEARCH_MAX_POINTS must be positive")
+        if self.rerank_onnx_path and not self.rerank_tokenizer_path:
+            raise ValueError("RERANK_TOKENIZER_PATH must be set when RERANK_ONNX_PATH is set")
 
 
 @dataclass
@@ -73,6 +137,7 @@ class Config:
     nvidia: NVIDIAConfig
     qdrant: QdrantConfig
     processing: ProcessingConfig
+    retrieval: RetrievalConfig = field(default_factory=RetrievalConfig)
     
     @classmethod
     def from_env(cls) -> "Config":
@@ -84,16 +149,39 @@ class Config:
                 rerank_url=os.getenv("NVIDIA_RERANK_URL", ""),
                 embedding_model=os.getenv("EMBEDDING_MODEL", "nvidia/llama-3.2-nemoretriever-300m-embed-v2"),
                 rerank_model=os.getenv("RERANK_MODEL", "nvidia/llama-3.2-nv-rerankqa-1b-v2"),
-                request_timeout=int(os.getenv("REQUEST_TIMEOUT", "60"))
+                request_timeout=int(os.getenv("REQUEST_TIMEOUT", "60")),
+                max_concurrent_requests=int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4")),
+                max_tokens_per_request=int(os.getenv("EMBEDDING_MAX_TOKENS_PER_REQUEST", "16384")),
+                max_retries=int(os.getenv("EMBEDDING_MAX_RETRIES", "4")),
+                embedding_rpm=int(os.getenv("EMBEDDING_RPM", "3000")),
+                rerank_rpm=int(os.getenv("RERANK_RPM", "3000"))
             ),
             qdrant=QdrantConfig(
                 url=os.getenv("QDRANT_URL", "http://localhost:6333"),
                 collection_name=os.getenv("COLLECTION_NAME", "customer_support_docs"),
-                embedding_dim=int(os.getenv("EMBEDDING_DIM", "2048"))
+                embedding_dim=int(os.getenv("EMBEDDING_DIM", "2048")),
+                prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "true").lower() == "true",
+                grpc_port=int(os.getenv("QDRANT_GRPC_PORT", "6334")),
+                max_concurrent_upserts=int(os.getenv("QDRANT_MAX_CONCURRENT_UPSERTS", "8")),
+                upsert_batch_size=int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256")),
+                upsert_retries=int(os.getenv("QDRANT_UPSERT_RETRIES", "2")),
+                on_disk=os.getenv("QDRANT_ON_DISK", "true").lower() == "true"
             ),
             processing=ProcessingConfig(
                 chunk_size=int(os.getenv("CHUNK_SIZE", "512")),
                 chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "50")),
-                batch_size=int(os.getenv("BATCH_SIZE", "10"))
+                batch_size=int(os.getenv("BATCH_SIZE", "10")),
+                embedding_cache_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "10000")),
+                pdf_workers=int(os.getenv("PDF_WORKERS", "0"))
+            ),
+            retrieval=RetrievalConfig(
+                rerank_skip_margin=float(os.getenv("RERANK_SKIP_MARGIN", "0.15")),
+                rerank_max_chars=int(os.getenv("RERANK_MAX_CHARS", "2000")),
+                cache_capacity=int(os.getenv("QUERY_CACHE_SIZE", "1000")),
+                cache_ttl_seconds=float(os.getenv("QUERY_CACHE_TTL", "3600")),
+                local_search=os.getenv("LOCAL_SEARCH", "false").lower() == "true",
+                local_search_max_points=int(os.getenv("LOCAL_SEARCH_MAX_POINTS", "100000")),
+                rerank_onnx_path=os.getenv("RERANK_ONNX_PATH") or None,
+                rerank_tokenizer_path=os.getenv("RERANK_TOKENIZER_PATH") or None
             )
         )
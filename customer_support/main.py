@@ -1,11 +1,62 @@
 """Main script for running the customer support document pipeline."""
 
 import argparse
+import asyncio
 import logging
 from pathlib import Path
 
 from config.config import Config
 from src.load_data import CustomerSupportPipeline, SearchPipeline, setup_logging
+from src.retrieval import RetrievalPipeline
+
+
+async def search_interactive(config: Config, top_k: int, score_threshold: float = None):
+    """Run an interactive search loop.
+    
+    Vector-search results are printed as soon as they arrive and are
+    followed by the reranked results once reranking completes.
+    
+    Args:
+        config: Main configuration object
+        top_k: Number of results to show per query
+        score_threshold: Minimum similarity score threshold
+    """
+    pipeline = RetrievalPipeline(config)
+    
+    print("\n" + "=" * 60)
+    print("INTERACTIVE SEARCH (empty query or 'exit' to quit)")
+    print("=" * 60)
+    
+    try:
+        while True:
+            query = input("\nQuery: ").strip()
+            
+            if not query or query.lower() in ("exit", "quit"):
+                break
+            
+            print("⏳ Searching...")
+            
+            async for stage, results in pipeline.search_stream(
+                query,
+                top_k=top_k,
+                score_threshold=score_threshold
+            ):
+                title = "VECTOR RESULTS" if stage == "vector" else "RERANKED RESULTS"
+                print("\n" + "=" * 60)
+                print(title)
+                print("=" * 60)
+                
+                if not results:
+                    print("No results found.")
+                    continue
+                
+                for i, result in enumerate(results, 1):
+                    score = result.get("rerank_score", result["score"])
+                    print(f"\n--- Result {i} (Score: {score:.4f}) ---")
+                    print(f"Source: {result['source_filename']}")
+                    print(f"Text: {result['text'][:300]}...")
+    finally:
+        await pipeline.close()
 
 
 def main():
@@ -31,6 +82,16 @@ def main():
         default=None,
         help="Path to log file (optional)"
     )
+    process_parser.add_argument(
+        "--fast-ingest",
+        action="store_true",
+        help="Suspend HNSW indexing while storing chunks (search is slow until re-indexed)"
+    )
+    process_parser.add_argument(
+        "--skip-embedded",
+        action="store_true",
+        help="Skip PDFs whose contents are already stored in the collection"
+    )
     
     # Search command
     search_parser = subparsers.add_parser("search", help="Search documents")
@@ -51,6 +112,35 @@ def main():
         default=None,
         help="Minimum similarity score threshold (0-1)"
     )
+    search_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=".cache/emb",
+        help="Directory for cached query embeddings (default: .cache/emb)"
+    )
+    search_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the query embedding cache"
+    )
+    
+    # Interactive command
+    interactive_parser = subparsers.add_parser(
+        "interactive",
+        help="Interactive search with reranking"
+    )
+    interactive_parser.add_argument(
+        "--top-k",
+        type=int,
+        default=5,
+        help="Number of results to return (default: 5)"
+    )
+    interactive_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=None,
+        help="Minimum similarity score threshold (0-1)"
+    )
     
     # Info command
     info_parser = subparsers.add_parser("info", help="Get collection info")
@@ -84,10 +174,14 @@ def main():
             
             if path.is_file():
                 logger.info(f"Processing single file: {path}")
-                stats = pipeline.process_file(path)
+                stats = pipeline.process_file(
+                    path, fast_ingest=args.fast_ingest, skip_embedded=args.skip_embedded
+                )
             elif path.is_dir():
                 logger.info(f"Processing directory: {path}")
-                stats = pipeline.process_directory(path)
+                stats = pipeline.process_directory(
+                    path, fast_ingest=args.fast_ingest, skip_embedded=args.skip_embedded
+                )
             else:
                 logger.error(f"Invalid path: {path}")
                 return
@@ -98,14 +192,22 @@ def main():
             print("=" * 60)
             print(f"Documents processed: {stats['documents_processed']}")
             print(f"Documents failed: {stats['documents_failed']}")
+            print(f"Documents skipped: {stats['documents_skipped']}")
             print(f"Total chunks created: {stats['total_chunks']}")
             print(f"Chunks embedded: {stats['chunks_embedded']}")
             print(f"Chunks stored: {stats['chunks_stored']}")
             print("=" * 60)
             
+            if args.fast_ingest:
+                print(
+                    "WARNING: HNSW index is rebuilding in the background; "
+                    "searches will be slow until indexing completes."
+                )
+            
         elif args.command == "search":
             # Search documents
-            search_pipeline = SearchPipeline(config)
+            cache_dir = None if args.no_cache else Path(args.cache_dir)
+            search_pipeline = SearchPipeline(config, cache_dir=cache_dir)
             
             results = search_pipeline.search(
                 query=args.query,
@@ -128,6 +230,9 @@ def main():
                     print(f"Text: {result['text'][:300]}...")
                     print("-" * 60)
             
+        elif args.command == "interactive":
+            asyncio.run(search_interactive(config, args.top_k, args.threshold))
+            
         elif args.command == "info":
             # Get collection info
             pipeline = CustomerSupportPipeline(config)
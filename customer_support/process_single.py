@@ -1,56 +1,195 @@
-"""Process a single PDF document with timeout handling."""
+"""Process a single PDF document with timeout handling.
 
+With ``--stdin``, PDF paths are read one per line and processed by a
+long-lived pipeline, so Docling's models are loaded once per worker rather
+than once per file::
+
+    ls data/*.pdf | python process_single.py --stdin --workers 4
+"""
+
+import argparse
 import sys
 import logging
+from multiprocessing import Pool
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 from config.config import Config
 from src.load_data import CustomerSupportPipeline, setup_logging
 
+logger = logging.getLogger(__name__)
+
+# Per-process pipeline, created once by _load_pipeline
+_pipeline: Optional[CustomerSupportPipeline] = None
+
+
+def _load_pipeline():
+    """Create this process's pipeline (process pool initializer)."""
+    global _pipeline
+
+    setup_logging()
+    config = Config.from_env()
+    logger.info("Configuration loaded successfully")
+    _pipeline = CustomerSupportPipeline(config)
+
+
+def _process_one(pdf_path: Path) -> Tuple[Path, Optional[Dict[str, Any]], Optional[str]]:
+    """Process one PDF with this process's pipeline.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Tuple of (path, pipeline statistics or None, error message or None)
+    """
+    if not pdf_path.exists():
+        return pdf_path, None, f"File not found: {pdf_path}"
+
+    if not pdf_path.suffix.lower() == '.pdf':
+        return pdf_path, None, f"Not a PDF file: {pdf_path}"
+
+    try:
+        logger.info(f"Processing file: {pdf_path.name}")
+        return pdf_path, _pipeline.process_file(pdf_path), None
+    except Exception as e:
+        logger.error(f"Error processing file: {e}", exc_info=True)
+        return pdf_path, None, str(e)
+
+
+def _print_summary(pdf_path: Path, stats: Dict[str, Any]):
+    """Print the per-file pipeline summary.
+
+    Args:
+        pdf_path: Processed PDF file
+        stats: Pipeline statistics from process_file
+    """
+    print("\n" + "=" * 60)
+    print(f"FILE: {pdf_path.name}")
+    print("=" * 60)
+    print(f"Status: {'SUCCESS' if stats['documents_processed'] > 0 else 'FAILED'}")
+    print(f"Chunks created: {stats['total_chunks']}")
+    print(f"Chunks embedded: {stats['chunks_embedded']}")
+    print(f"Chunks stored: {stats['chunks_stored']}")
+    print("=" * 60)
+
+
+def _iter_stdin_paths(lines: Iterable[str]) -> Iterator[Path]:
+    """Yield one path per non-blank input line.
+
+    Args:
+        lines: Input lines (e.g. sys.stdin)
+
+    Yields:
+        Paths to process
+    """
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield Path(line)
+
+
+def _report(pdf_path: Path, stats: Optional[Dict[str, Any]], error: Optional[str]) -> int:
+    """Print the outcome for one file.
+
+    Args:
+        pdf_path: Processed PDF file
+        stats: Pipeline statistics, or None on error
+        error: Error message, or None on success
+
+    Returns:
+        1 if the file failed, otherwise 0
+    """
+    if error is not None:
+        print(f"\nERROR ({pdf_path}): {error}")
+        return 1
+
+    _print_summary(pdf_path, stats)
+    return 0 if stats["documents_processed"] > 0 else 1
+
+
+def _process_stdin(workers: int) -> int:
+    """Process every PDF path read from stdin.
+
+    Args:
+        workers: Number of worker processes, each with its own pipeline
+
+    Returns:
+        Number of files that failed
+    """
+    paths = _iter_stdin_paths(sys.stdin)
+    failed = 0
+
+    if workers > 1:
+        with Pool(processes=workers, initializer=_load_pipeline) as pool:
+            results = pool.imap_unordered(_process_one, paths)
+            for pdf_path, stats, error in results:
+                failed += _report(pdf_path, stats, error)
+    else:
+        _load_pipeline()
+        for pdf_path in paths:
+            failed += _report(*_process_one(pdf_path))
+
+    return failed
+
 
 def main():
-    """Process a single PDF file."""
-    
-    if len(sys.argv) != 2:
+    """Process a single PDF file, or a stream of PDF paths from stdin."""
+
+    parser = argparse.ArgumentParser(description="Process PDF documents")
+    parser.add_argument(
+        "pdf_file",
+        type=str,
+        nargs="?",
+        help="Path to the PDF file"
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read PDF paths from stdin, one per line, reusing one pipeline"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for --stdin mode (default: 1)"
+    )
+    args = parser.parse_args()
+
+    if args.stdin == (args.pdf_file is not None):
         print("Usage: python process_single.py <pdf_file>")
+        print("       python process_single.py --stdin [--workers N] < paths.txt")
         sys.exit(1)
-    
-    pdf_path = Path(sys.argv[1])
-    
+
+    if args.workers < 1:
+        print("Error: --workers must be at least 1")
+        sys.exit(1)
+
+    if args.stdin:
+        sys.exit(1 if _process_stdin(args.workers) else 0)
+
+    pdf_path = Path(args.pdf_file)
+
     if not pdf_path.exists():
         print(f"Error: File not found: {pdf_path}")
         sys.exit(1)
-    
+
     if not pdf_path.suffix.lower() == '.pdf':
         print(f"Error: Not a PDF file: {pdf_path}")
         sys.exit(1)
-    
-    # Setup logging
-    setup_logging()
-    logger = logging.getLogger(__name__)
-    
+
     try:
-        # Load configuration
-        config = Config.from_env()
-        logger.info("Configuration loaded successfully")
-        
         # Initialize pipeline
-        pipeline = CustomerSupportPipeline(config)
-        logger.info(f"Processing file: {pdf_path.name}")
-        
+        _load_pipeline()
+
         # Process the file
-        stats = pipeline.process_file(pdf_path)
-        
-        # Print summary
-        print("\n" + "=" * 60)
-        print(f"FILE: {pdf_path.name}")
-        print("=" * 60)
-        print(f"Status: {'SUCCESS' if stats['documents_processed'] > 0 else 'FAILED'}")
-        print(f"Chunks created: {stats['total_chunks']}")
-        print(f"Chunks embedded: {stats['chunks_embedded']}")
-        print(f"Chunks stored: {stats['chunks_stored']}")
-        print("=" * 60)
-        
+        _, stats, error = _process_one(pdf_path)
+
+        if error is not None:
+            print(f"\nERROR: {error}")
+            sys.exit(1)
+
+        _print_summary(pdf_path, stats)
+
     except Exception as e:
         logger.error(f"Error processing file: {e}", exc_info=True)
         print(f"\nERROR: {e}")
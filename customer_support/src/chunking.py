@@ -1,14 +1,50 @@
 """Document chunking module using Docling's HierarchicalChunker."""
 
 import logging
-from typing import List, Dict, Any, Optional
+import re
+import sys
+from hashlib import blake2b
+from typing import Callable, List, Dict, Any, Iterable, Iterator, Optional
 from dataclasses import dataclass
 
+import numpy as np
 from docling.datamodel.document import DoclingDocument
 from docling.chunking import HierarchicalChunker
 
+from src.data_ingestion import ExtractedDoc
+
 logger = logging.getLogger(__name__)
 
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+def _has_content(text: str) -> bool:
+    """Check whether text contains anything besides whitespace.
+    
+    Stops at the first non-whitespace character instead of allocating a
+    stripped copy of the text.
+    
+    Args:
+        text: Chunk text
+        
+    Returns:
+        True if the text has meaningful content
+    """
+    return _NON_WHITESPACE.search(text) is not None
+
+
+def _chunk_id(source_filepath: str, index: int) -> str:
+    """Build a compact, deterministic chunk ID.
+    
+    Args:
+        source_filepath: Path of the source document
+        index: Chunk position within the document
+        
+    Returns:
+        16-character hex digest, stable across re-ingests of the same file
+    """
+    return blake2b(f"{source_filepath}:{index}".encode("utf-8"), digest_size=8).hexdigest()
+
 
 @dataclass
 class ChunkMetadata:
@@ -48,6 +84,85 @@ class DocumentChunk:
         }
 
 
+@dataclass
+class ChunkBatch:
+    """Chunks stored column-wise (struct-of-arrays) instead of per-chunk objects."""
+    
+    texts: List[str]
+    chunk_ids: List[str]
+    indices: np.ndarray
+    char_counts: np.ndarray
+    total_chunks: np.ndarray
+    source_filenames: List[str]
+    source_filepaths: List[str]
+    original_metadatas: List[Dict[str, Any]]
+    
+    @classmethod
+    def empty(cls) -> "ChunkBatch":
+        """Create a batch with no chunks.
+        
+        Returns:
+            Empty ChunkBatch
+        """
+        no_ints = np.empty(0, dtype=np.int32)
+        return cls([], [], no_ints, no_ints, no_ints, [], [], [])
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def take(self, positions: np.ndarray) -> "ChunkBatch":
+        """Gather a subset of chunks into a new batch.
+        
+        Args:
+            positions: Integer positions of the chunks to keep
+            
+        Returns:
+            ChunkBatch with the selected chunks, in order
+        """
+        return ChunkBatch(
+            texts=[self.texts[i] for i in positions],
+            chunk_ids=[self.chunk_ids[i] for i in positions],
+            indices=self.indices[positions],
+            char_counts=self.char_counts[positions],
+            total_chunks=self.total_chunks[positions],
+            source_filenames=[self.source_filenames[i] for i in positions],
+            source_filepaths=[self.source_filepaths[i] for i in positions],
+            original_metadatas=[self.original_metadatas[i] for i in positions]
+        )
+    
+    def to_chunks(self) -> List[DocumentChunk]:
+        """Convert the batch to DocumentChunk objects.
+        
+        Returns:
+            List of DocumentChunk objects
+        """
+        return [
+            DocumentChunk(
+                text=text,
+                metadata=ChunkMetadata(
+                    chunk_id=chunk_id,
+                    chunk_index=index,
+                    source_filename=source_filename,
+                    source_filepath=source_filepath,
+                    total_chunks=total,
+                    char_count=char_count,
+                    original_metadata=original_metadata
+                )
+            )
+            for text, chunk_id, index, char_count, total,
+                source_filename, source_filepath, original_metadata in zip(
+                self.texts,
+                self.chunk_ids,
+                self.indices.tolist(),
+                self.char_counts.tolist(),
+                self.total_chunks.tolist(),
+                self.source_filenames,
+                self.source_filepaths,
+                self.original_metadatas
+            )
+        ]
+
+
 class DocumentChunker:
     """Handles document chunking using Docling's HierarchicalChunker.
     
@@ -59,14 +174,14 @@ class DocumentChunker:
         self.chunker = HierarchicalChunker()
         logger.info("DocumentChunker initialized with HierarchicalChunker")
     
-    def chunk_document(
-        self, 
+    def chunk_document_batch(
+        self,
         document: DoclingDocument,
         source_filename: str,
         source_filepath: str,
         original_metadata: Optional[Dict[str, Any]] = None
-    ) -> List[DocumentChunk]:
-        """Chunk a single Docling document.
+    ) -> ChunkBatch:
+        """Chunk a single Docling document into a column-oriented batch.
         
         Args:
             document: DoclingDocument to chunk
@@ -75,80 +190,114 @@ class DocumentChunker:
             original_metadata: Optional metadata from the original document
             
         Returns:
-            List of DocumentChunk objects
+            ChunkBatch with one entry per chunk (empty on error)
         """
         try:
-            logger.info(f"Chunking document: {source_filename}")
+            logger.info("Chunking document: %s", source_filename)
             
             # Perform chunking
-            doc_chunks = list(self.chunker.chunk(document))
-            total_chunks = len(doc_chunks)
-            
-            logger.info(f"Created {total_chunks} chunks from {source_filename}")
-            
-            # Convert to DocumentChunk objects
-            result_chunks = []
-            
-            for idx, chunk in enumerate(doc_chunks):
-                chunk_text = chunk.text
-                char_count = len(chunk_text)
-                
-                # Create unique chunk ID
-                chunk_id = f"{source_filename}_chunk_{idx}"
-                
-                metadata = ChunkMetadata(
-                    chunk_id=chunk_id,
-                    chunk_index=idx,
-                    source_filename=source_filename,
-                    source_filepath=source_filepath,
-                    total_chunks=total_chunks,
-                    char_count=char_count,
-                    original_metadata=original_metadata or {}
-                )
-                
-                result_chunks.append(DocumentChunk(
-                    text=chunk_text,
-                    metadata=metadata
-                ))
+            texts = [chunk.text for chunk in self.chunker.chunk(document)]
+            total_chunks = len(texts)
+            
+            logger.info("Created %d chunks from %s", total_chunks, source_filename)
             
-            return result_chunks
+            # Every chunk references the same source strings and metadata dict
+            source_filename = sys.intern(source_filename)
+            source_filepath = sys.intern(source_filepath)
+            shared_metadata = original_metadata or {}
+            
+            return ChunkBatch(
+                texts=texts,
+                chunk_ids=[_chunk_id(source_filepath, idx) for idx in range(total_chunks)],
+                indices=np.arange(total_chunks, dtype=np.int32),
+                char_counts=np.fromiter(map(len, texts), dtype=np.int32, count=total_chunks),
+                total_chunks=np.full(total_chunks, total_chunks, dtype=np.int32),
+                source_filenames=[source_filename] * total_chunks,
+                source_filepaths=[source_filepath] * total_chunks,
+                original_metadatas=[shared_metadata] * total_chunks
+            )
             
         except Exception as e:
-            logger.error(f"Error chunking document {source_filename}: {e}", exc_info=True)
-            return []
+            logger.error("Error chunking document %s: %s", source_filename, e, exc_info=True)
+            return ChunkBatch.empty()
     
-    def chunk_documents(
+    def chunk_document(
         self, 
-        extracted_data: List[Dict[str, Any]]
+        document: DoclingDocument,
+        source_filename: str,
+        source_filepath: str,
+        original_metadata: Optional[Dict[str, Any]] = None
     ) -> List[DocumentChunk]:
-        """Chunk multiple documents.
+        """Chunk a single Docling document.
         
         Args:
-            extracted_data: List of dictionaries from DocumentExtractor
+            document: DoclingDocument to chunk
+            source_filename: Name of the source file
+            source_filepath: Path to the source file
+            original_metadata: Optional metadata from the original document
             
         Returns:
-            List of all DocumentChunk objects from all documents
+            List of DocumentChunk objects
         """
-        all_chunks = []
+        return self.chunk_document_batch(
+            document, source_filename, source_filepath, original_metadata
+        ).to_chunks()
+    
+    def chunk_batches_streaming(
+        self,
+        extracted_data: Iterable[ExtractedDoc]
+    ) -> Iterator[ChunkBatch]:
+        """Chunk documents lazily as they arrive, one batch per document.
         
+        Args:
+            extracted_data: Iterable of ExtractedDoc records from DocumentExtractor
+            
+        Yields:
+            ChunkBatch for each successfully extracted document
+        """
         for data in extracted_data:
             # Skip documents that failed processing
-            if data["document"] is None or not data["metadata"]["success"]:
-                logger.warning(
-                    f"Skipping failed document: {data['metadata']['filename']}"
-                )
+            if data.document is None or not data.success:
+                logger.warning("Skipping failed document: %s", data.filename)
                 continue
             
-            chunks = self.chunk_document(
-                document=data["document"],
-                source_filename=data["metadata"]["filename"],
-                source_filepath=data["metadata"]["filepath"],
-                original_metadata=data["metadata"]
+            yield self.chunk_document_batch(
+                document=data.document,
+                source_filename=data.filename,
+                source_filepath=data.filepath,
+                original_metadata=data.metadata_dict()
             )
+    
+    def chunk_documents_streaming(
+        self,
+        extracted_data: Iterable[ExtractedDoc]
+    ) -> Iterator[DocumentChunk]:
+        """Chunk documents lazily as they arrive.
+        
+        Args:
+            extracted_data: Iterable of ExtractedDoc records from DocumentExtractor
             
-            all_chunks.extend(chunks)
+        Yields:
+            DocumentChunk objects, one document at a time
+        """
+        for batch in self.chunk_batches_streaming(extracted_data):
+            yield from batch.to_chunks()
+    
+    def chunk_documents(
+        self, 
+        extracted_data: List[ExtractedDoc]
+    ) -> List[DocumentChunk]:
+        """Chunk multiple documents.
         
-        logger.info(f"Total chunks created: {len(all_chunks)}")
+        Args:
+            extracted_data: List of ExtractedDoc records from DocumentExtractor
+            
+        Returns:
+            List of all DocumentChunk objects from all documents
+        """
+        all_chunks = list(self.chunk_documents_streaming(extracted_data))
+        
+        logger.info("Total chunks created: %d", len(all_chunks))
         
         return all_chunks
 
@@ -176,6 +325,32 @@ class ChunkProcessor:
             f"ChunkProcessor initialized (min: {min_chunk_length}, max: {max_chunk_length})"
         )
     
+    def _length_mask(
+        self,
+        lengths: np.ndarray,
+        chunk_id_at: Callable[[int], str]
+    ) -> np.ndarray:
+        """Check length constraints in one vectorized pass.
+        
+        Args:
+            lengths: Character count of each chunk
+            chunk_id_at: Callable returning the chunk ID at a position (for logging)
+            
+        Returns:
+            Boolean mask of chunks within the length limits
+        """
+        too_short = lengths < self.min_chunk_length
+        too_long = lengths > self.max_chunk_length
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in np.flatnonzero(too_short):
+                logger.debug("Skipping chunk %s: too short (%d chars)", chunk_id_at(i), lengths[i])
+        
+        for i in np.flatnonzero(too_long):
+            logger.warning("Skipping chunk %s: too long (%d chars)", chunk_id_at(i), lengths[i])
+        
+        return ~(too_short | too_long)
+    
     def filter_chunks(self, chunks: List[DocumentChunk]) -> List[DocumentChunk]:
         """Filter chunks based on quality criteria.
         
@@ -185,33 +360,30 @@ class ChunkProcessor:
         Returns:
             Filtered list of DocumentChunk objects
         """
+        if not chunks:
+            return []
+        
+        lengths = np.fromiter(
+            (chunk.metadata.char_count for chunk in chunks),
+            dtype=np.int64,
+            count=len(chunks)
+        )
+        keep = self._length_mask(lengths, lambda i: chunks[i].metadata.chunk_id)
+        
         filtered = []
         
-        for chunk in chunks:
-            # Check length constraints
-            if chunk.metadata.char_count < self.min_chunk_length:
-                logger.debug(
-                    f"Skipping chunk {chunk.metadata.chunk_id}: too short "
-                    f"({chunk.metadata.char_count} chars)"
-                )
-                continue
-            
-            if chunk.metadata.char_count > self.max_chunk_length:
-                logger.warning(
-                    f"Skipping chunk {chunk.metadata.chunk_id}: too long "
-                    f"({chunk.metadata.char_count} chars)"
-                )
-                continue
+        for i in np.flatnonzero(keep):
+            chunk = chunks[i]
             
             # Check if chunk has meaningful content (not just whitespace)
-            if not chunk.text.strip():
-                logger.debug(f"Skipping chunk {chunk.metadata.chunk_id}: empty content")
+            if not _has_content(chunk.text):
+                logger.debug("Skipping chunk %s: empty content", chunk.metadata.chunk_id)
                 continue
             
             filtered.append(chunk)
         
         removed = len(chunks) - len(filtered)
-        logger.info(f"Filtered {removed} chunks, {len(filtered)} remaining")
+        logger.info("Filtered %d chunks, %d remaining", removed, len(filtered))
         
         return filtered
     
@@ -240,6 +412,64 @@ class ChunkProcessor:
                 "char_count": chunk.metadata.char_count
             })
         
-        logger.info(f"Prepared {len(prepared)} chunks for embedding")
+        logger.info("Prepared %d chunks for embedding", len(prepared))
+        
+        return prepared
+    
+    def filter_batch(self, batch: ChunkBatch) -> ChunkBatch:
+        """Filter a column-oriented batch based on quality criteria.
+        
+        Args:
+            batch: ChunkBatch to filter
+            
+        Returns:
+            New ChunkBatch with the chunks that passed
+        """
+        if not len(batch):
+            return batch
+        
+        keep = self._length_mask(batch.char_counts, lambda i: batch.chunk_ids[i])
+        
+        # Check if chunk has meaningful content (not just whitespace)
+        positions = [i for i in np.flatnonzero(keep) if _has_content(batch.texts[i])]
+        filtered = batch.take(np.asarray(positions, dtype=np.intp))
+        
+        removed = len(batch) - len(filtered)
+        logger.info("Filtered %d chunks, %d remaining", removed, len(filtered))
+        
+        return filtered
+    
+    def prepare_batch_for_embedding(self, batch: ChunkBatch) -> List[Dict[str, Any]]:
+        """Prepare a column-oriented batch for embedding generation.
+        
+        Args:
+            batch: ChunkBatch to prepare
+            
+        Returns:
+            List of dictionaries ready for embedding
+        """
+        keys = (
+            "text",
+            "metadata",
+            "chunk_id",
+            "chunk_index",
+            "source_filename",
+            "source_filepath",
+            "char_count"
+        )
+        prepared = [
+            dict(zip(keys, row))
+            for row in zip(
+                batch.texts,
+                batch.original_metadatas,
+                batch.chunk_ids,
+                batch.indices.tolist(),
+                batch.source_filenames,
+                batch.source_filepaths,
+                batch.char_counts.tolist()
+            )
+        ]
+        
+        logger.info("Prepared %d chunks for embedding", len(prepared))
         
         return prepared
@@ -1,12 +1,23 @@
 """Data ingestion module using Docling for PDF processing."""
 
+import fnmatch
 import logging
+import mmap
+import multiprocessing
+import os
+from io import BytesIO
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from dataclasses import dataclass, replace
 
 from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.datamodel.base_models import InputFormat
+from docling.datamodel.base_models import DocumentStream, InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.backend.docling_parse_v4_backend import DoclingParseV4DocumentBackend
 from docling.datamodel.document import DoclingDocument
@@ -24,6 +35,281 @@ class DocumentMetadata:
     processing_time: float
     success: bool
     error_message: Optional[str] = None
+    source_sha: str = ""
+
+
+@dataclass(slots=True)
+class ExtractedDoc:
+    """Extracted content and metadata for one PDF."""
+    
+    document: Optional[DoclingDocument]
+    content: str
+    filename: str
+    filepath: str
+    total_pages: int
+    processing_time: float
+    success: bool
+    error_message: Optional[str] = None
+    source_sha: str = ""
+    
+    def metadata_dict(self) -> Dict[str, Any]:
+        """Get the document metadata as stored with each chunk.
+        
+        Returns:
+            Metadata dictionary (includes error_message only for failures)
+        """
+        metadata = {
+            "filename": self.filename,
+            "filepath": self.filepath,
+            "total_pages": self.total_pages,
+            "processing_time": self.processing_time,
+            "success": self.success,
+            "source_sha": self.source_sha
+        }
+        
+        if not self.success:
+            metadata["error_message"] = self.error_message
+        
+        return metadata
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary format used by earlier versions.
+        
+        Returns:
+            Dictionary with document, content and metadata keys
+        """
+        return {
+            "document": self.document,
+            "content": self.content,
+            "metadata": self.metadata_dict()
+        }
+
+
+def file_digest(path: Path) -> str:
+    """Hash a file's contents, used to recognize already-ingested PDFs.
+    
+    Args:
+        path: Path to the file
+        
+    Returns:
+        128-bit BLAKE2b hex digest of the file contents
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return blake2b(b"", digest_size=16).hexdigest()
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return blake2b(mapped, digest_size=16).hexdigest()
+
+
+def _blank_pdf_bytes() -> bytes:
+    """Build a minimal one-page blank PDF used to warm up the converter.
+    
+    Returns:
+        PDF file contents
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>",
+    ]
+    
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref_offset
+    )
+    
+    return bytes(pdf)
+
+
+@dataclass(frozen=True)
+class ConverterOptions:
+    """Docling pipeline options; hashable so converters can be cached per option set."""
+    
+    generate_page_images: bool = False
+    do_ocr: bool = False
+    do_table_structure: bool = True
+
+
+@lru_cache(maxsize=4)
+def _get_converter(options: ConverterOptions) -> DocumentConverter:
+    """Create a configured DocumentConverter, once per process and option set.
+    
+    Args:
+        options: Docling pipeline options
+        
+    Returns:
+        Configured DocumentConverter instance
+    """
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.generate_page_images = options.generate_page_images
+    pipeline_options.do_ocr = options.do_ocr
+    pipeline_options.do_table_structure = options.do_table_structure
+    
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(
+                pipeline_options=pipeline_options,
+                backend=DoclingParseV4DocumentBackend
+            )
+        }
+    )
+
+
+def _get_ocr_fallback(
+    options: ConverterOptions,
+    min_chars_per_page: int
+) -> Optional[DocumentConverter]:
+    """Return the OCR-enabled converter used for scanned PDFs, if applicable.
+    
+    Args:
+        options: Primary Docling pipeline options
+        min_chars_per_page: Text density that triggers OCR (0 disables)
+        
+    Returns:
+        OCR converter, or None if OCR is already on or the fallback is disabled
+    """
+    if options.do_ocr or min_chars_per_page <= 0:
+        return None
+    return _get_converter(replace(options, do_ocr=True))
+
+
+def _text_char_count(document: DoclingDocument) -> int:
+    """Count characters of text extracted from a document's items.
+    
+    Args:
+        document: Converted document
+        
+    Returns:
+        Total number of text characters
+    """
+    return sum(
+        len(item.text)
+        for item, _ in document.iterate_items()
+        if isinstance(getattr(item, "text", None), str)
+    )
+
+
+def _convert_pdf(
+    converter: DocumentConverter,
+    pdf_path: Path,
+    ocr_converter: Optional[DocumentConverter] = None,
+    min_chars_per_page: int = 0,
+    source_sha: Optional[str] = None
+) -> tuple[Optional[DoclingDocument], DocumentMetadata]:
+    """Convert a single PDF file with the given converter.
+    
+    If an OCR converter is given and the text layer is sparser than
+    ``min_chars_per_page``, the file is assumed to be scanned and is
+    converted again with OCR.
+    
+    Args:
+        converter: Docling converter to use
+        pdf_path: Path to the PDF file
+        ocr_converter: Optional OCR-enabled converter for low-text documents
+        min_chars_per_page: Text density below which OCR is used
+        source_sha: Content digest if the caller already computed it
+        
+    Returns:
+        Tuple of (DoclingDocument or None, DocumentMetadata)
+    """
+    start_time = time.time()
+    
+    try:
+        logger.info("Processing PDF: %s", pdf_path.name)
+        
+        # Convert the document
+        result = converter.convert(pdf_path)
+        
+        processing_time = time.time() - start_time
+        
+        if result.document is None:
+            metadata = DocumentMetadata(
+                filename=pdf_path.name,
+                filepath=str(pdf_path),
+                total_pages=0,
+                processing_time=processing_time,
+                success=False,
+                error_message="Document conversion returned None"
+            )
+            logger.error("Failed to convert %s", pdf_path.name)
+            return None, metadata
+        
+        # Extract page count
+        page_count = len(result.document.pages)
+        
+        if (
+            ocr_converter is not None
+            and page_count
+            and _text_char_count(result.document) < min_chars_per_page * page_count
+        ):
+            logger.info("Low text density in %s, retrying with OCR", pdf_path.name)
+            result = ocr_converter.convert(pdf_path)
+            processing_time = time.time() - start_time
+        
+        metadata = DocumentMetadata(
+            filename=pdf_path.name,
+            filepath=str(pdf_path),
+            total_pages=page_count,
+            processing_time=processing_time,
+            success=True,
+            source_sha=source_sha or file_digest(pdf_path)
+        )
+        
+        logger.info(
+            "Successfully processed %s: %d pages in %.2fs",
+            pdf_path.name, page_count, processing_time
+        )
+        
+        return result.document, metadata
+        
+    except Exception as e:
+        processing_time = time.time() - start_time
+        metadata = DocumentMetadata(
+            filename=pdf_path.name,
+            filepath=str(pdf_path),
+            total_pages=0,
+            processing_time=processing_time,
+            success=False,
+            error_message=str(e)
+        )
+        logger.error("Error processing %s: %s", pdf_path.name, e, exc_info=True)
+        return None, metadata
+
+
+def _convert_in_worker(
+    pdf_path: Path,
+    options: ConverterOptions,
+    min_chars_per_page: int,
+    source_sha: Optional[str] = None
+) -> tuple[Optional[Dict[str, Any]], DocumentMetadata]:
+    """Process pool entry point: convert a PDF and export it for pickling.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        options: Docling pipeline options (selects the cached converter)
+        min_chars_per_page: Text density below which OCR is used
+        source_sha: Content digest if the caller already computed it
+        
+    Returns:
+        Tuple of (exported document dict or None, DocumentMetadata)
+    """
+    doc, metadata = _convert_pdf(
+        _get_converter(options),
+        pdf_path,
+        _get_ocr_fallback(options, min_chars_per_page),
+        min_chars_per_page,
+        source_sha
+    )
+    return (doc.export_to_dict() if doc is not None else None), metadata
 
 
 class PDFProcessor:
@@ -32,15 +318,58 @@ class PDFProcessor:
     Single Responsibility: Extract and parse PDF documents.
     """
     
-    def __init__(self, generate_page_images: bool = False):
+    def __init__(
+        self,
+        generate_page_images: bool = False,
+        max_workers: Optional[int] = None,
+        warmup: bool = False,
+        do_ocr: bool = False,
+        do_table_structure: bool = True,
+        ocr_min_chars_per_page: int = 100
+    ):
         """Initialize PDF processor with Docling converter.
         
         Args:
             generate_page_images: If True, generates page images for better HTML previews
+            max_workers: Worker processes for directory conversion
+                (default: CPU count; 1 converts in-process)
+            warmup: If True, load Docling models now instead of on first conversion
+            do_ocr: If True, always run OCR (slow; text-native PDFs do not need it)
+            do_table_structure: If True, run the table structure model
+            ocr_min_chars_per_page: With OCR off, re-convert documents whose text
+                layer has fewer characters per page than this (0 disables)
         """
         self.generate_page_images = generate_page_images
+        self.options = ConverterOptions(
+            generate_page_images=generate_page_images,
+            do_ocr=do_ocr,
+            do_table_structure=do_table_structure
+        )
+        self.ocr_min_chars_per_page = ocr_min_chars_per_page
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.converter = self._create_converter()
         logger.info("PDFProcessor initialized with Docling backend")
+        
+        if warmup:
+            self.warmup()
+    
+    def warmup(self):
+        """Load Docling's models by converting a blank in-memory page.
+        
+        Docling loads layout/OCR models lazily on the first conversion; doing
+        it up front keeps that cost out of the first real document. The
+        converter is cached per process, so later PDFProcessor instances
+        with the same options reuse the loaded models.
+        """
+        start_time = time.time()
+        
+        try:
+            self.converter.convert(
+                DocumentStream(name="warmup.pdf", stream=BytesIO(_blank_pdf_bytes()))
+            )
+            logger.info("Docling converter warmed up in %.2fs", time.time() - start_time)
+        except Exception as e:
+            logger.warning("Docling warmup failed: %s", e)
     
     def _create_converter(self) -> DocumentConverter:
         """Create and configure DocumentConverter.
@@ -48,83 +377,166 @@ class PDFProcessor:
         Returns:
             Configured DocumentConverter instance
         """
-        pipeline_options = PdfPipelineOptions()
-        pipeline_options.generate_page_images = self.generate_page_images
-        
-        converter = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(
-                    pipeline_options=pipeline_options,
-                    backend=DoclingParseV4DocumentBackend
-                )
-            }
-        )
-        
-        return converter
+        return _get_converter(self.options)
     
-    def process_pdf(self, pdf_path: Path) -> tuple[Optional[DoclingDocument], DocumentMetadata]:
+    def process_pdf(
+        self,
+        pdf_path: Path,
+        source_sha: Optional[str] = None
+    ) -> tuple[Optional[DoclingDocument], DocumentMetadata]:
         """Process a single PDF file.
         
         Args:
             pdf_path: Path to the PDF file
+            source_sha: Content digest if the caller already computed it
             
         Returns:
             Tuple of (DoclingDocument or None, DocumentMetadata)
         """
-        import time
+        return _convert_pdf(
+            self.converter,
+            pdf_path,
+            _get_ocr_fallback(self.options, self.ocr_min_chars_per_page),
+            self.ocr_min_chars_per_page,
+            source_sha
+        )
+    
+    def _find_pdfs(self, directory_path: Path, pattern: str) -> List[Path]:
+        """List PDF files in a directory, largest first.
         
-        start_time = time.time()
+        Matching is case-insensitive so ``.PDF`` files are included. Sorting
+        by size lets the process pool start the slowest conversions first
+        instead of finishing on a long straggler.
         
-        try:
-            logger.info(f"Processing PDF: {pdf_path.name}")
-            
-            # Convert the document
-            result = self.converter.convert(pdf_path)
-            
-            processing_time = time.time() - start_time
-            
-            if result.document is None:
-                metadata = DocumentMetadata(
-                    filename=pdf_path.name,
-                    filepath=str(pdf_path),
-                    total_pages=0,
-                    processing_time=processing_time,
-                    success=False,
-                    error_message="Document conversion returned None"
-                )
-                logger.error(f"Failed to convert {pdf_path.name}")
-                return None, metadata
+        Args:
+            directory_path: Path to directory containing PDFs
+            pattern: Glob pattern for matching file names
             
-            # Extract page count
-            page_count = len(list(result.document.pages))
+        Returns:
+            List of matching file paths, sorted by size (descending)
+        """
+        if not directory_path.exists():
+            raise FileNotFoundError(f"Directory not found: {directory_path}")
+        
+        pattern = pattern.lower()
+        sized_files = []
+        
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_file() and fnmatch.fnmatchcase(entry.name.lower(), pattern):
+                    sized_files.append((entry.stat().st_size, Path(entry.path)))
+        
+        sized_files.sort(key=lambda sized: sized[0], reverse=True)
+        pdf_files = [path for _, path in sized_files]
+        
+        if not pdf_files:
+            logger.warning("No PDF files found in %s", directory_path)
+        else:
+            logger.info("Found %d PDF files to process", len(pdf_files))
+        
+        return pdf_files
+    
+    def _iter_parallel(
+        self,
+        pdf_files: List[Path],
+        digests: Optional[List[str]] = None
+    ) -> Iterator[Tuple[int, Optional[DoclingDocument], DocumentMetadata]]:
+        """Convert PDFs across a process pool, yielding as each one finishes.
+        
+        Args:
+            pdf_files: PDF paths to convert
+            digests: Content digests matching ``pdf_files``, if already computed
             
-            metadata = DocumentMetadata(
-                filename=pdf_path.name,
-                filepath=str(pdf_path),
-                total_pages=page_count,
-                processing_time=processing_time,
-                success=True
-            )
+        Yields:
+            Tuples of (input index, DoclingDocument or None, DocumentMetadata)
+        """
+        workers = min(self.max_workers, len(pdf_files))
+        logger.info("Converting with %d worker processes", workers)
+        
+        # Spawn rather than fork: the pool is started from a background
+        # thread while gRPC channels, HTTP pools and event loops are live,
+        # and forking that state can deadlock the child. Each worker loads
+        # its converter once (see _get_converter), so this is a one-off cost.
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        
+        try:
+            futures = {
+                executor.submit(
+                    _convert_in_worker, pdf_path, self.options, self.ocr_min_chars_per_page,
+                    digests[i] if digests else None
+                ): i
+                for i, pdf_path in enumerate(pdf_files)
+            }
             
-            logger.info(
-                f"Successfully processed {pdf_path.name}: "
-                f"{page_count} pages in {processing_time:.2f}s"
-            )
+            for future in as_completed(futures):
+                i = futures[future]
+                pdf_path = pdf_files[i]
+                
+                try:
+                    doc_dict, metadata = future.result()
+                    doc = DoclingDocument.model_validate(doc_dict) if doc_dict is not None else None
+                except Exception as e:
+                    # Worker crashed or the document could not be rebuilt
+                    logger.error("Error processing %s: %s", pdf_path.name, e, exc_info=True)
+                    doc = None
+                    metadata = DocumentMetadata(
+                        filename=pdf_path.name,
+                        filepath=str(pdf_path),
+                        total_pages=0,
+                        processing_time=0.0,
+                        success=False,
+                        error_message=str(e)
+                    )
+                
+                yield i, doc, metadata
+        finally:
+            # Drop queued conversions if the consumer stops early
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def iter_directory(
+        self,
+        directory_path: Path,
+        pattern: str = "*.pdf",
+        skip: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[Tuple[Optional[DoclingDocument], DocumentMetadata]]:
+        """Process PDF files in a directory, yielding each as it completes.
+        
+        Args:
+            directory_path: Path to directory containing PDFs
+            pattern: Glob pattern for matching files (default: *.pdf)
+            skip: Optional predicate on a file's content digest; files for
+                which it returns True are not converted
             
-            return result.document, metadata
+        Yields:
+            Tuples of (DoclingDocument or None, DocumentMetadata) in completion order
+        """
+        pdf_files = self._find_pdfs(directory_path, pattern)
+        digests: Optional[List[str]] = None
+        
+        if skip is not None:
+            # Hash each file once; the digest is reused for its metadata
+            pending = [
+                (pdf_path, digest)
+                for pdf_path in pdf_files
+                if not skip(digest := file_digest(pdf_path))
+            ]
             
-        except Exception as e:
-            processing_time = time.time() - start_time
-            metadata = DocumentMetadata(
-                filename=pdf_path.name,
-                filepath=str(pdf_path),
-                total_pages=0,
-                processing_time=processing_time,
-                success=False,
-                error_message=str(e)
-            )
-            logger.error(f"Error processing {pdf_path.name}: {e}", exc_info=True)
-            return None, metadata
+            if len(pending) < len(pdf_files):
+                logger.info(
+                    "Skipping %d already-ingested PDF files", len(pdf_files) - len(pending)
+                )
+            pdf_files = [pdf_path for pdf_path, _ in pending]
+            digests = [digest for _, digest in pending]
+        
+        if self.max_workers > 1 and len(pdf_files) > 1:
+            for _, doc, metadata in self._iter_parallel(pdf_files, digests):
+                yield doc, metadata
+        else:
+            for i, pdf_path in enumerate(pdf_files):
+                yield self.process_pdf(pdf_path, digests[i] if digests else None)
     
     def process_directory(
         self, 
@@ -133,6 +545,9 @@ class PDFProcessor:
     ) -> List[tuple[Optional[DoclingDocument], DocumentMetadata]]:
         """Process all PDF files in a directory.
         
+        Files are converted in parallel worker processes when more than one
+        worker is configured.
+        
         Args:
             directory_path: Path to directory containing PDFs
             pattern: Glob pattern for matching files (default: *.pdf)
@@ -140,28 +555,24 @@ class PDFProcessor:
         Returns:
             List of tuples (DoclingDocument or None, DocumentMetadata)
         """
-        if not directory_path.exists():
-            raise FileNotFoundError(f"Directory not found: {directory_path}")
-        
-        pdf_files = list(directory_path.glob(pattern))
+        pdf_files = self._find_pdfs(directory_path, pattern)
         
         if not pdf_files:
-            logger.warning(f"No PDF files found in {directory_path}")
             return []
         
-        logger.info(f"Found {len(pdf_files)} PDF files to process")
-        
-        results = []
-        for pdf_path in pdf_files:
-            doc, metadata = self.process_pdf(pdf_path)
-            results.append((doc, metadata))
+        if self.max_workers > 1 and len(pdf_files) > 1:
+            results: List[Optional[tuple]] = [None] * len(pdf_files)
+            for i, doc, metadata in self._iter_parallel(pdf_files):
+                results[i] = (doc, metadata)
+        else:
+            results = [self.process_pdf(pdf_path) for pdf_path in pdf_files]
         
         # Log summary
         successful = sum(1 for _, m in results if m.success)
         failed = len(results) - successful
         
         logger.info(
-            f"Processing complete: {successful} succeeded, {failed} failed"
+            "Processing complete: %d succeeded, %d failed", successful, failed
         )
         
         return results
@@ -182,96 +593,139 @@ class DocumentExtractor:
         self.pdf_processor = pdf_processor
         logger.info("DocumentExtractor initialized")
     
+    @staticmethod
+    def _to_extracted(
+        doc: Optional[DoclingDocument],
+        metadata: DocumentMetadata
+    ) -> ExtractedDoc:
+        """Build the extraction record for one processed PDF.
+        
+        Args:
+            doc: Converted document, or None if conversion failed
+            metadata: Processing metadata
+            
+        Returns:
+            ExtractedDoc with document content and metadata
+        """
+        success = doc is not None and metadata.success
+        
+        return ExtractedDoc(
+            # Keep original DoclingDocument for chunking; failed documents
+            # are still returned for tracking
+            document=doc if success else None,
+            content=doc.export_to_markdown() if success else "",
+            filename=metadata.filename,
+            filepath=metadata.filepath,
+            total_pages=metadata.total_pages,
+            processing_time=metadata.processing_time,
+            success=metadata.success,
+            error_message=metadata.error_message,
+            source_sha=metadata.source_sha
+        )
+    
     def extract_from_directory(
         self, 
         directory_path: Path,
         pattern: str = "*.pdf"
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[ExtractedDoc]:
         """Extract structured content from all PDFs in a directory.
         
+        Documents are yielded as they are converted, so only the documents
+        in flight are held in memory. Use :meth:`iter_from_directory` to
+        overlap conversion with downstream processing.
+        
         Args:
             directory_path: Path to directory containing PDFs
             pattern: Glob pattern for matching files
             
-        Returns:
-            List of dictionaries containing document content and metadata
+        Yields:
+            ExtractedDoc records, including failed documents, in completion order
         """
-        results = self.pdf_processor.process_directory(directory_path, pattern)
-        
-        extracted_data = []
-        
-        for doc, metadata in results:
-            if doc is None or not metadata.success:
-                # Still include failed documents in output for tracking
-                extracted_data.append({
-                    "document": None,
-                    "content": "",
-                    "metadata": {
-                        "filename": metadata.filename,
-                        "filepath": metadata.filepath,
-                        "total_pages": metadata.total_pages,
-                        "processing_time": metadata.processing_time,
-                        "success": metadata.success,
-                        "error_message": metadata.error_message
-                    }
-                })
-                continue
-            
-            # Extract full text from document
-            full_text = doc.export_to_markdown()
+        extracted_count = 0
+        
+        for doc, metadata in self.pdf_processor.iter_directory(directory_path, pattern):
+            extracted_count += 1
+            yield self._to_extracted(doc, metadata)
+        
+        logger.info("Extracted content from %d documents", extracted_count)
+    
+    def iter_from_directory(
+        self,
+        directory_path: Path,
+        pattern: str = "*.pdf",
+        max_pending: Optional[int] = None,
+        skip: Optional[Callable[[str], bool]] = None
+    ) -> Iterator[ExtractedDoc]:
+        """Stream extracted documents from a directory as they are converted.
+        
+        A background thread drives PDF conversion and markdown export into a
+        bounded queue, so the caller can chunk and embed earlier documents
+        while later ones are still being parsed.
+        
+        Args:
+            directory_path: Path to directory containing PDFs
+            pattern: Glob pattern for matching files
+            max_pending: Queue size (default: 2x CPU count)
+            skip: Optional predicate on a file's content digest; matching
+                files are skipped before conversion
             
-            extracted_data.append({
-                "document": doc,  # Keep original DoclingDocument for chunking
-                "content": full_text,
-                "metadata": {
-                    "filename": metadata.filename,
-                    "filepath": metadata.filepath,
-                    "total_pages": metadata.total_pages,
-                    "processing_time": metadata.processing_time,
-                    "success": metadata.success
-                }
-            })
-        
-        logger.info(f"Extracted content from {len(extracted_data)} documents")
-        
-        return extracted_data
-    
-    def extract_from_file(self, file_path: Path) -> Dict[str, Any]:
+        Yields:
+            ExtractedDoc records, in completion order
+        """
+        pending: queue.Queue = queue.Queue(maxsize=max_pending or (os.cpu_count() or 1) * 2)
+        stop = threading.Event()
+        done = object()
+        
+        def _put(item: Any) -> bool:
+            # Block on a full queue, but give up once the consumer has stopped
+            while not stop.is_set():
+                try:
+                    pending.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def _produce():
+            try:
+                for doc, metadata in self.pdf_processor.iter_directory(
+                    directory_path, pattern, skip
+                ):
+                    if not _put(self._to_extracted(doc, metadata)):
+                        return
+            except BaseException as e:
+                _put(e)
+                return
+            _put(done)
+        
+        producer = threading.Thread(target=_produce, name="pdf-extraction", daemon=True)
+        producer.start()
+        
+        try:
+            while True:
+                item = pending.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+    
+    def extract_from_file(
+        self,
+        file_path: Path,
+        source_sha: Optional[str] = None
+    ) -> ExtractedDoc:
         """Extract structured content from a single PDF file.
         
         Args:
             file_path: Path to the PDF file
+            source_sha: Content digest if the caller already computed it
             
         Returns:
-            Dictionary containing document content and metadata
+            ExtractedDoc with document content and metadata
         """
-        doc, metadata = self.pdf_processor.process_pdf(file_path)
-        
-        if doc is None or not metadata.success:
-            return {
-                "document": None,
-                "content": "",
-                "metadata": {
-                    "filename": metadata.filename,
-                    "filepath": metadata.filepath,
-                    "total_pages": metadata.total_pages,
-                    "processing_time": metadata.processing_time,
-                    "success": metadata.success,
-                    "error_message": metadata.error_message
-                }
-            }
-        
-        # Extract full text from document
-        full_text = doc.export_to_markdown()
-        
-        return {
-            "document": doc,
-            "content": full_text,
-            "metadata": {
-                "filename": metadata.filename,
-                "filepath": metadata.filepath,
-                "total_pages": metadata.total_pages,
-                "processing_time": metadata.processing_time,
-                "success": metadata.success
-            }
-        }
+        doc, metadata = self.pdf_processor.process_pdf(file_path, source_sha)
+        return self._to_extracted(doc, metadata)
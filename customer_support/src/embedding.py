@@ -1,14 +1,175 @@
 """Embedding generation module using NVIDIA NeMo Retriever API."""
 
+import asyncio
 import logging
+import random
 import time
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+import httpx
+import numpy as np
+import orjson
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    OpenAI,
+    RateLimitError
+)
 
 from config.config import NVIDIAConfig
+from src.embedding_cache import EmbeddingCache
+from src.http_client import http_client_factory
+from src.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Rough characters-per-token ratio used to size requests without a tokenizer
+_CHARS_PER_TOKEN = 4
+
+T = TypeVar("T")
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first.
+    
+    Uses ``argpartition`` so only the selected scores are sorted; equal
+    selected scores keep their input order.
+    
+    Args:
+        scores: 1-D array of scores
+        k: Number of indices to return (None for all)
+        
+    Returns:
+        Integer index array of length ``min(k, len(scores))``
+    """
+    n = len(scores)
+    k = n if k is None else max(0, min(k, n))
+    
+    if k < n:
+        candidates = np.sort(np.argpartition(-scores, k - 1)[:k])
+    else:
+        candidates = np.arange(n)
+    
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Check whether an API error is transient (rate limit, 5xx, network)."""
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(error: Exception, attempt: int, base: float) -> float:
+    """Seconds to wait before the next attempt.
+    
+    Honors the server's ``Retry-After`` header when present, otherwise
+    backs off exponentially with jitter.
+    
+    Args:
+        error: Error raised by the failed attempt
+        attempt: Zero-based number of the failed attempt
+        base: Initial backoff in seconds
+        
+    Returns:
+        Delay in seconds
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        try:
+            return float(response.headers.get("retry-after", ""))
+        except ValueError:
+            pass
+    return base * 2 ** attempt + random.uniform(0, 0.5)
+
+
+def _call_with_retry(
+    fn: Callable[..., T],
+    *args: Any,
+    max_attempts: int = 5,
+    base: float = 1.0,
+    **kwargs: Any
+) -> T:
+    """Call ``fn``, retrying transient API errors with backoff.
+    
+    Args:
+        fn: API call to make
+        *args: Positional arguments for ``fn``
+        max_attempts: Total attempts before the last error is raised
+        base: Initial backoff in seconds
+        **kwargs: Keyword arguments for ``fn``
+        
+    Returns:
+        Result of ``fn``
+    """
+    for attempt in range(max_attempts):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not _is_retryable(e):
+                raise
+            delay = _retry_delay(e, attempt, base)
+            logger.warning(f"Embedding request failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+async def _acall_with_retry(
+    fn: Callable[..., Awaitable[T]],
+    *args: Any,
+    max_attempts: int = 5,
+    base: float = 1.0,
+    **kwargs: Any
+) -> T:
+    """Async variant of :func:`_call_with_retry`."""
+    for attempt in range(max_attempts):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not _is_retryable(e):
+                raise
+            delay = _retry_delay(e, attempt, base)
+            logger.warning(f"Embedding request failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def _pack_batches(
+    texts: List[str],
+    max_items: int,
+    max_tokens: int
+) -> List[Tuple[int, int]]:
+    """Greedily group consecutive texts into request-sized batches.
+    
+    A batch is closed when adding the next text would exceed either limit;
+    a single text over ``max_tokens`` is sent on its own.
+    
+    Args:
+        texts: Texts to embed
+        max_items: Maximum texts per request
+        max_tokens: Maximum estimated tokens per request
+        
+    Returns:
+        List of (start, end) slices into ``texts``
+    """
+    batches = []
+    start = 0
+    batch_tokens = 0
+    
+    for i, text in enumerate(texts):
+        tokens = len(text) // _CHARS_PER_TOKEN + 1
+        
+        if i > start and (i - start >= max_items or batch_tokens + tokens > max_tokens):
+            batches.append((start, i))
+            start = i
+            batch_tokens = 0
+        
+        batch_tokens += tokens
+    
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    
+    return batches
+
 
 class EmbeddingGenerator:
     """Generates embeddings using NVIDIA's NeMo Retriever API.
@@ -23,17 +184,35 @@ class EmbeddingGenerator:
             config: NVIDIA configuration (Dependency Injection)
         """
         self.config = config
+        # Retries are handled by _call_with_retry
         self.client = OpenAI(
             base_url=config.embedding_url.replace("/v1/embeddings", "/v1"),
-            api_key=config.api_key
+            api_key=config.api_key,
+            max_retries=0
         )
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_http: Optional[httpx.AsyncClient] = None
         logger.info(f"EmbeddingGenerator initialized with model: {config.embedding_model}")
     
-    def generate_embedding(
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Return an async client on the running loop's pooled connections."""
+        http_client = http_client_factory.get()
+        
+        if self._async_client is None or self._async_http is not http_client:
+            self._async_client = AsyncOpenAI(
+                base_url=self.config.embedding_url.replace("/v1/embeddings", "/v1"),
+                api_key=self.config.api_key,
+                max_retries=0,
+                http_client=http_client
+            )
+            self._async_http = http_client
+        return self._async_client
+    
+    async def generate_embedding(
         self, 
         text: str,
         input_type: str = "passage"
-    ) -> Optional[List[float]]:
+    ) -> Optional[np.ndarray]:
         """Generate embedding for a single text.
         
         Args:
@@ -41,80 +220,208 @@ class EmbeddingGenerator:
             input_type: Type of input - "query" or "passage" (default: "passage")
             
         Returns:
-            Embedding vector as list of floats, or None if error
+            Embedding vector as a float32 array, or None if error
+        """
+        client = self._get_async_client()
+        limiter = get_rate_limiter("embeddings", self.config.embedding_rpm)
+        
+        async def _create(**kwargs):
+            if limiter is not None:
+                await limiter.acquire()
+            return await client.embeddings.create(**kwargs)
+        
+        try:
+            response = await _acall_with_retry(
+                _create,
+                max_attempts=self.config.max_retries + 1,
+                input=text,
+                model=self.config.embedding_model,
+                encoding_format="float",
+                extra_body={"input_type": input_type, "truncate": "NONE"}
+            )
+            
+            return np.asarray(response.data[0].embedding, dtype=np.float32)
+            
+        except Exception as e:
+            logger.error(f"Error generating embedding: {e}", exc_info=True)
+            return None
+    
+    def generate_embedding_sync(
+        self, 
+        text: str,
+        input_type: str = "passage"
+    ) -> Optional[np.ndarray]:
+        """Blocking variant of :meth:`generate_embedding` for sync callers.
+        
+        Uses the pooled synchronous client, so no event loop is created per
+        call.
+        
+        Args:
+            text: Text to embed
+            input_type: Type of input - "query" or "passage" (default: "passage")
+            
+        Returns:
+            Embedding vector as a float32 array, or None if error
         """
+        limiter = get_rate_limiter("embeddings", self.config.embedding_rpm)
+        
+        def _create(**kwargs):
+            # Same budget as the async paths, so mixed callers can't burst past it
+            if limiter is not None:
+                limiter.acquire_sync()
+            return self.client.embeddings.create(**kwargs)
+        
         try:
-            response = self.client.embeddings.create(
+            response = _call_with_retry(
+                _create,
+                max_attempts=self.config.max_retries + 1,
                 input=text,
                 model=self.config.embedding_model,
                 encoding_format="float",
                 extra_body={"input_type": input_type, "truncate": "NONE"}
             )
             
-            embedding = response.data[0].embedding
+            embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
             return embedding
             
         except Exception as e:
             logger.error(f"Error generating embedding: {e}", exc_info=True)
             return None
     
-    def generate_embeddings_batch(
+    async def agenerate_embeddings_batch(
         self, 
         texts: List[str],
         input_type: str = "passage",
-        batch_size: int = 10
-    ) -> List[Optional[List[float]]]:
-        """Generate embeddings for multiple texts in batches.
+        batch_size: int = 10,
+        max_in_flight: Optional[int] = None
+    ) -> List[Optional[np.ndarray]]:
+        """Generate embeddings for multiple texts using concurrent requests.
+        
+        Texts are packed into batches of up to ``batch_size`` texts and
+        NVIDIAConfig.max_tokens_per_request estimated tokens. Batches are
+        sent concurrently, with at most ``max_in_flight`` requests
+        outstanding, and reassembled in input order.
         
         Args:
             texts: List of texts to embed
             input_type: Type of input - "query" or "passage"
-            batch_size: Number of texts to process in each batch
+            batch_size: Maximum number of texts in each batch
+            max_in_flight: Maximum concurrent requests
+                (defaults to NVIDIAConfig.max_concurrent_requests)
             
         Returns:
-            List of embedding vectors (None for failed embeddings)
+            List of float32 embedding vectors (None for failed embeddings)
         """
-        all_embeddings = []
-        total_batches = (len(texts) + batch_size - 1) // batch_size
+        # Repeated boilerplate (headers, footers, disclaimers) is requested
+        # once and the result shared by every copy
+        positions: Dict[str, int] = {}
+        inverse = [positions.setdefault(text, len(positions)) for text in texts]
+        
+        if len(positions) < len(texts):
+            logger.info(f"Skipping {len(texts) - len(positions)} duplicate texts")
+            unique_embeddings = await self.agenerate_embeddings_batch(
+                list(positions), input_type, batch_size, max_in_flight
+            )
+            return [unique_embeddings[i] for i in inverse]
+        
+        all_embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        batches = _pack_batches(texts, batch_size, self.config.max_tokens_per_request)
+        total_batches = len(batches)
+        semaphore = asyncio.Semaphore(max_in_flight or self.config.max_concurrent_requests)
+        client = self._get_async_client()
         
         logger.info(
             f"Generating embeddings for {len(texts)} texts in {total_batches} batches"
         )
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_num = i // batch_size + 1
-            
-            logger.debug(f"Processing batch {batch_num}/{total_batches}")
-            
-            try:
-                response = self.client.embeddings.create(
+        limiter = get_rate_limiter("embeddings", self.config.embedding_rpm)
+        
+        async def _create(**kwargs):
+            # Every attempt, including retries, draws from the shared budget
+            if limiter is not None:
+                await limiter.acquire()
+            return await client.embeddings.create(**kwargs)
+        
+        async def _request(batch: List[str]):
+            async with semaphore:
+                return await _acall_with_retry(
+                    _create,
+                    max_attempts=self.config.max_retries + 1,
                     input=batch,
                     model=self.config.embedding_model,
                     encoding_format="float",
                     extra_body={"input_type": input_type, "truncate": "NONE"}
                 )
-                
-                batch_embeddings = [item.embedding for item in response.data]
-                all_embeddings.extend(batch_embeddings)
-                
-                logger.debug(f"Successfully processed batch {batch_num}")
-                
-                # Small delay to respect rate limits
-                time.sleep(0.1)
-                
+        
+        async def _embed_range(start: int, end: int):
+            try:
+                response = await _request(texts[start:end])
             except Exception as e:
-                logger.error(
-                    f"Error processing batch {batch_num}: {e}",
-                    exc_info=True
-                )
-                # Add None for each failed text in batch
-                all_embeddings.extend([None] * len(batch))
+                if end - start == 1 or _is_retryable(e):
+                    # Failed texts keep their None placeholders
+                    logger.error(
+                        f"Error embedding texts {start}-{end - 1}: {e}",
+                        exc_info=True
+                    )
+                    return
+                
+                # A rejected request may be caused by a single text; split so
+                # it doesn't cost the whole batch
+                mid = (start + end) // 2
+                logger.warning(f"Error embedding texts {start}-{end - 1} ({e}), splitting batch")
+                await asyncio.gather(_embed_range(start, mid), _embed_range(mid, end))
+                return
+            
+            # One contiguous (batch, dim) block per response; rows are views
+            block = np.array([item.embedding for item in response.data], dtype=np.float32)
+            all_embeddings[start:start + len(block)] = list(block)
+        
+        async def _embed_one_batch(batch_num: int, start: int, end: int):
+            logger.debug(f"Processing batch {batch_num}/{total_batches}")
+            await _embed_range(start, end)
+            logger.debug(f"Finished batch {batch_num}")
+        
+        await asyncio.gather(
+            *(
+                _embed_one_batch(batch_num, start, end)
+                for batch_num, (start, end) in enumerate(batches, 1)
+            )
+        )
         
         successful = sum(1 for e in all_embeddings if e is not None)
         logger.info(f"Generated {successful}/{len(texts)} embeddings successfully")
         
         return all_embeddings
+    
+    def generate_embeddings_batch(
+        self, 
+        texts: List[str],
+        input_type: str = "passage",
+        batch_size: int = 10
+    ) -> List[Optional[np.ndarray]]:
+        """Generate embeddings for multiple texts in batches.
+        
+        Synchronous entry point for :meth:`agenerate_embeddings_batch`; must
+        not be called from inside a running event loop.
+        
+        Args:
+            texts: List of texts to embed
+            input_type: Type of input - "query" or "passage"
+            batch_size: Maximum number of texts in each batch
+            
+        Returns:
+            List of float32 embedding vectors (None for failed embeddings)
+        """
+        async def _run() -> List[Optional[np.ndarray]]:
+            try:
+                return await self.agenerate_embeddings_batch(texts, input_type, batch_size)
+            finally:
+                # This loop ends with asyncio.run, so release its pool
+                self._async_client = None
+                self._async_http = None
+                await http_client_factory.aclose()
+        
+        return asyncio.run(_run())
 
 
 class DocumentEmbedder:
@@ -126,29 +433,87 @@ class DocumentEmbedder:
     def __init__(
         self, 
         embedding_generator: EmbeddingGenerator,
-        batch_size: int = 10
+        batch_size: int = 10,
+        cache: Optional[EmbeddingCache] = None
     ):
         """Initialize document embedder.
         
         Args:
             embedding_generator: EmbeddingGenerator instance (Dependency Injection)
             batch_size: Batch size for processing
+            cache: Optional cache of embeddings keyed by model, input type and text
         """
         self.embedding_generator = embedding_generator
         self.batch_size = batch_size
+        self.cache = cache
         logger.info(f"DocumentEmbedder initialized with batch_size={batch_size}")
     
-    def embed_chunks(
+    def _cache_key(self, text: str, input_type: str) -> bytes:
+        """Build the embedding cache key for a text."""
+        return EmbeddingCache.make_key(
+            self.embedding_generator.config.embedding_model, input_type, text
+        )
+    
+    async def _aembed_texts(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Embed passages, requesting only texts that are not cached.
+        
+        Args:
+            texts: Passage texts
+            
+        Returns:
+            Embeddings in input order (None for failed embeddings)
+        """
+        if self.cache is None:
+            return await self.embedding_generator.agenerate_embeddings_batch(
+                texts=texts,
+                input_type="passage",
+                batch_size=self.batch_size
+            )
+        
+        keys = [self._cache_key(text, "passage") for text in texts]
+        embeddings = [self.cache.get(key) for key in keys]
+        
+        # Each distinct uncached text is requested once
+        misses: Dict[bytes, str] = {}
+        for key, text, embedding in zip(keys, texts, embeddings):
+            if embedding is None:
+                misses.setdefault(key, text)
+        
+        if misses:
+            logger.info(f"Embedding cache: {len(texts) - len(misses)}/{len(texts)} hits")
+            generated = await self.embedding_generator.agenerate_embeddings_batch(
+                texts=list(misses.values()),
+                input_type="passage",
+                batch_size=self.batch_size
+            )
+            
+            fresh = {}
+            for key, embedding in zip(misses, generated):
+                if embedding is not None:
+                    self.cache.put(key, embedding)
+                    fresh[key] = embedding
+            
+            embeddings = [
+                embedding if embedding is not None else fresh.get(key)
+                for key, embedding in zip(keys, embeddings)
+            ]
+        
+        return embeddings
+    
+    async def aembed_chunks(
         self, 
         chunks: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """Generate embeddings for document chunks.
         
+        Chunks are updated in place (``embedding`` and ``embedding_dim`` are
+        set on the input dicts) rather than copied.
+        
         Args:
             chunks: List of chunk dictionaries from ChunkProcessor
             
         Returns:
-            List of chunks with embeddings added
+            List of the successfully embedded chunks
         """
         if not chunks:
             logger.warning("No chunks provided for embedding")
@@ -160,11 +525,7 @@ class DocumentEmbedder:
         texts = [chunk["text"] for chunk in chunks]
         
         # Generate embeddings
-        embeddings = self.embedding_generator.generate_embeddings_batch(
-            texts=texts,
-            input_type="passage",
-            batch_size=self.batch_size
-        )
+        embeddings = await self._aembed_texts(texts)
         
         # Add embeddings to chunks
         embedded_chunks = []
@@ -176,13 +537,10 @@ class DocumentEmbedder:
                 )
                 continue
             
-            embedded_chunk = {
-                **chunk,
-                "embedding": embedding,
-                "embedding_dim": len(embedding)
-            }
+            chunk["embedding"] = embedding
+            chunk["embedding_dim"] = len(embedding)
             
-            embedded_chunks.append(embedded_chunk)
+            embedded_chunks.append(chunk)
         
         logger.info(
             f"Successfully embedded {len(embedded_chunks)}/{len(chunks)} chunks"
@@ -190,7 +548,30 @@ class DocumentEmbedder:
         
         return embedded_chunks
     
-    def embed_query(self, query: str) -> Optional[List[float]]:
+    def embed_chunks(
+        self, 
+        chunks: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Generate embeddings for document chunks.
+        
+        Synchronous entry point for :meth:`aembed_chunks`; must not be
+        called from inside a running event loop.
+        
+        Args:
+            chunks: List of chunk dictionaries from ChunkProcessor
+            
+        Returns:
+            List of chunks with embeddings added
+        """
+        async def _run() -> List[Dict[str, Any]]:
+            try:
+                return await self.aembed_chunks(chunks)
+            finally:
+                await http_client_factory.aclose()
+        
+        return asyncio.run(_run())
+    
+    def embed_query(self, query: str) -> Optional[np.ndarray]:
         """Generate embedding for a search query.
         
         Args:
@@ -199,15 +580,24 @@ class DocumentEmbedder:
         Returns:
             Embedding vector or None if error
         """
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(query, "query")
+            embedding = self.cache.get(key)
+            if embedding is not None:
+                return embedding
+        
         logger.info("Generating query embedding")
         
-        embedding = self.embedding_generator.generate_embedding(
+        embedding = self.embedding_generator.generate_embedding_sync(
             text=query,
             input_type="query"
         )
         
         if embedding is None:
             logger.error("Failed to generate query embedding")
+        elif key is not None:
+            self.cache.put(key, embedding)
         
         return embedding
 
@@ -225,12 +615,28 @@ class Reranker:
             config: NVIDIA configuration (Dependency Injection)
         """
         self.config = config
-        self.client = OpenAI(
-            base_url=config.rerank_url.replace("/v1/ranking", "/v1"),
-            api_key=config.api_key
+        # One pooled HTTP/2 client, so repeated calls reuse the connection
+        self._http = httpx.Client(
+            http2=True,
+            timeout=config.request_timeout,
+            limits=httpx.Limits(max_keepalive_connections=32),
+            headers={
+                "Authorization": f"Bearer {config.api_key}",
+                "Content-Type": "application/json"
+            }
         )
         logger.info(f"Reranker initialized with model: {config.rerank_model}")
     
+    def close(self):
+        """Close the underlying HTTP client."""
+        self._http.close()
+    
+    def __enter__(self) -> "Reranker":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def rerank(
         self, 
         query: str,
@@ -254,27 +660,36 @@ class Reranker:
         try:
             logger.info(f"Reranking {len(documents)} documents")
             
-            # Note: The actual API endpoint and format may vary
-            # This is based on typical reranking API patterns
-            response = self.client.post(
-                "/ranking",
-                json={
+            # Shares the rerank budget with RetrievalPipeline's async requests
+            limiter = get_rate_limiter("rerank", self.config.rerank_rpm)
+            if limiter is not None:
+                limiter.acquire_sync()
+            
+            response = self._http.post(
+                self.config.rerank_url,
+                content=orjson.dumps({
                     "model": self.config.rerank_model,
                     "query": {"text": query},
                     "passages": [{"text": doc} for doc in documents],
-                    "truncate": "NONE"
-                }
+                    "truncate": "END"
+                })
             )
+            response.raise_for_status()
             
-            # Parse response (adjust based on actual API response format)
-            rankings = response.json().get("rankings", [])
-            
-            # Sort by score (descending)
-            rankings.sort(key=lambda x: x.get("score", 0), reverse=True)
+            # The API reports relevance as "logit"
+            rankings = [
+                {
+                    "index": ranking["index"],
+                    "score": ranking.get("logit", ranking.get("score", 0.0))
+                }
+                for ranking in orjson.loads(response.content).get("rankings", [])
+            ]
             
-            # Limit to top_n if specified
-            if top_n is not None:
-                rankings = rankings[:top_n]
+            # Highest scores first, limited to top_n if specified
+            scores = np.fromiter(
+                (ranking["score"] for ranking in rankings), dtype=np.float64, count=len(rankings)
+            )
+            rankings = [rankings[i] for i in top_k_indices(scores, top_n)]
             
             logger.info(f"Reranking complete, returning top {len(rankings)} results")
             
@@ -286,4 +701,4 @@ class Reranker:
             return [
                 {"index": i, "score": 0.0} 
                 for i in range(len(documents))
-            ]
+            ][:top_n]
@@ -0,0 +1,115 @@
+"""In-memory LRU cache for query embeddings and search results."""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache with optional time-to-live.
+
+    Single Responsibility: Keep recently used values in memory, keyed by a
+    compact digest, so repeated queries skip the embedding API and Qdrant.
+    """
+
+    def __init__(self, capacity: int = 1000, ttl_seconds: float = 3600.0):
+        """Initialize the cache.
+
+        Args:
+            capacity: Maximum number of entries kept before evicting the oldest
+            ttl_seconds: Entry lifetime in seconds (0 disables expiry)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if ttl_seconds < 0:
+            raise ValueError("ttl_seconds must be non-negative")
+
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> bytes:
+        """Build a 16-byte cache key from the given parts.
+
+        Args:
+            *parts: Values identifying the entry (e.g. model name, query text)
+
+        Returns:
+            blake2b digest of the parts
+        """
+        joined = "\x1f".join(str(part) for part in parts)
+        return hashlib.blake2b(joined.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return a cached value, or None on a miss or expired entry.
+
+        Args:
+            key: Key from :meth:`make_key`
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+                    del self._entries[key]
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+
+            self._misses += 1
+            return None
+
+    def put(self, key: bytes, value: Any):
+        """Store a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Key from :meth:`make_key`
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with size, capacity, hits, misses, and hit rate
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
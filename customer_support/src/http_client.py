@@ -0,0 +1,59 @@
+"""Shared, connection-pooled HTTP client for NVIDIA API calls."""
+
+import asyncio
+import logging
+import weakref
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+
+
+class HTTPClientFactory:
+    """Hands out one pooled ``httpx.AsyncClient`` per event loop.
+
+    Single Responsibility: Own the HTTP connection pool so embedding and
+    reranking traffic reuse the same keep-alive connections.
+
+    Async clients cannot be used across event loops, so each loop gets its
+    own client; it is released when the loop is garbage collected or
+    :meth:`aclose` is called from that loop.
+    """
+
+    def __init__(self, limits: httpx.Limits = _LIMITS):
+        """Initialize the factory.
+
+        Args:
+            limits: Connection pool limits for created clients
+        """
+        self.limits = limits
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self) -> httpx.AsyncClient:
+        """Return the running event loop's client, creating it on first use.
+
+        Returns:
+            Shared AsyncClient (must be called from inside a running loop)
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self.limits, timeout=None)
+            self._clients[loop] = client
+            logger.debug("Created pooled HTTP client")
+
+        return client
+
+    async def aclose(self):
+        """Close the running event loop's client, if one was created."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+http_client_factory = HTTPClientFactory()
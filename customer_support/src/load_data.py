@@ -1,17 +1,55 @@
 """Main pipeline for loading, processing, and storing customer support documents."""
 
+import asyncio
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+import numpy as np
+from joblib import Memory
 
 from config.config import Config
-from src.data_ingestion import PDFProcessor, DocumentExtractor
+from src.data_ingestion import PDFProcessor, DocumentExtractor, ExtractedDoc, file_digest
 from src.chunking import DocumentChunker, ChunkProcessor
-from src.embedding import EmbeddingGenerator, DocumentEmbedder
-from src.qdrant_manager import QdrantManager
+from src.embedding import DocumentEmbedder
+from src.embedding_cache import EmbeddingCache
+from src.http_client import http_client_factory
+from src.local_search import LocalSearchBackend
+from src.qdrant_manager import UpsertBuffer
+from src.services import get_embedding_generator, get_qdrant_manager
 
 logger = logging.getLogger(__name__)
 
+class QueryEmbeddingError(RuntimeError):
+    """Raised when a query embedding cannot be generated.
+    
+    Raising (rather than returning None) keeps failures out of the
+    persistent query embedding cache.
+    """
+
+
+def _embed_query(
+    document_embedder: DocumentEmbedder,
+    model_name: str,
+    normalized_query: str
+) -> np.ndarray:
+    """Embed a normalized query; cache key is (model_name, normalized_query).
+    
+    Args:
+        document_embedder: DocumentEmbedder used on cache misses (not part of the key)
+        model_name: Embedding model name, so model swaps invalidate the cache
+        normalized_query: Whitespace-normalized query text
+        
+    Returns:
+        Query embedding vector
+    """
+    embedding = document_embedder.embed_query(normalized_query)
+    
+    if embedding is None:
+        raise QueryEmbeddingError(f"Failed to embed query for model {model_name}")
+    
+    return embedding
+
 
 class CustomerSupportPipeline:
     """Main pipeline orchestrating document processing workflow.
@@ -31,7 +69,11 @@ class CustomerSupportPipeline:
         logger.info("Initializing pipeline components")
         
         # Data ingestion
-        pdf_processor = PDFProcessor(generate_page_images=False)
+        # PDF conversion is CPU-bound; 0 uses one worker process per CPU
+        pdf_processor = PDFProcessor(
+            generate_page_images=False,
+            max_workers=config.processing.pdf_workers or None
+        )
         self.document_extractor = DocumentExtractor(pdf_processor)
         
         # Chunking
@@ -42,22 +84,31 @@ class CustomerSupportPipeline:
         )
         
         # Embedding
-        embedding_generator = EmbeddingGenerator(config.nvidia)
+        embedding_generator = get_embedding_generator(config.nvidia)
+        cache_size = config.processing.embedding_cache_size
         self.document_embedder = DocumentEmbedder(
             embedding_generator,
-            batch_size=config.processing.batch_size
+            batch_size=config.processing.batch_size,
+            cache=EmbeddingCache(cache_size, ttl_seconds=0) if cache_size else None
         )
         
         # Database
-        self.qdrant_manager = QdrantManager(config.qdrant)
+        self.qdrant_manager = get_qdrant_manager(config.qdrant)
         
         logger.info("Pipeline initialized successfully")
     
-    def process_directory(self, directory_path: Path) -> Dict[str, Any]:
+    def process_directory(
+        self,
+        directory_path: Path,
+        fast_ingest: bool = False,
+        skip_embedded: bool = False
+    ) -> Dict[str, Any]:
         """Process all PDFs in a directory through the complete pipeline.
         
         Args:
             directory_path: Path to directory containing PDF files
+            fast_ingest: Suspend HNSW indexing while storing chunks
+            skip_embedded: Skip PDFs whose contents are already stored in Qdrant
             
         Returns:
             Dictionary with pipeline statistics
@@ -67,53 +118,44 @@ class CustomerSupportPipeline:
         stats = {
             "documents_processed": 0,
             "documents_failed": 0,
+            "documents_skipped": 0,
             "total_chunks": 0,
             "chunks_embedded": 0,
             "chunks_stored": 0
         }
         
-        # Stage 1: Extract documents
-        logger.info("Stage 1: Extracting documents")
-        extracted_data = self.document_extractor.extract_from_directory(directory_path)
-        
-        stats["documents_processed"] = sum(
-            1 for d in extracted_data if d["metadata"]["success"]
-        )
-        stats["documents_failed"] = sum(
-            1 for d in extracted_data if not d["metadata"]["success"]
+        skip = None
+        if skip_embedded:
+            def skip(source_sha: str) -> bool:
+                if self.qdrant_manager.has_source(source_sha):
+                    stats["documents_skipped"] += 1
+                    return True
+                return False
+        
+        extracted = self._count_extracted(
+            self.document_extractor.iter_from_directory(directory_path, skip=skip),
+            stats
         )
         
+        if fast_ingest:
+            self.qdrant_manager.begin_bulk_load()
+        
+        try:
+            # All stages run concurrently, connected by bounded queues
+            logger.info("Extracting, chunking, embedding and storing documents")
+            asyncio.run(self._run_stages(extracted, stats))
+        finally:
+            # Re-enable indexing even if ingestion failed or was interrupted;
+            # new collections also start unindexed, whoever created them
+            if self.qdrant_manager.index_suspended():
+                self.qdrant_manager.finalize_index()
+        
         logger.info(
             f"Extracted {stats['documents_processed']} documents "
             f"({stats['documents_failed']} failed)"
         )
-        
-        # Stage 2: Chunk documents
-        logger.info("Stage 2: Chunking documents")
-        chunks = self.document_chunker.chunk_documents(extracted_data)
-        stats["total_chunks"] = len(chunks)
-        
         logger.info(f"Created {stats['total_chunks']} chunks")
-        
-        # Stage 3: Filter and prepare chunks
-        logger.info("Stage 3: Filtering chunks")
-        filtered_chunks = self.chunk_processor.filter_chunks(chunks)
-        prepared_chunks = self.chunk_processor.prepare_for_embedding(filtered_chunks)
-        
-        logger.info(f"Prepared {len(prepared_chunks)} chunks for embedding")
-        
-        # Stage 4: Generate embeddings
-        logger.info("Stage 4: Generating embeddings")
-        embedded_chunks = self.document_embedder.embed_chunks(prepared_chunks)
-        stats["chunks_embedded"] = len(embedded_chunks)
-        
         logger.info(f"Generated {stats['chunks_embedded']} embeddings")
-        
-        # Stage 5: Store in Qdrant
-        logger.info("Stage 5: Storing in Qdrant")
-        stored_count = self.qdrant_manager.insert_chunks(embedded_chunks)
-        stats["chunks_stored"] = stored_count
-        
         logger.info(f"Stored {stats['chunks_stored']} chunks in Qdrant")
         
         # Final summary
@@ -122,11 +164,102 @@ class CustomerSupportPipeline:
         
         return stats
     
-    def process_file(self, file_path: Path) -> Dict[str, Any]:
+    async def _run_stages(
+        self,
+        extracted: Iterator[ExtractedDoc],
+        stats: Dict[str, Any],
+        max_pending: int = 2
+    ):
+        """Chunk, embed and store extracted documents as a stage pipeline.
+        
+        Each stage runs as its own coroutine and hands work to the next
+        through a bounded queue, so the embedding API and Qdrant stay busy
+        while later PDFs are still being parsed. Extraction and chunking are
+        CPU-bound and run in worker threads (PDF conversion itself uses the
+        PDFProcessor's process pool).
+        
+        Args:
+            extracted: Stream of extracted documents
+            stats: Pipeline statistics to update
+            max_pending: Maximum batches waiting between stages
+        """
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        chunk_batches = self.document_chunker.chunk_batches_streaming(extracted)
+        done = object()
+        
+        def _next_prepared() -> Any:
+            batch = next(chunk_batches, None)
+            if batch is None:
+                return done
+            stats["total_chunks"] += len(batch)
+            filtered_batch = self.chunk_processor.filter_batch(batch)
+            return self.chunk_processor.prepare_batch_for_embedding(filtered_batch)
+        
+        # A failing stage ends the gather below; asyncio.run then cancels
+        # the stages still waiting on their queues
+        async def chunk_stage():
+            while (prepared := await asyncio.to_thread(_next_prepared)) is not done:
+                if prepared:
+                    await embed_queue.put(prepared)
+            await embed_queue.put(done)
+        
+        async def embed_stage():
+            while (prepared := await embed_queue.get()) is not done:
+                embedded = await self.document_embedder.aembed_chunks(prepared)
+                stats["chunks_embedded"] += len(embedded)
+                if embedded:
+                    await upsert_queue.put(embedded)
+            await upsert_queue.put(done)
+        
+        async def upsert_stage():
+            # Documents are regrouped so upserts keep their own batch size
+            buffer = UpsertBuffer(self.qdrant_manager)
+            
+            while (embedded := await upsert_queue.get()) is not done:
+                await buffer.add(embedded)
+            
+            stats["chunks_stored"] = await buffer.drain()
+        
+        try:
+            await asyncio.gather(chunk_stage(), embed_stage(), upsert_stage())
+        finally:
+            await self.qdrant_manager.aclose()
+            await http_client_factory.aclose()
+    
+    @staticmethod
+    def _count_extracted(
+        extracted: Iterable[ExtractedDoc],
+        stats: Dict[str, Any]
+    ) -> Iterator[ExtractedDoc]:
+        """Pass extracted documents through while counting successes and failures.
+        
+        Args:
+            extracted: Stream of ExtractedDoc records from DocumentExtractor
+            stats: Pipeline statistics to update
+            
+        Yields:
+            The extracted documents unchanged
+        """
+        for data in extracted:
+            if data.success:
+                stats["documents_processed"] += 1
+            else:
+                stats["documents_failed"] += 1
+            yield data
+    
+    def process_file(
+        self,
+        file_path: Path,
+        fast_ingest: bool = False,
+        skip_embedded: bool = False
+    ) -> Dict[str, Any]:
         """Process a single PDF file through the complete pipeline.
         
         Args:
             file_path: Path to PDF file
+            fast_ingest: Suspend HNSW indexing while storing chunks
+            skip_embedded: Skip the file if its contents are already stored in Qdrant
             
         Returns:
             Dictionary with pipeline statistics
@@ -136,16 +269,25 @@ class CustomerSupportPipeline:
         stats = {
             "documents_processed": 0,
             "documents_failed": 0,
+            "documents_skipped": 0,
             "total_chunks": 0,
             "chunks_embedded": 0,
             "chunks_stored": 0
         }
         
+        source_sha = None
+        if skip_embedded:
+            source_sha = file_digest(file_path)
+            if self.qdrant_manager.has_source(source_sha):
+                stats["documents_skipped"] = 1
+                logger.info(f"Skipping already-ingested file: {file_path}")
+                return stats
+        
         # Stage 1: Extract document
         logger.info("Stage 1: Extracting document")
-        extracted_data = self.document_extractor.extract_from_file(file_path)
+        extracted_data = self.document_extractor.extract_from_file(file_path, source_sha)
         
-        if extracted_data["metadata"]["success"]:
+        if extracted_data.success:
             stats["documents_processed"] = 1
         else:
             stats["documents_failed"] = 1
@@ -154,18 +296,18 @@ class CustomerSupportPipeline:
         
         # Stage 2: Chunk document
         logger.info("Stage 2: Chunking document")
-        chunks = self.document_chunker.chunk_document(
-            document=extracted_data["document"],
-            source_filename=extracted_data["metadata"]["filename"],
-            source_filepath=extracted_data["metadata"]["filepath"],
-            original_metadata=extracted_data["metadata"]
+        batch = self.document_chunker.chunk_document_batch(
+            document=extracted_data.document,
+            source_filename=extracted_data.filename,
+            source_filepath=extracted_data.filepath,
+            original_metadata=extracted_data.metadata_dict()
         )
-        stats["total_chunks"] = len(chunks)
+        stats["total_chunks"] = len(batch)
         
         # Stage 3: Filter and prepare chunks
         logger.info("Stage 3: Filtering chunks")
-        filtered_chunks = self.chunk_processor.filter_chunks(chunks)
-        prepared_chunks = self.chunk_processor.prepare_for_embedding(filtered_chunks)
+        filtered_batch = self.chunk_processor.filter_batch(batch)
+        prepared_chunks = self.chunk_processor.prepare_batch_for_embedding(filtered_batch)
         
         # Stage 4: Generate embeddings
         logger.info("Stage 4: Generating embeddings")
@@ -174,8 +316,13 @@ class CustomerSupportPipeline:
         
         # Stage 5: Store in Qdrant
         logger.info("Stage 5: Storing in Qdrant")
-        stored_count = self.qdrant_manager.insert_chunks(embedded_chunks)
-        stats["chunks_stored"] = stored_count
+        if fast_ingest:
+            self.qdrant_manager.begin_bulk_load()
+        try:
+            stats["chunks_stored"] = self.qdrant_manager.insert_chunks(embedded_chunks)
+        finally:
+            if self.qdrant_manager.index_suspended():
+                self.qdrant_manager.finalize_index()
         
         logger.info(f"Pipeline complete! Stats: {stats}")
         
@@ -196,21 +343,71 @@ class SearchPipeline:
     Single Responsibility: Coordinate search and retrieval operations.
     """
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, cache_dir: Optional[Path] = None):
         """Initialize search pipeline.
         
         Args:
             config: Main configuration object
+            cache_dir: Optional directory for a disk-persistent query embedding
+                cache, so repeated queries across CLI runs skip the embedding API
         """
         self.config = config
         
         # Initialize components
-        embedding_generator = EmbeddingGenerator(config.nvidia)
+        embedding_generator = get_embedding_generator(config.nvidia)
         self.document_embedder = DocumentEmbedder(embedding_generator)
-        self.qdrant_manager = QdrantManager(config.qdrant)
+        self.qdrant_manager = get_qdrant_manager(config.qdrant)
+        
+        self._embed_query = _embed_query
+        if cache_dir is not None:
+            memory = Memory(str(cache_dir), verbose=0)
+            self._embed_query = memory.cache(_embed_query, ignore=["document_embedder"])
+            logger.info(f"Query embedding cache enabled at {cache_dir}")
+        
+        # In-memory caches for the current process
+        retrieval = config.retrieval
+        self._embedding_cache = EmbeddingCache(retrieval.cache_capacity, retrieval.cache_ttl_seconds)
+        self._result_cache = EmbeddingCache(retrieval.cache_capacity, retrieval.cache_ttl_seconds)
+        
+        # Optional in-process search over a snapshot of the collection
+        self.local_search: Optional[LocalSearchBackend] = None
+        if retrieval.local_search:
+            self.local_search = LocalSearchBackend(
+                self.qdrant_manager, retrieval.local_search_max_points
+            )
         
         logger.info("SearchPipeline initialized")
     
+    def embed_query(self, query: str) -> Optional[np.ndarray]:
+        """Generate a query embedding, using the in-memory and disk caches.
+        
+        Args:
+            query: Search query text
+            
+        Returns:
+            Embedding vector or None if error
+        """
+        normalized_query = " ".join(query.split())
+        model_name = self.config.nvidia.embedding_model
+        
+        key = EmbeddingCache.make_key(model_name, normalized_query)
+        embedding = self._embedding_cache.get(key)
+        if embedding is not None:
+            return embedding
+        
+        try:
+            embedding = self._embed_query(
+                self.document_embedder,
+                model_name,
+                normalized_query
+            )
+        except QueryEmbeddingError as e:
+            logger.error(str(e))
+            return None
+        
+        self._embedding_cache.put(key, embedding)
+        return embedding
+    
     def search(
         self, 
         query: str,
@@ -219,6 +416,9 @@ class SearchPipeline:
     ) -> List[Dict[str, Any]]:
         """Search for documents relevant to a query.
         
+        Identical (query, top_k, score_threshold) requests are served from
+        the in-memory result cache.
+        
         Args:
             query: Search query text
             top_k: Number of results to return
@@ -229,23 +429,65 @@ class SearchPipeline:
         """
         logger.info(f"Searching for query: {query}")
         
+        normalized_query = " ".join(query.split())
+        key = EmbeddingCache.make_key(
+            self.config.nvidia.embedding_model, normalized_query, top_k, score_threshold
+        )
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            logger.info(f"Found {len(cached)} results (cached)")
+            return [dict(result) for result in cached]
+        
         # Generate query embedding
-        query_embedding = self.document_embedder.embed_query(query)
+        query_embedding = self.embed_query(query)
         
         if query_embedding is None:
             logger.error("Failed to generate query embedding")
             return []
         
-        # Search in Qdrant
-        results = self.qdrant_manager.search(
-            query_vector=query_embedding,
-            top_k=top_k,
-            score_threshold=score_threshold
-        )
+        results = None
+        if self.local_search is not None:
+            results = self.local_search.search(query_embedding, top_k, score_threshold)
+        
+        # Search in Qdrant when the local snapshot is unavailable
+        if results is None:
+            results = self.qdrant_manager.search(
+                query_vector=query_embedding,
+                top_k=top_k,
+                score_threshold=score_threshold
+            )
         
         logger.info(f"Found {len(results)} results")
         
+        if results:
+            self._result_cache.put(key, results)
+            return [dict(result) for result in results]
+        
         return results
+    
+    def warmup(self, queries: List[str]) -> int:
+        """Pre-compute embeddings for common queries.
+        
+        Args:
+            queries: Queries to embed ahead of time
+            
+        Returns:
+            Number of queries that are now cached
+        """
+        warmed = sum(1 for query in queries if self.embed_query(query) is not None)
+        logger.info(f"Warmed query cache with {warmed}/{len(queries)} queries")
+        return warmed
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get in-memory cache statistics.
+        
+        Returns:
+            Dictionary with embedding and result cache statistics
+        """
+        return {
+            "embeddings": self._embedding_cache.stats(),
+            "results": self._result_cache.stats()
+        }
 
 
 def setup_logging(log_file: Path = None):
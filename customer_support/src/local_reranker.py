@@ -0,0 +1,87 @@
+"""In-process cross-encoder reranking with ONNX Runtime."""
+
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PROVIDERS = ("CUDAExecutionProvider", "CPUExecutionProvider")
+
+
+class LocalReranker:
+    """Scores (query, passage) pairs with a local ONNX cross-encoder.
+
+    Single Responsibility: Rerank passages without a network round-trip.
+
+    Requires the optional ``onnxruntime`` and ``tokenizers`` packages.
+    """
+
+    def __init__(
+        self,
+        onnx_path: str,
+        tokenizer_path: str,
+        max_length: int = 512,
+        providers: Optional[Sequence[str]] = None
+    ):
+        """Load the model and tokenizer.
+
+        Args:
+            onnx_path: Path to the exported cross-encoder ONNX model
+            tokenizer_path: Path to the model's ``tokenizer.json``
+            max_length: Maximum tokens per (query, passage) pair
+            providers: ONNX Runtime execution providers in priority order
+                (default: CUDA, then CPU; unavailable providers are skipped)
+        """
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "Local reranking requires onnxruntime and tokenizers: "
+                "pip install onnxruntime-gpu tokenizers"
+            ) from e
+
+        available = set(ort.get_available_providers())
+        selected = [p for p in (providers or _DEFAULT_PROVIDERS) if p in available]
+
+        self.session = ort.InferenceSession(onnx_path, providers=selected or None)
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        logger.info(
+            "LocalReranker loaded %s (providers: %s)",
+            onnx_path, ", ".join(self.session.get_providers())
+        )
+
+    def score(self, query: str, passages: List[str]) -> np.ndarray:
+        """Score every passage against the query in one batched session call.
+
+        Args:
+            query: Search query
+            passages: Passage texts
+
+        Returns:
+            Relevance logits, one per passage (higher is more relevant)
+        """
+        if not passages:
+            return np.empty(0, dtype=np.float32)
+
+        encodings = self.tokenizer.encode_batch([(query, passage) for passage in passages])
+
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feeds = {name: value for name, value in feeds.items() if name in self._input_names}
+
+        logits = self.session.run(None, feeds)[0]
+
+        # Single-logit heads give (N, 1); two-class heads give (N, 2) with
+        # the relevant class last
+        return np.asarray(logits, dtype=np.float32).reshape(len(passages), -1)[:, -1]
@@ -0,0 +1,122 @@
+"""In-process brute-force vector search over a snapshot of the collection."""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from src.qdrant_manager import QdrantManager, SearchResultBatch
+
+logger = logging.getLogger(__name__)
+
+
+class LocalSearchBackend:
+    """Exact cosine search over an in-memory copy of the collection vectors.
+
+    Single Responsibility: Answer top-k similarity queries locally so small
+    collections skip the Qdrant round-trip.
+    """
+
+    def __init__(self, qdrant_manager: QdrantManager, max_points: int = 100000):
+        """Initialize the backend.
+
+        Args:
+            qdrant_manager: Source of the vectors and payloads (Dependency Injection)
+            max_points: Largest collection that will be loaded into memory
+        """
+        self.qdrant_manager = qdrant_manager
+        self.max_points = max_points
+        self._ids: List[Any] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._payloads: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self) -> bool:
+        """Pull all vectors and payloads from Qdrant and L2-normalize them.
+
+        Returns:
+            True if the snapshot is available for searching
+        """
+        with self._lock:
+            if self._loaded:
+                return self._vectors is not None
+
+            self._loaded = True
+            point_count = self.qdrant_manager.count_documents()
+
+            if point_count == 0 or point_count > self.max_points:
+                logger.info(
+                    "Local search disabled: collection has %d points (limit %d)",
+                    point_count, self.max_points
+                )
+                return False
+
+            ids, vectors, payloads = self.qdrant_manager.export_points()
+
+            # Normalize once so each query is a single mat-vec product
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            np.maximum(norms, np.finfo(np.float32).tiny, out=norms)
+            vectors /= norms
+
+            self._ids = ids
+            self._vectors = np.ascontiguousarray(vectors)
+            self._payloads = payloads
+
+            logger.info("Local search loaded %d vectors", len(ids))
+            return True
+
+    def invalidate(self):
+        """Drop the snapshot so the next search reloads it."""
+        with self._lock:
+            self._ids = []
+            self._vectors = None
+            self._payloads = []
+            self._loaded = False
+
+    def search(
+        self,
+        query_vector: Union[np.ndarray, List[float]],
+        top_k: int = 10,
+        score_threshold: Optional[float] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Search the snapshot for the most similar chunks.
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results to return
+            score_threshold: Minimum similarity score
+
+        Returns:
+            Search results in the same format as QdrantManager.search, or
+            None if the snapshot is unavailable
+        """
+        if not self.load():
+            return None
+
+        vectors = self._vectors
+        query = np.asarray(query_vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
+
+        scores = vectors @ (query / query_norm)
+
+        k = min(top_k, scores.shape[0])
+        if k <= 0:
+            return []
+
+        # Partial selection, then sort only the k survivors
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+
+        if score_threshold is not None:
+            top = top[scores[top] >= score_threshold]
+
+        batch = SearchResultBatch.from_payloads(
+            ids=[self._ids[i] for i in top],
+            scores=scores[top].astype(np.float64),
+            payloads=[self._payloads[i] for i in top]
+        )
+        return batch.to_records()
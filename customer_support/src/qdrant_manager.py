@@ -1,23 +1,285 @@
 """Qdrant vector database management module."""
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import uuid
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
 from datetime import datetime
+from hashlib import blake2b
 
-from qdrant_client import QdrantClient
+import numpy as np
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import (
     Distance,
+    HnswConfigDiff,
+    OptimizersConfigDiff,
     VectorParams,
     PointStruct,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SearchRequest,
     Filter,
     FieldCondition,
-    MatchValue
+    MatchValue,
+    PayloadSchemaType,
+    PayloadSelectorInclude
 )
 
 from config.config import QdrantConfig
 
 logger = logging.getLogger(__name__)
 
+# Payload key holding each source file's content digest
+_SOURCE_SHA_KEY = "metadata.source_sha"
+
+# Search over int8 codes, then rescore the oversampled candidates with
+# the original float32 vectors
+_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
+# Payload keys read by SearchResultBatch; excludes ingest-only fields
+_PAYLOAD_FIELDS = [
+    "text",
+    "chunk_id",
+    "chunk_index",
+    "source_filename",
+    "source_filepath",
+    "metadata",
+    "char_count",
+]
+
+_RESULT_FIELDS = (
+    "id",
+    "score",
+    "text",
+    "chunk_id",
+    "chunk_index",
+    "source_filename",
+    "source_filepath",
+    "metadata",
+    "char_count",
+)
+
+
+_PASSTHROUGH = (str, int, float, bool, type(None))
+
+
+def _sanitize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Make chunk metadata JSON-safe for the Qdrant payload.
+    
+    Scalars pass through, nested dicts are sanitized, list and tuple items
+    become strings, and anything else is converted with str(). Nested dicts
+    are walked with an explicit stack rather than recursion. Flat metadata
+    that is already JSON-safe is returned as-is.
+    
+    Args:
+        metadata: Metadata dictionary from the chunk
+        
+    Returns:
+        JSON-safe metadata dictionary
+    """
+    if all(type(value) in _PASSTHROUGH for value in metadata.values()):
+        return metadata
+    
+    sanitized: Dict[str, Any] = {}
+    stack = [(metadata, sanitized)]
+    
+    while stack:
+        source, target = stack.pop()
+        for key, value in source.items():
+            value_type = type(value)
+            if value_type in _PASSTHROUGH:
+                target[key] = value
+            elif value_type is dict:
+                nested: Dict[str, Any] = {}
+                target[key] = nested
+                stack.append((value, nested))
+            elif value_type in (list, tuple):
+                target[key] = [str(item) for item in value]
+            else:
+                target[key] = str(value)
+    
+    return sanitized
+
+
+def _point_id(source_filepath: str, chunk_id: str) -> str:
+    """Derive a stable point ID for a chunk.
+    
+    Re-ingesting the same file overwrites its points instead of colliding
+    with chunks from other files.
+    
+    Args:
+        source_filepath: Path of the source document
+        chunk_id: Chunk identifier within the document
+        
+    Returns:
+        UUID string built from a 16-byte BLAKE2b digest
+    """
+    digest = blake2b(f"{source_filepath}_{chunk_id}".encode("utf-8"), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest))
+
+
+def _payload_selector(fields: Optional[Sequence[str]]) -> PayloadSelectorInclude:
+    """Build the payload selector for a search request.
+    
+    Args:
+        fields: Payload keys to return (None for all result fields)
+        
+    Returns:
+        Include-list payload selector
+    """
+    return PayloadSelectorInclude(include=list(fields) if fields is not None else _PAYLOAD_FIELDS)
+
+
+# Sync clients shared by every QdrantManager in the process, keyed on
+# (url, prefer_grpc, grpc_port) -> (client, whether gRPC is in use)
+_CLIENT_CACHE: Dict[Tuple[str, bool, int], Tuple[QdrantClient, bool]] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _connect(config: QdrantConfig) -> Tuple[QdrantClient, bool]:
+    """Create a sync client, preferring gRPC when configured.
+    
+    gRPC sends vectors as binary protobuf instead of JSON. If the gRPC
+    port does not answer, fall back to the REST transport.
+    
+    Args:
+        config: Qdrant configuration
+        
+    Returns:
+        Tuple of (client, whether gRPC is in use)
+    """
+    if config.prefer_grpc:
+        client = QdrantClient(
+            url=config.url,
+            prefer_grpc=True,
+            grpc_port=config.grpc_port
+        )
+        try:
+            client.get_collections()
+            return client, True
+        except Exception as e:
+            logger.warning(
+                "gRPC port %d unreachable (%s), falling back to REST",
+                config.grpc_port, e
+            )
+            client.close()
+    
+    return QdrantClient(url=config.url), False
+
+
+def _get_client(config: QdrantConfig) -> Tuple[QdrantClient, bool]:
+    """Return the shared sync client for a server, connecting on first use.
+    
+    Args:
+        config: Qdrant configuration
+        
+    Returns:
+        Tuple of (client, whether gRPC is in use)
+    """
+    key = (config.url, config.prefer_grpc, config.grpc_port)
+    
+    with _CLIENT_LOCK:
+        cached = _CLIENT_CACHE.get(key)
+        if cached is None:
+            cached = _CLIENT_CACHE[key] = _connect(config)
+    
+    return cached
+
+
+@dataclass(slots=True)
+class SearchResultBatch:
+    """Column-oriented (struct-of-arrays) view of one search response.
+    
+    Single Responsibility: Hold search hits as parallel columns so batch
+    consumers can read a whole field without touching every record.
+    """
+    ids: List[Any]
+    scores: np.ndarray
+    texts: List[str]
+    chunk_ids: List[str]
+    chunk_indices: List[int]
+    source_filenames: List[str]
+    source_filepaths: List[str]
+    metadata: List[Dict[str, Any]]
+    char_counts: List[int]
+    
+    @classmethod
+    def from_points(cls, points: Sequence[Any]) -> "SearchResultBatch":
+        """Build a batch directly from Qdrant scored points.
+        
+        Args:
+            points: Scored points returned by the Qdrant client
+            
+        Returns:
+            SearchResultBatch with one entry per point, in response order
+        """
+        return cls.from_payloads(
+            ids=[point.id for point in points],
+            scores=np.fromiter(
+                (point.score for point in points), dtype=np.float64, count=len(points)
+            ),
+            payloads=[point.payload or {} for point in points]
+        )
+    
+    @classmethod
+    def from_payloads(
+        cls,
+        ids: List[Any],
+        scores: np.ndarray,
+        payloads: Sequence[Dict[str, Any]]
+    ) -> "SearchResultBatch":
+        """Build a batch from parallel id, score and payload sequences.
+        
+        Args:
+            ids: Point IDs
+            scores: Similarity scores (float64)
+            payloads: Point payloads
+            
+        Returns:
+            SearchResultBatch with one entry per id, in input order
+        """
+        return cls(
+            ids=ids,
+            scores=scores,
+            texts=[payload.get("text", "") for payload in payloads],
+            chunk_ids=[payload.get("chunk_id", "") for payload in payloads],
+            chunk_indices=[payload.get("chunk_index", 0) for payload in payloads],
+            source_filenames=[payload.get("source_filename", "") for payload in payloads],
+            source_filepaths=[payload.get("source_filepath", "") for payload in payloads],
+            metadata=[payload.get("metadata", {}) for payload in payloads],
+            char_counts=[payload.get("char_count", 0) for payload in payloads],
+        )
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Convert the batch to one dictionary per hit.
+        
+        Returns:
+            List of result dictionaries with plain Python (JSON-safe) values
+        """
+        columns = (
+            self.ids,
+            self.scores.tolist(),
+            self.texts,
+            self.chunk_ids,
+            self.chunk_indices,
+            self.source_filenames,
+            self.source_filepaths,
+            self.metadata,
+            self.char_counts,
+        )
+        return [dict(zip(_RESULT_FIELDS, row)) for row in zip(*columns)]
+
 
 class QdrantManager:
     """Manages Qdrant vector database operations.
@@ -32,7 +294,8 @@ class QdrantManager:
             config: Qdrant configuration (Dependency Injection)
         """
         self.config = config
-        self.client = QdrantClient(url=config.url)
+        self.client, self._use_grpc = _get_client(config)
+        self._async_client: Optional[AsyncQdrantClient] = None
         logger.info(f"QdrantManager initialized, connecting to {config.url}")
         
         # Ensure collection exists
@@ -41,17 +304,34 @@ class QdrantManager:
     def _ensure_collection(self):
         """Ensure the collection exists, create if not."""
         try:
-            collections = self.client.get_collections()
-            collection_names = [c.name for c in collections.collections]
-            
-            if self.config.collection_name not in collection_names:
+            if not self.client.collection_exists(self.config.collection_name):
                 logger.info(f"Creating collection: {self.config.collection_name}")
                 self.client.create_collection(
                     collection_name=self.config.collection_name,
                     vectors_config=VectorParams(
                         size=self.config.embedding_dim,
-                        distance=Distance.COSINE
-                    )
+                        distance=Distance.COSINE,
+                        on_disk=self.config.on_disk
+                    ),
+                    on_disk_payload=self.config.on_disk,
+                    # int8 codes stay in RAM for HNSW traversal; raw vectors
+                    # are memory-mapped and only read for rescoring
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(
+                            type=ScalarType.INT8,
+                            quantile=0.99,
+                            always_ram=True
+                        )
+                    ),
+                    # Bulk-load mode: store points without linking them into
+                    # the HNSW graph until finalize_index() is called
+                    hnsw_config=HnswConfigDiff(m=0)
+                )
+                # Indexed so re-runs can look up already-ingested files cheaply
+                self.client.create_payload_index(
+                    collection_name=self.config.collection_name,
+                    field_name=_SOURCE_SHA_KEY,
+                    field_schema=PayloadSchemaType.KEYWORD
                 )
                 logger.info("Collection created successfully")
             else:
@@ -61,36 +341,52 @@ class QdrantManager:
             logger.error(f"Error ensuring collection exists: {e}", exc_info=True)
             raise
     
-    def insert_chunks(
-        self, 
-        chunks: List[Dict[str, Any]]
-    ) -> int:
-        """Insert document chunks with embeddings into Qdrant.
+    def _get_async_client(self) -> AsyncQdrantClient:
+        """Return the async client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = AsyncQdrantClient(
+                url=self.config.url,
+                prefer_grpc=self._use_grpc,
+                grpc_port=self.config.grpc_port
+            )
+        return self._async_client
+    
+    def _iter_points(self, chunks: List[Dict[str, Any]]) -> Iterator[PointStruct]:
+        """Lazily convert embedded chunks into Qdrant points.
         
         Args:
             chunks: List of chunks with embeddings and metadata
             
-        Returns:
-            Number of successfully inserted chunks
+        Yields:
+            Points ready for upsert (invalid chunks are skipped)
         """
-        if not chunks:
-            logger.warning("No chunks provided for insertion")
-            return 0
-        
-        logger.info(f"Inserting {len(chunks)} chunks into Qdrant")
-        
-        points = []
+        # One timestamp for the whole insert call
+        inserted_at = datetime.utcnow().isoformat()
         
         for i, chunk in enumerate(chunks):
             # Validate chunk has embedding
             if "embedding" not in chunk:
-                logger.warning(f"Skipping chunk {i}: no embedding found")
+                logger.warning("Skipping chunk %d: no embedding found", i)
                 continue
             
-            # Create point
+            # Validate shape and values in one vectorized pass
+            try:
+                vector = np.asarray(chunk["embedding"], dtype=np.float32)
+            except (TypeError, ValueError):
+                logger.warning("Skipping chunk %d: embedding is not numeric", i)
+                continue
+            
+            if vector.shape != (self.config.embedding_dim,) or not np.isfinite(vector).all():
+                logger.warning(
+                    "Skipping chunk %d: invalid embedding (shape %s, expected (%d,))",
+                    i, vector.shape, self.config.embedding_dim
+                )
+                continue
+            
+            # Create point (convert to a list only at the client boundary)
             point = PointStruct(
-                id=i,  # Simple sequential ID, or use hash for uniqueness
-                vector=chunk["embedding"],
+                id=_point_id(chunk["source_filepath"], chunk["chunk_id"]),
+                vector=vector.tolist(),
                 payload={
                     "text": chunk["text"],
                     "chunk_id": chunk["chunk_id"],
@@ -98,56 +394,264 @@ class QdrantManager:
                     "source_filename": chunk["source_filename"],
                     "source_filepath": chunk["source_filepath"],
                     "char_count": chunk["char_count"],
-                    "metadata": chunk.get("metadata", {}),
-                    "inserted_at": datetime.utcnow().isoformat()
+                    "metadata": _sanitize_metadata(chunk.get("metadata", {})),
+                    "inserted_at": inserted_at
                 }
             )
             
-            points.append(point)
+            yield point
+    
+    async def ainsert_chunks(
+        self,
+        chunks: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ) -> int:
+        """Insert document chunks with embeddings using concurrent upserts.
         
-        try:
-            # Insert points in batches
-            batch_size = 100
-            successful = 0
+        Points are built lazily and sent in batches by ``max_in_flight``
+        workers sharing one generator, so memory stays bounded regardless of
+        ingest size. Upserts use ``wait=False``, so Qdrant acknowledges each
+        batch before applying it. Batches that fail are queued and retried
+        once all workers have drained the generator. The final batch is held
+        back and sent last with ``wait=True``; Qdrant applies updates in
+        order, so the returned count only covers persisted points.
+        
+        Args:
+            chunks: List of chunks with embeddings and metadata
+            batch_size: Number of points per upsert request
+                (defaults to QdrantConfig.upsert_batch_size)
+            max_in_flight: Maximum concurrent upsert requests
+                (defaults to QdrantConfig.max_concurrent_upserts)
             
-            for i in range(0, len(points), batch_size):
-                batch = points[i:i + batch_size]
-                
-                self.client.upsert(
+        Returns:
+            Number of successfully inserted chunks
+        """
+        if not chunks:
+            logger.warning("No chunks provided for insertion")
+            return 0
+        
+        logger.info("Inserting %d chunks into Qdrant", len(chunks))
+        
+        batch_size = batch_size or self.config.upsert_batch_size
+        max_in_flight = max_in_flight or self.config.max_concurrent_upserts
+        point_iter = self._iter_points(chunks)
+        client = self._get_async_client()
+        failed: List[List[PointStruct]] = []
+        final: List[PointStruct] = []
+        
+        async def _upsert(batch: List[PointStruct], wait: bool = False) -> int:
+            try:
+                await client.upsert(
                     collection_name=self.config.collection_name,
-                    points=batch
+                    points=batch,
+                    wait=wait
                 )
-                
-                successful += len(batch)
-                logger.debug(f"Inserted batch: {successful}/{len(points)}")
-            
-            logger.info(f"Successfully inserted {successful} chunks")
-            return successful
+            except Exception as e:
+                logger.warning("Error inserting batch of %d points: %s", len(batch), e)
+                failed.append(batch)
+                return 0
+            logger.debug("Inserted batch of %d points", len(batch))
+            return len(batch)
+        
+        async def _worker(batches: Iterator[List[PointStruct]]) -> int:
+            # Workers share one iterator, so at most
+            # max_in_flight * batch_size points exist at once
+            sent = 0
+            for batch in batches:
+                sent += await _upsert(batch)
+            return sent
+        
+        def _batches() -> Iterator[List[PointStruct]]:
+            # One batch of lookahead, so the last one can be held back
+            batch = list(islice(point_iter, batch_size))
+            while batch:
+                following = list(islice(point_iter, batch_size))
+                if not following:
+                    final.extend(batch)
+                    return
+                yield batch
+                batch = following
+        
+        batches = _batches()
+        counts = await asyncio.gather(*(_worker(batches) for _ in range(max_in_flight)))
+        successful = sum(counts)
+        
+        for attempt in range(1, self.config.upsert_retries + 1):
+            if not failed:
+                break
+            retry_batches = iter(failed)
+            failed = []
+            logger.info("Retrying failed batches (attempt %d)", attempt)
+            await asyncio.sleep(2 ** (attempt - 1))
+            counts = await asyncio.gather(*(_worker(retry_batches) for _ in range(max_in_flight)))
+            successful += sum(counts)
+        
+        if failed:
+            logger.error(
+                "Giving up on %d points after %d retries",
+                sum(len(batch) for batch in failed), self.config.upsert_retries
+            )
+        
+        if final:
+            # Waiting on the last upsert waits for every update queued before it
+            for attempt in range(self.config.upsert_retries + 1):
+                if attempt:
+                    await asyncio.sleep(2 ** (attempt - 1))
+                if await _upsert(final, wait=True):
+                    successful += len(final)
+                    break
+            else:
+                logger.error("Could not confirm queued upserts were applied")
+                return 0
+        
+        logger.info("Successfully inserted %d chunks", successful)
+        return successful
+    
+    def insert_chunks(
+        self, 
+        chunks: List[Dict[str, Any]]
+    ) -> int:
+        """Insert document chunks with embeddings into Qdrant.
+        
+        Synchronous entry point for :meth:`ainsert_chunks`; must not be
+        called from inside a running event loop.
+        
+        Args:
+            chunks: List of chunks with embeddings and metadata
             
+        Returns:
+            Number of successfully inserted chunks
+        """
+        async def _run() -> int:
+            try:
+                return await self.ainsert_chunks(chunks)
+            finally:
+                await self.aclose()
+        
+        try:
+            return asyncio.run(_run())
         except Exception as e:
-            logger.error(f"Error inserting chunks: {e}", exc_info=True)
+            logger.error("Error inserting chunks: %s", e, exc_info=True)
             return 0
     
+    def begin_bulk_load(self):
+        """Suspend HNSW graph updates on an existing collection.
+        
+        New collections already start in this mode. Pair with
+        :meth:`finalize_index` once ingestion is complete; until then,
+        searches fall back to slower unindexed scans.
+        """
+        try:
+            self.client.update_collection(
+                collection_name=self.config.collection_name,
+                hnsw_config=HnswConfigDiff(m=0)
+            )
+            logger.info("HNSW indexing suspended for %s", self.config.collection_name)
+        except Exception as e:
+            logger.error("Error suspending HNSW indexing: %s", e, exc_info=True)
+    
+    def index_suspended(self) -> bool:
+        """Check whether the collection is in bulk-load mode (``m=0``).
+        
+        Reads the collection's stored config rather than local state, since
+        any process that creates the collection leaves it unindexed.
+        
+        Returns:
+            True if HNSW indexing is currently suspended
+        """
+        info = self.client.get_collection(self.config.collection_name)
+        return info.config.hnsw_config.m == 0
+    
+    def finalize_index(self, m: int = 16, indexing_threshold: int = 20000):
+        """Build the HNSW index after bulk ingestion.
+        
+        Collections are created with ``m=0`` so upserts only store points
+        instead of updating the graph on every batch. Call this once the
+        final ``insert_chunks`` batch has been sent; Qdrant then builds the
+        index in the background. Only call this while
+        :meth:`index_suspended` is True; on an indexed collection it would
+        replace the HNSW and optimizer settings and trigger a re-index.
+        
+        Args:
+            m: Number of HNSW edges per node
+            indexing_threshold: Segment size (in KB) above which vectors are indexed
+            
+        Raises:
+            Exception: If the update fails; the collection then stays unindexed
+        """
+        try:
+            self.client.update_collection(
+                collection_name=self.config.collection_name,
+                hnsw_config=HnswConfigDiff(m=m),
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=indexing_threshold)
+            )
+            logger.info("HNSW indexing enabled for %s (m=%d)", self.config.collection_name, m)
+        except Exception as e:
+            logger.error(
+                "Error enabling HNSW indexing; %s stays unindexed until "
+                "finalize_index() succeeds: %s",
+                self.config.collection_name, e, exc_info=True
+            )
+            raise
+    
+    async def aclose(self):
+        """Close the async client, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+    
     def search(
         self, 
-        query_vector: List[float],
+        query_vector: Union[np.ndarray, List[float]],
         top_k: int = 10,
         score_threshold: Optional[float] = None,
-        filter_conditions: Optional[Dict[str, Any]] = None
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar chunks in Qdrant.
         
         Args:
-            query_vector: Query embedding vector
+            query_vector: Query embedding vector (float32 array or list)
             top_k: Number of results to return
             score_threshold: Minimum similarity score (0-1)
             filter_conditions: Optional filter conditions
+            fields: Payload keys to fetch (None for all result fields);
+                keys not fetched get their default value
             
         Returns:
             List of search results with text, metadata, and scores
         """
+        return self.search_columns(
+            query_vector,
+            top_k=top_k,
+            score_threshold=score_threshold,
+            filter_conditions=filter_conditions,
+            fields=fields
+        ).to_records()
+    
+    def search_columns(
+        self, 
+        query_vector: Union[np.ndarray, List[float]],
+        top_k: int = 10,
+        score_threshold: Optional[float] = None,
+        filter_conditions: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> SearchResultBatch:
+        """Search for similar chunks and return the hits column-wise.
+        
+        Args:
+            query_vector: Query embedding vector (float32 array or list)
+            top_k: Number of results to return
+            score_threshold: Minimum similarity score (0-1)
+            filter_conditions: Optional filter conditions
+            fields: Payload keys to fetch (None for all result fields)
+            
+        Returns:
+            SearchResultBatch (empty on error)
+        """
         try:
-            logger.info(f"Searching for top {top_k} results")
+            logger.info("Searching for top %d results", top_k)
             
             # Build filter if provided
             query_filter = None
@@ -160,32 +664,72 @@ class QdrantManager:
                 query_vector=query_vector,
                 limit=top_k,
                 score_threshold=score_threshold,
-                query_filter=query_filter
+                query_filter=query_filter,
+                search_params=_SEARCH_PARAMS,
+                with_payload=_payload_selector(fields)
             )
             
-            # Format results
-            formatted_results = []
+            batch = SearchResultBatch.from_points(results)
+            logger.info("Found %d results", len(batch))
             
-            for result in results:
-                formatted_results.append({
-                    "id": result.id,
-                    "score": result.score,
-                    "text": result.payload.get("text", ""),
-                    "chunk_id": result.payload.get("chunk_id", ""),
-                    "chunk_index": result.payload.get("chunk_index", 0),
-                    "source_filename": result.payload.get("source_filename", ""),
-                    "source_filepath": result.payload.get("source_filepath", ""),
-                    "metadata": result.payload.get("metadata", {}),
-                    "char_count": result.payload.get("char_count", 0)
-                })
+            return batch
             
-            logger.info(f"Found {len(formatted_results)} results")
+        except Exception as e:
+            logger.error("Error during search: %s", e, exc_info=True)
+            return SearchResultBatch.from_points([])
+    
+    def search_many(
+        self,
+        query_vectors: Sequence[Optional[Union[np.ndarray, List[float]]]],
+        top_k: int = 10,
+        score_threshold: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several query vectors in a single request.
+        
+        Uses Qdrant's batch search so N queries cost one round-trip.
+        
+        Args:
+            query_vectors: Query embedding vectors; None entries (queries
+                that failed to embed) are skipped and get no results
+            top_k: Number of results to return per query
+            score_threshold: Minimum similarity score (0-1)
+            fields: Payload keys to fetch (None for all result fields)
+            
+        Returns:
+            List of result lists, one per query vector in input order
+        """
+        all_results: List[List[Dict[str, Any]]] = [[] for _ in query_vectors]
+        positions = [i for i, vector in enumerate(query_vectors) if vector is not None]
+        if not positions:
+            return all_results
+        
+        try:
+            logger.info("Batch searching %d queries for top %d results", len(positions), top_k)
             
-            return formatted_results
+            requests = [
+                SearchRequest(
+                    vector=np.asarray(query_vectors[i], dtype=np.float32).tolist(),
+                    limit=top_k,
+                    score_threshold=score_threshold,
+                    params=_SEARCH_PARAMS,
+                    with_payload=_payload_selector(fields)
+                )
+                for i in positions
+            ]
+            
+            responses = self.client.search_batch(
+                collection_name=self.config.collection_name,
+                requests=requests
+            )
+            
+            for i, points in zip(positions, responses):
+                all_results[i] = SearchResultBatch.from_points(points).to_records()
             
         except Exception as e:
-            logger.error(f"Error during search: {e}", exc_info=True)
-            return []
+            logger.error("Error during batch search: %s", e, exc_info=True)
+        
+        return all_results
     
     def _build_filter(self, conditions: Dict[str, Any]) -> Filter:
         """Build Qdrant filter from conditions dictionary.
@@ -208,6 +752,29 @@ class QdrantManager:
         
         return Filter(must=must_conditions)
     
+    def has_source(self, source_sha: str) -> bool:
+        """Check whether chunks from a file with this content digest are stored.
+        
+        Args:
+            source_sha: Content digest from ``data_ingestion.file_digest``
+            
+        Returns:
+            True if at least one point carries the digest (False on error,
+            so the file is processed again rather than silently dropped)
+        """
+        try:
+            records, _ = self.client.scroll(
+                collection_name=self.config.collection_name,
+                scroll_filter=self._build_filter({_SOURCE_SHA_KEY: source_sha}),
+                limit=1,
+                with_payload=False,
+                with_vectors=False
+            )
+            return bool(records)
+        except Exception as e:
+            logger.error("Error looking up source digest %s: %s", source_sha, e, exc_info=True)
+            return False
+    
     def delete_collection(self):
         """Delete the entire collection (use with caution!)."""
         try:
@@ -217,6 +784,45 @@ class QdrantManager:
         except Exception as e:
             logger.error(f"Error deleting collection: {e}", exc_info=True)
     
+    def export_points(
+        self,
+        batch_size: int = 1024
+    ) -> Tuple[List[Any], np.ndarray, List[Dict[str, Any]]]:
+        """Read every point in the collection with its vector and payload.
+        
+        Args:
+            batch_size: Points fetched per scroll request
+            
+        Returns:
+            Tuple of (ids, float32 vectors of shape (N, embedding_dim), payloads)
+        """
+        ids: List[Any] = []
+        vectors: List[Any] = []
+        payloads: List[Dict[str, Any]] = []
+        offset = None
+        
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.config.collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=_payload_selector(None),
+                with_vectors=True
+            )
+            
+            for record in records:
+                ids.append(record.id)
+                vectors.append(record.vector)
+                payloads.append(record.payload or {})
+            
+            if offset is None:
+                break
+        
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, self.config.embedding_dim)
+        logger.info("Exported %d points from %s", len(ids), self.config.collection_name)
+        
+        return ids, matrix, payloads
+    
     def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the collection.
         
@@ -251,3 +857,73 @@ class QdrantManager:
         except Exception as e:
             logger.error(f"Error counting documents: {e}", exc_info=True)
             return 0
+
+
+class UpsertBuffer:
+    """Accumulates embedded chunks and upserts them in background batches.
+    
+    Single Responsibility: Decouple the upsert batch size from the embedding
+    batch size and overlap Qdrant writes with ongoing embedding.
+    """
+    
+    def __init__(
+        self,
+        qdrant_manager: QdrantManager,
+        size: Optional[int] = None,
+        max_in_flight: Optional[int] = None
+    ):
+        """Initialize the buffer.
+        
+        Args:
+            qdrant_manager: Manager used to upsert (Dependency Injection)
+            size: Chunks per flush (defaults to QdrantConfig.upsert_batch_size)
+            max_in_flight: Maximum concurrent flushes
+                (defaults to QdrantConfig.max_concurrent_upserts)
+        """
+        config = qdrant_manager.config
+        self.qdrant_manager = qdrant_manager
+        self.size = size or config.upsert_batch_size
+        self._semaphore = asyncio.Semaphore(max_in_flight or config.max_concurrent_upserts)
+        self._pending: List[Dict[str, Any]] = []
+        self._tasks: List[asyncio.Task] = []
+        self.stored = 0
+    
+    async def add(self, chunks: List[Dict[str, Any]]):
+        """Buffer embedded chunks, flushing full batches in the background.
+        
+        Waits only when ``max_in_flight`` flushes are already running.
+        
+        Args:
+            chunks: Chunks with embeddings and metadata
+        """
+        self._pending.extend(chunks)
+        
+        while len(self._pending) >= self.size:
+            batch = self._pending[:self.size]
+            del self._pending[:self.size]
+            await self._semaphore.acquire()
+            self._tasks.append(asyncio.create_task(self._flush(batch)))
+    
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        try:
+            self.stored += await self.qdrant_manager.ainsert_chunks(
+                batch, batch_size=len(batch), max_in_flight=1
+            )
+        finally:
+            self._semaphore.release()
+    
+    async def drain(self) -> int:
+        """Flush remaining chunks and wait for all background upserts.
+        
+        Returns:
+            Total number of chunks stored through this buffer
+        """
+        if self._pending:
+            batch, self._pending = self._pending, []
+            await self._semaphore.acquire()
+            self._tasks.append(asyncio.create_task(self._flush(batch)))
+        
+        tasks, self._tasks = self._tasks, []
+        await asyncio.gather(*tasks)
+        
+        return self.stored
@@ -0,0 +1,95 @@
+"""Process-wide token-bucket rate limiting for API requests."""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class AsyncRateLimiter:
+    """Token bucket that spaces out requests to stay under a rate limit.
+
+    Single Responsibility: Throttle outgoing requests proactively so bursts
+    queue locally instead of being rejected with 429s.
+
+    Each acquire reserves a token immediately and sleeps until it is due,
+    so waiters are served in arrival order. No asyncio primitives are held,
+    which lets one limiter be shared across event loops and threads.
+    """
+
+    def __init__(self, rate: int, per: float = 60.0):
+        """Initialize the limiter.
+
+        Args:
+            rate: Requests allowed per period (also the burst size)
+            per: Period length in seconds
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if per <= 0:
+            raise ValueError("per must be positive")
+
+        self.capacity = float(rate)
+        self._fill_rate = rate / per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self._fill_rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self._fill_rate)
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self):
+        """Block the calling thread until a request may be sent.
+
+        Draws from the same bucket as :meth:`acquire`, for synchronous
+        clients sharing the budget with async ones.
+        """
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+_LIMITERS: Dict[Tuple[str, int], AsyncRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(name: str, requests_per_minute: int) -> Optional[AsyncRateLimiter]:
+    """Return the process-wide limiter for an endpoint.
+
+    Args:
+        name: Endpoint name (e.g. "embeddings", "rerank")
+        requests_per_minute: Request budget (0 disables limiting)
+
+    Returns:
+        Shared limiter, or None when limiting is disabled
+    """
+    if requests_per_minute <= 0:
+        return None
+
+    key = (name, requests_per_minute)
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _LIMITERS[key] = AsyncRateLimiter(requests_per_minute, 60.0)
+        return limiter
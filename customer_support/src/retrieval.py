@@ -1,17 +1,49 @@
 """Retrieval module for customer support documents."""
 
+import hashlib
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional
-import aiohttp
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import httpx
 import numpy as np
+import orjson
 
-from .embedding import EmbeddingGenerator
-from .qdrant_manager import QdrantManager
+from .embedding import top_k_indices
+from .embedding_cache import EmbeddingCache
+from .local_reranker import LocalReranker
+from .rate_limiter import get_rate_limiter
+from .http_client import http_client_factory
+from .services import get_embedding_generator, get_qdrant_manager
 from config.config import Config
 
 logger = logging.getLogger(__name__)
 
+
+def _deduplicate_passages(passages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop passages whose normalized text duplicates an earlier passage.
+    
+    Overlapping chunk windows often produce byte-identical chunks; sending
+    them all to the reranker wastes tokens without changing the ranking.
+    
+    Args:
+        passages: Passages ordered by vector similarity
+        
+    Returns:
+        Passages with duplicates removed, original order preserved
+    """
+    seen = set()
+    unique = []
+    
+    for passage in passages:
+        digest = hashlib.sha1(passage["text"].strip().encode("utf-8")).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        unique.append(passage)
+    
+    return unique
+
+
 class RetrievalPipeline:
     """Handles document retrieval and reranking using NVIDIA models."""
     
@@ -22,14 +54,49 @@ class RetrievalPipeline:
             config: Main configuration object
         """
         self.config = config
-        self.embedding_generator = EmbeddingGenerator(config.nvidia)
-        self.qdrant_manager = QdrantManager(config.qdrant)
+        # Shared with other pipelines in this process
+        self.embedding_generator = get_embedding_generator(config.nvidia)
+        self.qdrant_manager = get_qdrant_manager(config.qdrant)
         self.session = None
+        self._rerank_limiter = get_rate_limiter("rerank", config.nvidia.rerank_rpm)
+        self._query_cache = EmbeddingCache(
+            config.retrieval.cache_capacity, config.retrieval.cache_ttl_seconds
+        )
+        
+        # Optional in-process cross-encoder; the NVIDIA endpoint is used otherwise
+        self.local_reranker: Optional[LocalReranker] = None
+        if config.retrieval.rerank_onnx_path:
+            self.local_reranker = LocalReranker(
+                config.retrieval.rerank_onnx_path,
+                config.retrieval.rerank_tokenizer_path
+            )
+    
+    async def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """Embed a search query, reusing cached embeddings for repeated queries.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Query embedding, or None if generation failed
+        """
+        normalized_query = " ".join(query.split())
+        key = EmbeddingCache.make_key(self.config.nvidia.embedding_model, normalized_query)
+        
+        embedding = self._query_cache.get(key)
+        if embedding is None:
+            embedding = await self.embedding_generator.generate_embedding(
+                normalized_query, input_type="query"
+            )
+            if embedding is not None:
+                self._query_cache.put(key, embedding)
+        
+        return embedding
     
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
+    async def _get_session(self) -> httpx.AsyncClient:
+        """Get the shared, connection-pooled HTTP client."""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            self.session = http_client_factory.get()
         return self.session
 
     async def _rerank(
@@ -38,7 +105,7 @@ class RetrievalPipeline:
         passages: List[Dict[str, Any]],
         top_k: int = 5
     ) -> List[Dict[str, Any]]:
-        """Rerank passages using NVIDIA reranking model.
+        """Rerank passages with the local cross-encoder, or the NVIDIA endpoint.
         
         Args:
             query: Search query
@@ -48,12 +115,49 @@ class RetrievalPipeline:
         Returns:
             Reranked passages with scores
         """
+        # Passages are capped at roughly the reranker's input length, full
+        # text stays on the returned results
+        max_chars = self.config.retrieval.rerank_max_chars
+        texts = [p["text"][:max_chars] for p in passages]
+        
+        try:
+            if self.local_reranker is not None:
+                # Inference is CPU/GPU-bound; keep the event loop free
+                scores = (
+                    await asyncio.to_thread(self.local_reranker.score, query, texts)
+                ).tolist()
+            else:
+                scores = await self._remote_scores(query, texts)
+                if scores is None:
+                    return passages[:top_k]
+            
+            scores = np.asarray(scores[:len(passages)], dtype=np.float64)
+            
+            # Copy only the top_k passages, best rerank score first
+            return [
+                {**passages[i], "rerank_score": float(scores[i])}
+                for i in top_k_indices(scores, top_k)
+            ]
+                
+        except Exception as e:
+            logger.error("Error during reranking: %s", e)
+            return passages[:top_k]
+
+    async def _remote_scores(self, query: str, texts: List[str]) -> Optional[List[float]]:
+        """Score passages with the NVIDIA reranking endpoint.
+        
+        Args:
+            query: Search query
+            texts: Passage texts
+            
+        Returns:
+            One score per passage, or None if the request failed
+        """
         session = await self._get_session()
         
-        # Prepare reranking payload
         payload = {
             "query": query,
-            "passages": [p["text"] for p in passages],
+            "passages": texts,
             "truncate": "NONE"
         }
         
@@ -62,42 +166,156 @@ class RetrievalPipeline:
             "Content-Type": "application/json"
         }
         
-        try:
-            # Create request
-            response = await session.post(
-                self.config.nvidia.rerank_url,
-                json=payload,
-                headers=headers,
-                timeout=self.config.nvidia.request_timeout
+        # Queue locally rather than bursting into 429s
+        if self._rerank_limiter is not None:
+            await self._rerank_limiter.acquire()
+        
+        # orjson encodes the passage list several times faster than json
+        response = await session.post(
+            self.config.nvidia.rerank_url,
+            content=orjson.dumps(payload),
+            headers=headers,
+            timeout=self.config.nvidia.request_timeout
+        )
+        if response.status_code != 200:
+            logger.error("Reranking failed: %s", response.status_code)
+            return None
+        
+        return orjson.loads(response.content)["scores"]
+
+    def _rerank_is_redundant(
+        self,
+        vector_results: List[Dict[str, Any]],
+        top_k: int
+    ) -> bool:
+        """Check whether the vector-search ranking is decisive enough to skip reranking.
+        
+        When the top hit leads the top_k-th hit by more than the configured
+        margin, reranking almost never changes the head of the list.
+        
+        Args:
+            vector_results: Vector search results sorted by score
+            top_k: Number of results that will be returned
+            
+        Returns:
+            True if reranking can be skipped
+        """
+        if len(vector_results) <= top_k:
+            return False
+        
+        margin = vector_results[0]["score"] - vector_results[top_k - 1]["score"]
+        
+        if margin > self.config.retrieval.rerank_skip_margin:
+            logger.info(
+                "Skipping rerank: vector score margin %.4f exceeds %s",
+                margin,
+                self.config.retrieval.rerank_skip_margin
             )
-            if response.status != 200:
-                logger.error(f"Reranking failed: {response.status}")
-                return passages[:top_k]
-                
-            data = await response.json()
-            scores = data["scores"]
-            
-            # Create copies of passages with rerank scores
-            reranked = []
-            for passage, score in zip(passages, scores):
-                reranked_passage = passage.copy()
-                reranked_passage["rerank_score"] = score
-                reranked.append(reranked_passage)
-            
-            # Sort by rerank score and take top_k
-            reranked.sort(key=lambda x: x["rerank_score"], reverse=True)
-            return reranked[:top_k]
-                
-        except Exception as e:
-            logger.error(f"Error during reranking: {e}")
-            return passages[:top_k]
+            return True
+        
+        return False
+
+    async def _vector_search(
+        self,
+        query: str,
+        top_k: int,
+        rerank: bool,
+        score_threshold: Optional[float],
+        filter_conditions: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Embed the query and run the vector search stage.
+        
+        Args:
+            query: Search query
+            top_k: Number of results that will be returned
+            rerank: Whether results will be reranked (fetches extra candidates)
+            score_threshold: Minimum similarity score threshold
+            filter_conditions: Optional payload field:value filter
+            
+        Returns:
+            Vector search results sorted by score
+        """
+        # Generate query embedding
+        query_embedding = await self._embed_query(query)
+        if query_embedding is None:
+            return []
+        
+        # The Qdrant client blocks; keep the event loop free for other
+        # queries' embedding and rerank requests
+        return await asyncio.to_thread(
+            self.qdrant_manager.search,
+            query_vector=query_embedding,
+            top_k=top_k * 2 if rerank else top_k,  # Get more results if reranking
+            score_threshold=score_threshold,
+            filter_conditions=filter_conditions
+        )
+
+    async def _rerank_unique(
+        self,
+        query: str,
+        vector_results: List[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Deduplicate vector results and rerank them.
+        
+        Args:
+            query: Search query
+            vector_results: Vector search results sorted by score
+            top_k: Number of results to return after reranking
+            
+        Returns:
+            Reranked passages with scores
+        """
+        unique_results = _deduplicate_passages(vector_results)
+        if len(unique_results) < len(vector_results):
+            logger.info(
+                "Dropped %d duplicate passages before reranking",
+                len(vector_results) - len(unique_results)
+            )
+        
+        return await self._rerank(
+            query=query,
+            passages=unique_results,
+            top_k=top_k
+        )
+
+    async def _rerank_batch(
+        self,
+        pairs: List[Tuple[str, List[Dict[str, Any]]]],
+        top_k: int,
+        max_in_flight: int = 32
+    ) -> List[List[Dict[str, Any]]]:
+        """Rerank several (query, passages) pairs over the shared session.
+        
+        The ranking endpoint scores one query per request, so pairs are
+        dispatched concurrently (bounded by max_in_flight) instead of one
+        after another.
+        
+        Args:
+            pairs: List of (query, vector results) tuples
+            top_k: Number of results to return per query
+            max_in_flight: Maximum concurrent rerank requests
+            
+        Returns:
+            Reranked passages for each pair, in input order
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+        
+        async def _rerank_one(query: str, passages: List[Dict[str, Any]]):
+            async with semaphore:
+                return await self._rerank_unique(query, passages, top_k)
+        
+        return await asyncio.gather(
+            *(_rerank_one(query, passages) for query, passages in pairs)
+        )
 
     async def search(
         self,
         query: str,
         top_k: int = 5,
         rerank: bool = True,
-        score_threshold: Optional[float] = None
+        score_threshold: Optional[float] = None,
+        filter_conditions: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
         """Search for relevant passages.
         
@@ -106,19 +324,14 @@ class RetrievalPipeline:
             top_k: Number of results to return
             rerank: Whether to rerank results
             score_threshold: Minimum similarity score threshold
+            filter_conditions: Optional payload field:value filter
             
         Returns:
             List of relevant passages with scores
         """
         try:
-            # Generate query embedding
-            query_embedding = await self.embedding_generator.generate_embedding(query)
-            
-            # Vector search
-            vector_results = self.qdrant_manager.search(
-                query_vector=query_embedding,
-                top_k=top_k * 2 if rerank else top_k,  # Get more results if reranking
-                score_threshold=score_threshold
+            vector_results = await self._vector_search(
+                query, top_k, rerank, score_threshold, filter_conditions
             )
             
             if not vector_results:
@@ -126,21 +339,116 @@ class RetrievalPipeline:
                 
             # Rerank if enabled
             if rerank:
-                reranked_results = await self._rerank(
-                    query=query,
-                    passages=vector_results,
-                    top_k=top_k
-                )
-                return reranked_results
+                if self._rerank_is_redundant(vector_results, top_k):
+                    # Same dedup as the rerank path, whichever path the margin picks
+                    return _deduplicate_passages(vector_results)[:top_k]
+                return await self._rerank_unique(query, vector_results, top_k)
             
             return vector_results[:top_k]
             
         except Exception as e:
-            logger.error(f"Error during search: {e}")
+            logger.error("Error during search: %s", e)
             return []
     
+    async def batch_search(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        rerank: bool = True,
+        score_threshold: Optional[float] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for several queries at once.
+        
+        Query embeddings are generated concurrently, all vector searches go
+        to Qdrant as one batch request, and all reranking is issued as a
+        single batch rather than one call per query.
+        
+        Args:
+            queries: Search queries
+            top_k: Number of results to return per query
+            rerank: Whether to rerank results
+            score_threshold: Minimum similarity score threshold
+            
+        Returns:
+            List of result lists, one per query in input order
+        """
+        try:
+            query_embeddings = await asyncio.gather(*(
+                self._embed_query(query) for query in queries
+            ))
+            
+            # One batched Qdrant request for every query
+            vector_results = await asyncio.to_thread(
+                self.qdrant_manager.search_many,
+                query_embeddings,
+                top_k=top_k * 2 if rerank else top_k,
+                score_threshold=score_threshold
+            )
+        except Exception as e:
+            logger.error("Error during batch search: %s", e)
+            return [[] for _ in queries]
+        
+        results = [candidates[:top_k] for candidates in vector_results]
+        
+        if rerank:
+            to_rerank = []
+            for i, candidates in enumerate(vector_results):
+                if not candidates:
+                    continue
+                if self._rerank_is_redundant(candidates, top_k):
+                    results[i] = _deduplicate_passages(candidates)[:top_k]
+                else:
+                    to_rerank.append(i)
+            
+            reranked = await self._rerank_batch(
+                [(queries[i], vector_results[i]) for i in to_rerank],
+                top_k
+            )
+            for i, reranked_results in zip(to_rerank, reranked):
+                results[i] = reranked_results
+        
+        return results
+    
+    async def search_stream(
+        self,
+        query: str,
+        top_k: int = 5,
+        score_threshold: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Search progressively, yielding vector results before reranked results.
+        
+        Callers can show the vector-search results immediately and replace
+        them once reranking finishes, hiding the rerank latency.
+        
+        Args:
+            query: Search query
+            top_k: Number of results to return per stage
+            score_threshold: Minimum similarity score threshold
+            
+        Yields:
+            ("vector", results) and then, when reranking changes anything,
+            ("reranked", results)
+        """
+        try:
+            vector_results = await self._vector_search(
+                query, top_k, True, score_threshold
+            )
+        except Exception as e:
+            logger.error("Error during search: %s", e)
+            vector_results = []
+        
+        yield "vector", _deduplicate_passages(vector_results)[:top_k]
+        
+        if not vector_results or self._rerank_is_redundant(vector_results, top_k):
+            return
+        
+        yield "reranked", await self._rerank_unique(query, vector_results, top_k)
+    
     async def close(self):
-        """Close resources."""
-        if self.session:
-            await self.session.close()
-            self.session = None
\ No newline at end of file
+        """Release resources.
+        
+        The HTTP client is shared with other components on this event loop,
+        so it is only dropped here; ``http_client_factory.aclose()`` closes
+        it at shutdown.
+        """
+        self.session = None
\ No newline at end of file
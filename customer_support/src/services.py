@@ -0,0 +1,62 @@
+"""Process-wide shared service instances."""
+
+import threading
+from dataclasses import astuple
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from config.config import NVIDIAConfig, QdrantConfig
+from src.embedding import EmbeddingGenerator, Reranker
+from src.qdrant_manager import QdrantManager
+
+T = TypeVar("T")
+
+# (service kind, config values) -> instance
+_SERVICES: Dict[Tuple[str, Tuple[Any, ...]], Any] = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def _get_or_create(kind: str, config: Any, factory: Callable[[Any], T]) -> T:
+    """Return the shared instance for a config, creating it on first use.
+
+    Configs are keyed by value, so separately loaded but identical configs
+    share one instance.
+
+    Args:
+        kind: Service name, so different services never share a key
+        config: Dataclass configuration passed to the factory
+        factory: Constructor called with the config on a cache miss
+
+    Returns:
+        Shared service instance
+    """
+    key = (kind, astuple(config))
+
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(key)
+        if service is None:
+            service = _SERVICES[key] = factory(config)
+        return service
+
+
+def get_embedding_generator(config: NVIDIAConfig) -> EmbeddingGenerator:
+    """Return the process-wide EmbeddingGenerator for an NVIDIA config."""
+    return _get_or_create("embedding_generator", config, EmbeddingGenerator)
+
+
+def get_reranker(config: NVIDIAConfig) -> Reranker:
+    """Return the process-wide Reranker for an NVIDIA config."""
+    return _get_or_create("reranker", config, Reranker)
+
+
+def get_qdrant_manager(config: QdrantConfig) -> QdrantManager:
+    """Return the process-wide QdrantManager for a Qdrant config."""
+    return _get_or_create("qdrant_manager", config, QdrantManager)
+
+
+def reset_services() -> None:
+    """Forget all shared instances so the next getter call creates new ones.
+
+    Intended for tests; instances already handed out are left untouched.
+    """
+    with _SERVICES_LOCK:
+        _SERVICES.clear()
@@ -0,0 +1,58 @@
+"""Test cases for column-oriented chunk filtering."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("docling")
+
+from src.chunking import ChunkBatch, ChunkProcessor
+
+
+def make_batch(texts):
+    """Create a batch with one chunk per text."""
+    count = len(texts)
+    return ChunkBatch(
+        texts=list(texts),
+        chunk_ids=[f"doc-{i}" for i in range(count)],
+        indices=np.arange(count, dtype=np.int32),
+        char_counts=np.array([len(text) for text in texts], dtype=np.int32),
+        total_chunks=np.full(count, count, dtype=np.int32),
+        source_filenames=["doc.pdf"] * count,
+        source_filepaths=["/docs/doc.pdf"] * count,
+        original_metadatas=[{"page": i} for i in range(count)]
+    )
+
+
+def test_filter_batch_drops_bad_lengths_and_blank_chunks():
+    """Test that length limits and whitespace-only text are filtered per column."""
+    processor = ChunkProcessor(min_chunk_length=5, max_chunk_length=20)
+    batch = make_batch(["short", " \n\t      ", "x" * 30, "a valid chunk", "tiny"])
+    
+    filtered = processor.filter_batch(batch)
+    
+    assert filtered.texts == ["short", "a valid chunk"]
+    assert filtered.chunk_ids == ["doc-0", "doc-3"]
+    assert filtered.indices.tolist() == [0, 3]
+    assert filtered.char_counts.tolist() == [5, 13]
+    assert filtered.original_metadatas == [{"page": 0}, {"page": 3}]
+
+
+def test_filter_batch_handles_empty_and_fully_filtered_batches():
+    """Test that empty input and all-rejected input both give empty batches."""
+    processor = ChunkProcessor(min_chunk_length=5, max_chunk_length=20)
+    
+    empty = ChunkBatch.empty()
+    assert processor.filter_batch(empty) is empty
+    assert len(processor.filter_batch(make_batch(["a", "b"]))) == 0
+
+
+def test_prepare_batch_for_embedding_matches_per_chunk_path():
+    """Test that the batch path produces the same records as the chunk path."""
+    processor = ChunkProcessor(min_chunk_length=1, max_chunk_length=100)
+    batch = make_batch(["first chunk", "second chunk"])
+    
+    prepared = processor.prepare_batch_for_embedding(batch)
+    
+    assert prepared == processor.prepare_for_embedding(batch.to_chunks())
+    assert type(prepared[0]["chunk_index"]) is int
+    assert type(prepared[0]["char_count"]) is int
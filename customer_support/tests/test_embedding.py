@@ -0,0 +1,102 @@
+"""Test cases for embedding request helpers."""
+
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import numpy as np
+import pytest
+from openai import APIConnectionError
+
+from config.config import NVIDIAConfig
+from src.embedding import (
+    EmbeddingGenerator,
+    _acall_with_retry,
+    _pack_batches,
+    top_k_indices
+)
+
+
+@pytest.fixture
+def generator():
+    """Create an embedding generator without rate limiting."""
+    return EmbeddingGenerator(NVIDIAConfig(
+        api_key="nvapi-test",
+        embedding_url="https://integrate.api.nvidia.com/v1/embeddings",
+        rerank_url="https://integrate.api.nvidia.com/v1/ranking",
+        embedding_model="nvidia/llama-3.2-nv-embedqa-1b-v2",
+        rerank_model="nvidia/llama-3.2-nv-rerankqa-1b-v2",
+        embedding_rpm=0
+    ))
+
+
+def connection_error():
+    """Create a transient API error."""
+    return APIConnectionError(request=httpx.Request("POST", "https://integrate.api.nvidia.com"))
+
+
+def test_pack_batches_respects_item_and_token_limits():
+    """Test that batches close on either limit and oversized texts go alone."""
+    # 3, 3, 3, 11 and 1 estimated tokens
+    texts = ["a" * 8, "b" * 8, "c" * 8, "d" * 40, "e"]
+    
+    assert _pack_batches(texts, max_items=2, max_tokens=10) == [(0, 2), (2, 3), (3, 4), (4, 5)]
+    assert _pack_batches(texts, max_items=10, max_tokens=100) == [(0, 5)]
+    assert _pack_batches([], max_items=2, max_tokens=10) == []
+
+
+@pytest.mark.asyncio
+async def test_acall_with_retry_retries_transient_errors(monkeypatch):
+    """Test that transient errors are retried until the call succeeds."""
+    monkeypatch.setattr("src.embedding._retry_delay", lambda error, attempt, base: 0)
+    fn = AsyncMock(side_effect=[connection_error(), connection_error(), "ok"])
+    
+    assert await _acall_with_retry(fn, "text", max_attempts=3, model="m") == "ok"
+    assert fn.await_count == 3
+    fn.assert_awaited_with("text", model="m")
+
+
+@pytest.mark.asyncio
+async def test_acall_with_retry_raises_permanent_and_exhausted_errors(monkeypatch):
+    """Test that non-retryable errors and the last transient error propagate."""
+    monkeypatch.setattr("src.embedding._retry_delay", lambda error, attempt, base: 0)
+    
+    fn = AsyncMock(side_effect=ValueError("bad request"))
+    with pytest.raises(ValueError):
+        await _acall_with_retry(fn, max_attempts=3)
+    assert fn.await_count == 1
+    
+    fn = AsyncMock(side_effect=connection_error())
+    with pytest.raises(APIConnectionError):
+        await _acall_with_retry(fn, max_attempts=2)
+    assert fn.await_count == 2
+
+
+def test_top_k_indices_orders_best_first():
+    """Test top-k selection, including ties, k=None and out-of-range k."""
+    scores = np.array([0.1, 0.9, 0.5, 0.9, 0.3])
+    
+    # Equal scores keep their input order
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+    assert top_k_indices(scores).tolist() == [1, 3, 2, 4, 0]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0]
+    assert top_k_indices(scores, 0).tolist() == []
+
+
+@pytest.mark.asyncio
+async def test_agenerate_embeddings_batch_requests_duplicates_once(generator, monkeypatch):
+    """Test that repeated texts are embedded once and shared by every copy."""
+    async def create(input, **kwargs):
+        return Mock(data=[Mock(embedding=[float(ord(text[0])), 1.0]) for text in input])
+    
+    client = Mock()
+    client.embeddings.create = AsyncMock(side_effect=create)
+    monkeypatch.setattr(generator, "_get_async_client", lambda: client)
+    
+    embeddings = await generator.agenerate_embeddings_batch(
+        ["a", "b", "a", "c", "b"], batch_size=10
+    )
+    
+    client.embeddings.create.assert_awaited_once()
+    assert client.embeddings.create.await_args.kwargs["input"] == ["a", "b", "c"]
+    assert [embedding[0] for embedding in embeddings] == [97.0, 98.0, 97.0, 99.0, 98.0]
+    assert all(embedding.dtype == np.float32 for embedding in embeddings)
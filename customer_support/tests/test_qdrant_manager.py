@@ -0,0 +1,111 @@
+"""Test cases for Qdrant storage helpers."""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from config.config import QdrantConfig
+from src.qdrant_manager import QdrantManager, UpsertBuffer, _sanitize_metadata
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Create a manager whose clients never reach a live Qdrant."""
+    monkeypatch.setattr(QdrantManager, "_ensure_collection", lambda self: None)
+    manager = QdrantManager(QdrantConfig(
+        url="http://localhost:6333",
+        collection_name="test_collection",
+        embedding_dim=4,
+        prefer_grpc=False,
+        upsert_retries=0
+    ))
+    manager._async_client = AsyncMock()
+    return manager
+
+
+def make_chunks(count):
+    """Create embedded chunks ready for insertion."""
+    return [
+        {
+            "text": f"Passage {i}",
+            "chunk_id": f"doc-{i}",
+            "chunk_index": i,
+            "source_filename": "doc.pdf",
+            "source_filepath": "/docs/doc.pdf",
+            "char_count": 9,
+            "embedding": np.full(4, 0.5, dtype=np.float32)
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ainsert_chunks_waits_for_queued_upserts(manager):
+    """Test that the insert ends with a wait=True barrier upsert."""
+    inserted = await manager.ainsert_chunks(make_chunks(5), batch_size=2, max_in_flight=2)
+    
+    assert inserted == 5
+    calls = manager._async_client.upsert.call_args_list
+    # Two batches queued without waiting, then the final batch as a barrier
+    assert [call.kwargs["wait"] for call in calls] == [False, False, True]
+    assert len(calls[-1].kwargs["points"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_ainsert_chunks_reports_nothing_if_barrier_fails(manager):
+    """Test that unconfirmed upserts are not counted as inserted."""
+    async def upsert(collection_name, points, wait):
+        if wait:
+            raise ConnectionError("Qdrant went away")
+    
+    manager._async_client.upsert.side_effect = upsert
+    
+    assert await manager.ainsert_chunks(make_chunks(3), batch_size=2, max_in_flight=1) == 0
+
+
+@pytest.mark.parametrize("m, suspended", [(0, True), (16, False)])
+def test_index_suspended_reads_stored_collection_config(manager, monkeypatch, m, suspended):
+    """Test that bulk-load mode comes from Qdrant, not from who created the collection."""
+    client = Mock()
+    client.get_collection.return_value.config.hnsw_config.m = m
+    monkeypatch.setattr(manager, "client", client)
+    
+    assert manager.index_suspended() is suspended
+    client.get_collection.assert_called_once_with("test_collection")
+
+
+def test_sanitize_metadata_makes_payload_json_safe():
+    """Test that nested metadata is converted without touching safe values."""
+    flat = {"page": 1, "title": "Returns", "score": 0.5, "draft": False, "author": None}
+    assert _sanitize_metadata(flat) is flat
+    
+    nested = {
+        "page": 1,
+        "headings": ("Policy", 2),
+        "source": {"path": Path("docs/returns.pdf"), "pages": [1, None]}
+    }
+    assert _sanitize_metadata(nested) == {
+        "page": 1,
+        "headings": ["Policy", "2"],
+        "source": {"path": str(Path("docs/returns.pdf")), "pages": ["1", "None"]}
+    }
+
+
+@pytest.mark.asyncio
+async def test_upsert_buffer_flushes_full_batches_and_remainder(manager, monkeypatch):
+    """Test that the buffer upserts fixed-size batches and drains the rest."""
+    async def ainsert_chunks(batch, batch_size, max_in_flight):
+        return len(batch)
+    
+    insert = AsyncMock(side_effect=ainsert_chunks)
+    monkeypatch.setattr(manager, "ainsert_chunks", insert)
+    buffer = UpsertBuffer(manager, size=2, max_in_flight=1)
+    
+    await buffer.add(make_chunks(3))
+    await buffer.add(make_chunks(2))
+    
+    assert await buffer.drain() == 5
+    assert [len(call.args[0]) for call in insert.await_args_list] == [2, 2, 1]
+    assert await buffer.drain() == 5
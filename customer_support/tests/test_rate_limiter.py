@@ -0,0 +1,83 @@
+"""Test cases for request rate limiting."""
+
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from config.config import NVIDIAConfig
+from src.embedding import EmbeddingGenerator
+from src.rate_limiter import AsyncRateLimiter, get_rate_limiter
+
+
+@pytest.mark.asyncio
+async def test_acquire_spaces_requests_once_burst_is_spent():
+    """Test that requests beyond the burst wait for tokens to refill."""
+    limiter = AsyncRateLimiter(rate=2, per=0.2)
+    
+    start = time.monotonic()
+    await limiter.acquire()
+    async with limiter:
+        pass
+    assert time.monotonic() - start < 0.05
+    
+    # Each further request waits for one more token (0.1s apart)
+    await limiter.acquire()
+    await limiter.acquire()
+    assert time.monotonic() - start >= 0.19
+
+
+def test_rate_limiter_rejects_invalid_rates():
+    """Test that a limiter needs a positive rate and period."""
+    with pytest.raises(ValueError):
+        AsyncRateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        AsyncRateLimiter(rate=10, per=0)
+
+
+def test_get_rate_limiter_is_shared_per_endpoint():
+    """Test that limiters are shared per endpoint and disabled at 0 RPM."""
+    assert get_rate_limiter("test-embeddings", 0) is None
+    
+    limiter = get_rate_limiter("test-embeddings", 600)
+    assert get_rate_limiter("test-embeddings", 600) is limiter
+    assert get_rate_limiter("test-rerank", 600) is not limiter
+
+
+def test_acquire_sync_blocks_once_burst_is_spent():
+    """Test that the blocking acquire waits once the burst is used up."""
+    limiter = AsyncRateLimiter(rate=2, per=0.2)
+    
+    start = time.monotonic()
+    limiter.acquire_sync()
+    limiter.acquire_sync()
+    assert time.monotonic() - start < 0.05
+    
+    # Third request must wait for one token to refill (0.1s)
+    limiter.acquire_sync()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_generate_embedding_sync_draws_from_limiter(monkeypatch):
+    """Test that the blocking embedding path is throttled too."""
+    generator = EmbeddingGenerator(NVIDIAConfig(
+        api_key="nvapi-test",
+        embedding_url="https://integrate.api.nvidia.com/v1/embeddings",
+        rerank_url="https://integrate.api.nvidia.com/v1/ranking",
+        embedding_model="nvidia/llama-3.2-nv-embedqa-1b-v2",
+        rerank_model="nvidia/llama-3.2-nv-rerankqa-1b-v2"
+    ))
+    
+    limiter = Mock()
+    monkeypatch.setattr("src.embedding.get_rate_limiter", lambda name, rpm: limiter)
+    
+    response = Mock()
+    response.data = [Mock(embedding=[0.1, 0.2])]
+    monkeypatch.setattr(generator.client.embeddings, "create", Mock(return_value=response))
+    
+    embedding = generator.generate_embedding_sync("hello", input_type="query")
+    
+    limiter.acquire_sync.assert_called_once()
+    assert embedding.dtype == np.float32
+    assert embedding.tolist() == pytest.approx([0.1, 0.2])
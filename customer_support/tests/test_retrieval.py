@@ -5,9 +5,22 @@ import pytest
 import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 import numpy as np
+import orjson
+from qdrant_client.models import ScoredPoint
 
 from config.config import Config
+from src.qdrant_manager import QdrantManager
 from src.retrieval import RetrievalPipeline
+from src.services import reset_services
+
+
+@pytest.fixture(autouse=True)
+def fresh_services(monkeypatch):
+    """Give each test its own shared service instances, without a live Qdrant."""
+    monkeypatch.setattr(QdrantManager, "_ensure_collection", lambda self: None)
+    reset_services()
+    yield
+    reset_services()
 
 # Load test configuration
 @pytest.fixture
@@ -19,6 +32,7 @@ def config():
     os.environ["QDRANT_URL"] = "http://localhost:6333"
     os.environ["COLLECTION_NAME"] = "test_collection"
     os.environ["EMBEDDING_DIM"] = "2048"
+    os.environ["QDRANT_PREFER_GRPC"] = "false"
     return Config.from_env()
 
 @pytest.fixture
@@ -49,29 +63,33 @@ def mock_search_results():
     ]
 
 @pytest.mark.asyncio
-async def test_search_with_reranking(config, mock_embedding, mock_search_results):
+async def test_search_with_reranking(config, mock_embedding, mock_search_results, monkeypatch):
     """Test search functionality with reranking."""
     
     # Create retrieval pipeline with mocked dependencies
     pipeline = RetrievalPipeline(config)
     
     # Mock embedding generation
-    pipeline.embedding_generator.generate_embedding = AsyncMock(
-        return_value=mock_embedding
+    monkeypatch.setattr(
+        pipeline.embedding_generator,
+        "generate_embedding",
+        AsyncMock(return_value=mock_embedding)
     )
     
     # Mock Qdrant search
-    pipeline.qdrant_manager.search = Mock(return_value=mock_search_results)
+    monkeypatch.setattr(
+        pipeline.qdrant_manager, "search", Mock(return_value=mock_search_results)
+    )
     
-    # Mock aiohttp session
+    # Mock pooled HTTP client
     session = AsyncMock()
     session.post = AsyncMock()
     session.close = AsyncMock()
     
     # Mock response
-    mock_response = AsyncMock()
-    mock_response.status = 200
-    mock_response.json = AsyncMock(return_value={"scores": [0.95, 0.85]})
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = orjson.dumps({"scores": [0.95, 0.85]})
     session.post.return_value = mock_response
     
     # Set session
@@ -99,4 +117,182 @@ async def test_search_with_reranking(config, mock_embedding, mock_search_results
     pipeline.session.post.assert_called_once()
     
     # Clean up
-    await pipeline.close()
\ No newline at end of file
+    await pipeline.close()
+
+@pytest.mark.asyncio
+async def test_search_deduplicates_before_reranking(config, mock_embedding, mock_search_results, monkeypatch):
+    """Test that duplicate passages are not sent to the reranker."""
+    
+    pipeline = RetrievalPipeline(config)
+    
+    monkeypatch.setattr(
+        pipeline.embedding_generator,
+        "generate_embedding",
+        AsyncMock(return_value=mock_embedding)
+    )
+    
+    # Same text as the first result, differing only in surrounding whitespace
+    duplicate = dict(mock_search_results[0], id=3, chunk_id="doc2-1")
+    duplicate["text"] = f"  {duplicate['text']}\n"
+    monkeypatch.setattr(
+        pipeline.qdrant_manager,
+        "search",
+        Mock(return_value=mock_search_results + [duplicate])
+    )
+    
+    session = AsyncMock()
+    session.post = AsyncMock()
+    session.close = AsyncMock()
+    
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = orjson.dumps({"scores": [0.95, 0.85]})
+    session.post.return_value = mock_response
+    
+    pipeline.session = session
+    
+    results = await pipeline.search(
+        query="test query",
+        top_k=2,
+        rerank=True
+    )
+    
+    # Only the two unique passages should be reranked
+    payload = orjson.loads(pipeline.session.post.call_args[1]["content"])
+    assert len(payload["passages"]) == 2
+    assert [r["id"] for r in results] == [1, 2]
+    
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_search_stream_yields_vector_then_reranked(config, mock_embedding, mock_search_results, monkeypatch):
+    """Test that streaming search yields vector results before reranked results."""
+    
+    pipeline = RetrievalPipeline(config)
+    
+    monkeypatch.setattr(
+        pipeline.embedding_generator,
+        "generate_embedding",
+        AsyncMock(return_value=mock_embedding)
+    )
+    monkeypatch.setattr(
+        pipeline.qdrant_manager, "search", Mock(return_value=mock_search_results)
+    )
+    
+    session = AsyncMock()
+    session.post = AsyncMock()
+    session.close = AsyncMock()
+    
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = orjson.dumps({"scores": [0.1, 0.9]})
+    session.post.return_value = mock_response
+    
+    pipeline.session = session
+    
+    stages = [
+        (stage, results)
+        async for stage, results in pipeline.search_stream("test query", top_k=2)
+    ]
+    
+    assert [stage for stage, _ in stages] == ["vector", "reranked"]
+    assert [r["id"] for r in stages[0][1]] == [1, 2]
+    assert [r["id"] for r in stages[1][1]] == [2, 1]
+    
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_batch_search_skips_failed_query_embeddings(config, mock_embedding, mock_search_results, monkeypatch):
+    """Test that one query failing to embed does not empty the whole batch."""
+    
+    pipeline = RetrievalPipeline(config)
+    
+    async def generate_embedding(text, input_type="passage"):
+        return None if text == "bad query" else mock_embedding
+    
+    monkeypatch.setattr(pipeline.embedding_generator, "generate_embedding", generate_embedding)
+    
+    points = [
+        ScoredPoint(id=r["id"], version=0, score=r["score"], payload=r)
+        for r in mock_search_results
+    ]
+    search_batch = Mock(return_value=[points])
+    monkeypatch.setattr(pipeline.qdrant_manager.client, "search_batch", search_batch)
+    
+    results = await pipeline.batch_search(["bad query", "good query"], top_k=2, rerank=False)
+    
+    # Only the good query is sent to Qdrant; the failed one gets no results
+    assert len(search_batch.call_args[1]["requests"]) == 1
+    assert results[0] == []
+    assert [r["id"] for r in results[1]] == [1, 2]
+    
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_search_skips_rerank_on_decisive_margin(config, mock_embedding, mock_search_results, monkeypatch):
+    """Test that a decisive vector margin skips reranking but still deduplicates."""
+    
+    monkeypatch.setattr(config.retrieval, "rerank_skip_margin", 0.1)
+    pipeline = RetrievalPipeline(config)
+    
+    monkeypatch.setattr(
+        pipeline.embedding_generator,
+        "generate_embedding",
+        AsyncMock(return_value=mock_embedding)
+    )
+    
+    # Top hit leads the 2nd by 0.4; the 2nd duplicates the 1st's text
+    duplicate = dict(mock_search_results[0], id=3, chunk_id="doc2-1", score=0.5)
+    third = dict(mock_search_results[1], score=0.4)
+    monkeypatch.setattr(
+        pipeline.qdrant_manager,
+        "search",
+        Mock(return_value=[mock_search_results[0], duplicate, third])
+    )
+    
+    session = AsyncMock()
+    pipeline.session = session
+    
+    results = await pipeline.search(query="test query", top_k=2, rerank=True)
+    
+    session.post.assert_not_called()
+    assert [r["id"] for r in results] == [1, 2]
+    
+    await pipeline.close()
+
+
+@pytest.mark.asyncio
+async def test_search_reranks_on_narrow_margin(config, mock_embedding, mock_search_results, monkeypatch):
+    """Test that a narrow vector margin still sends results to the reranker."""
+    
+    monkeypatch.setattr(config.retrieval, "rerank_skip_margin", 0.5)
+    pipeline = RetrievalPipeline(config)
+    
+    monkeypatch.setattr(
+        pipeline.embedding_generator,
+        "generate_embedding",
+        AsyncMock(return_value=mock_embedding)
+    )
+    third = dict(mock_search_results[1], id=3, chunk_id="doc1-3", text="Third passage.", score=0.7)
+    monkeypatch.setattr(
+        pipeline.qdrant_manager,
+        "search",
+        Mock(return_value=mock_search_results + [third])
+    )
+    
+    session = AsyncMock()
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.content = orjson.dumps({"scores": [0.1, 0.2, 0.9]})
+    session.post.return_value = mock_response
+    pipeline.session = session
+    
+    results = await pipeline.search(query="test query", top_k=2, rerank=True)
+    
+    session.post.assert_called_once()
+    assert [r["id"] for r in results] == [3, 2]
+    
+    await pipeline.close()
@@ -31,6 +31,7 @@ class QdrantConfig:
     url: str
     collection_name: str
     embedding_dim: int
+    on_disk: bool = False
     
 @dataclass
 class ProcessingConfig:
@@ -41,6 +42,10 @@ class ProcessingConfig:
     image_max_size: int
     image_quality: int
     request_timeout: int
+    embedding_batch_size: int = 16
+    embedding_batch_wait_ms: int = 50
+    max_download_mb: int = 20
+    embedding_max_retries: int = 3
 
 @dataclass
 class Config:
@@ -61,16 +66,21 @@ class Config:
         qdrant = QdrantConfig(
             url=os.getenv("QDRANT_URL", "http://localhost:6333"),
             collection_name=os.getenv("COLLECTION_NAME", "image_embeddings"),
-            embedding_dim=int(os.getenv("EMBEDDING_DIM", "4096"))
+            embedding_dim=int(os.getenv("EMBEDDING_DIM", "4096")),
+            on_disk=os.getenv("QDRANT_ON_DISK", "false").lower() == "true"
         )
         
         processing = ProcessingConfig(
-            batch_size=int(os.getenv("BATCH_SIZE", "25")),
+            batch_size=int(os.getenv("BATCH_SIZE", "256")),
             concurrent_downloads=int(os.getenv("CONCURRENT_DOWNLOADS", "10")),
             concurrent_embeddings=int(os.getenv("CONCURRENT_EMBEDDINGS", "5")),
             image_max_size=int(os.getenv("IMAGE_MAX_SIZE", "128")),
             image_quality=int(os.getenv("IMAGE_QUALITY", "70")),
-            request_timeout=int(os.getenv("REQUEST_TIMEOUT", "60"))
+            request_timeout=int(os.getenv("REQUEST_TIMEOUT", "60")),
+            embedding_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "16")),
+            embedding_batch_wait_ms=int(os.getenv("EMBEDDING_BATCH_WAIT_MS", "50")),
+            max_download_mb=int(os.getenv("MAX_DOWNLOAD_MB", "20")),
+            embedding_max_retries=int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
         )
         
         return cls(nvidia=nvidia, qdrant=qdrant, processing=processing)
@@ -83,6 +93,14 @@ class Config:
             raise ValueError("NVIDIA_EMBEDDING_URL is required")
         if self.processing.batch_size < 1:
             raise ValueError("BATCH_SIZE must be >= 1")
+        if self.processing.embedding_batch_size < 1:
+            raise ValueError("EMBEDDING_BATCH_SIZE must be >= 1")
+        if self.processing.embedding_batch_wait_ms < 0:
+            raise ValueError("EMBEDDING_BATCH_WAIT_MS must be >= 0")
+        if self.processing.max_download_mb < 1:
+            raise ValueError("MAX_DOWNLOAD_MB must be >= 1")
+        if self.processing.embedding_max_retries < 0:
+            raise ValueError("EMBEDDING_MAX_RETRIES must be >= 0")
         if self.qdrant.embedding_dim < 1:
             raise ValueError("EMBEDDING_DIM must be >= 1")
 
@@ -46,7 +46,10 @@ async def main():
         
         # Create and run pipeline
         pipeline = ImageEmbeddingPipeline(config)
-        success, failure = await pipeline.process_csv(csv_file, start_from, max_images)
+        try:
+            success, failure = await pipeline.process_csv(csv_file, start_from, max_images)
+        finally:
+            await pipeline.aclose()
         
         logger.info(f"Pipeline completed: {success} success, {failure} failures")
         
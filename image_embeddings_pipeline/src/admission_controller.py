@@ -0,0 +1,76 @@
+"""Resizable concurrency limiting module."""
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class AdmissionController:
+    """
+    Concurrency limit that can be resized while callers are waiting.
+    
+    Works like a semaphore around an explicit (active, cap) counter, so the
+    cap can shrink when the upstream pushes back (HTTP 429) and grow again
+    as requests succeed (additive increase, multiplicative decrease).
+    """
+    
+    def __init__(self, cap: int, min_cap: int = 1, max_cap: Optional[int] = None):
+        """
+        Initialize admission controller.
+        
+        Args:
+            cap: Initial number of concurrent holders
+            min_cap: Lowest cap backoff() will shrink to
+            max_cap: Highest cap recover() will grow to (default: initial cap)
+        """
+        self._active = 0
+        self._cap = cap
+        self.min_cap = min_cap
+        self.max_cap = max_cap or cap
+        self._successes = 0
+        self._cv = asyncio.Condition()
+    
+    @property
+    def cap(self) -> int:
+        """Current concurrency cap."""
+        return self._cap
+    
+    async def acquire(self):
+        """Wait until a slot is free under the current cap, then take it."""
+        async with self._cv:
+            await self._cv.wait_for(lambda: self._active < self._cap)
+            self._active += 1
+    
+    async def release(self):
+        """Return a slot and wake one waiter."""
+        async with self._cv:
+            self._active -= 1
+            self._cv.notify(1)
+    
+    async def set_cap(self, cap: int):
+        """Resize the cap; holders above a reduced cap finish normally."""
+        async with self._cv:
+            self._cap = max(self.min_cap, min(cap, self.max_cap))
+            self._cv.notify_all()
+    
+    async def backoff(self):
+        """Halve the cap after the upstream signalled overload."""
+        self._successes = 0
+        if self._cap > self.min_cap:
+            await self.set_cap(self._cap // 2)
+            logger.warning(f"Upstream throttling, concurrency reduced to {self._cap}")
+    
+    async def recover(self):
+        """Grow the cap by one after a full cap's worth of successes."""
+        self._successes += 1
+        if self._successes >= self._cap and self._cap < self.max_cap:
+            self._successes = 0
+            await self.set_cap(self._cap + 1)
+            logger.debug(f"Concurrency increased to {self._cap}")
+    
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.release()
@@ -1,11 +1,40 @@
 """Embedding generation module."""
+import asyncio
 import logging
-from typing import Optional, List
+import random
+from typing import Optional, List, Set, Tuple, Union
 import aiohttp
+import orjson
 from config.config import NvidiaConfig, ProcessingConfig
+from src.admission_controller import AdmissionController
 
 logger = logging.getLogger(__name__)
 
+# Data URIs are str, or ASCII bytes straight from ImageProcessor
+DataURI = Union[str, bytes]
+
+# Responses worth retrying: throttling and transient server/gateway errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number attempt + 1.
+    
+    Honors a numeric Retry-After header; otherwise exponential backoff with
+    jitter, so throttled callers don't all retry at once. Capped at
+    RETRY_MAX_DELAY either way.
+    """
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+    
+    backoff = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+    return backoff + random.uniform(0, RETRY_BASE_DELAY)
+
 class EmbeddingGenerator:
     """Generates embeddings using NVIDIA API."""
     
@@ -13,11 +42,18 @@ class EmbeddingGenerator:
         """Initialize embedding generator."""
         self.nvidia_config = nvidia_config
         self.processing_config = processing_config
+        # Built once; only "input" changes between requests
+        self._headers = nvidia_config.headers
+        self._timeout = aiohttp.ClientTimeout(total=processing_config.request_timeout)
+        self._payload_template = {
+            "model": nvidia_config.model,
+            "encoding_format": nvidia_config.encoding_format
+        }
     
     async def generate(
         self, 
         session: aiohttp.ClientSession, 
-        image_data_uri: str
+        image_data_uri: DataURI
     ) -> Optional[List[float]]:
         """
         Generate embedding for image.
@@ -29,32 +65,217 @@ class EmbeddingGenerator:
         Returns:
             Embedding vector or None on failure
         """
+        embeddings, _ = await self.generate_batch(session, [image_data_uri])
+        return embeddings[0]
+    
+    async def generate_batch(
+        self,
+        session: aiohttp.ClientSession,
+        image_data_uris: List[DataURI]
+    ) -> Tuple[List[Optional[List[float]]], bool]:
+        """
+        Generate embeddings for several images in one API request.
+        
+        Throttling (429), 5xx gateway errors, timeouts and dropped connections
+        are retried up to embedding_max_retries times before giving up.
+        
+        Args:
+            session: aiohttp session
+            image_data_uris: Base64 encoded image data URIs
+            
+        Returns:
+            Tuple of (embedding vectors in input order, None on failure;
+            whether this call was throttled with HTTP 429)
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(image_data_uris)
+        throttled = False
+        if not image_data_uris:
+            return embeddings, throttled
+        
         payload = {
-            "input": [image_data_uri],
-            "model": self.nvidia_config.model,
-            "encoding_format": self.nvidia_config.encoding_format
+            **self._payload_template,
+            "input": [
+                uri if isinstance(uri, str) else uri.decode("ascii")
+                for uri in image_data_uris
+            ]
         }
         
+        # orjson encodes the large base64 strings far faster than stdlib json;
+        # headers already declare application/json
+        body = orjson.dumps(payload)
+        max_retries = self.processing_config.embedding_max_retries
+        
+        for attempt in range(max_retries + 1):
+            retry_after = None
+            try:
+                async with session.post(
+                    self.nvidia_config.embedding_url,
+                    data=body,
+                    headers=self._headers,
+                    timeout=self._timeout
+                ) as response:
+                    if response.status in RETRY_STATUSES and attempt < max_retries:
+                        throttled = throttled or response.status == 429
+                        retry_after = response.headers.get("Retry-After")
+                        logger.warning(
+                            f"Embedding request returned {response.status}, "
+                            f"retrying ({attempt + 1}/{max_retries})"
+                        )
+                    else:
+                        response.raise_for_status()
+                        data = orjson.loads(await response.read())
+                        
+                        # Results carry their input position; don't rely on order
+                        for position, item in enumerate(data.get("data", [])):
+                            embeddings[item.get("index", position)] = item["embedding"]
+                        
+                        if any(embedding is None for embedding in embeddings):
+                            logger.warning("Missing embeddings in API response")
+                        return embeddings, throttled
+            
+            except aiohttp.ClientResponseError as e:
+                throttled = throttled or e.status == 429
+                logger.warning(f"HTTP error generating embeddings: {e}")
+                return embeddings, throttled
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= max_retries:
+                    logger.warning(f"Connection error generating embeddings: {e!r}")
+                    return embeddings, throttled
+                logger.warning(
+                    f"Connection error generating embeddings: {e!r}, "
+                    f"retrying ({attempt + 1}/{max_retries})"
+                )
+            except aiohttp.ClientError as e:
+                logger.warning(f"HTTP error generating embeddings: {e}")
+                return embeddings, throttled
+            except Exception as e:
+                logger.warning(f"Error generating embeddings: {e}")
+                return embeddings, throttled
+            
+            await asyncio.sleep(_retry_delay(attempt, retry_after))
+        
+        return embeddings, throttled
+
+class EmbeddingBatcher:
+    """
+    Coalesces single-image embedding requests into batched API calls.
+    
+    Callers await :meth:`embed` one image at a time; a background task
+    groups queued images into requests of up to ``batch_size`` images,
+    waiting at most ``max_wait`` seconds to fill a batch. The number of
+    batches in flight shrinks when the API returns 429s and recovers up to
+    ``max_in_flight`` as batches succeed. Use as an async context manager
+    around the session's lifetime.
+    """
+    
+    def __init__(
+        self,
+        embedding_generator: EmbeddingGenerator,
+        session: aiohttp.ClientSession,
+        batch_size: int,
+        max_wait: float,
+        max_in_flight: int
+    ):
+        """Initialize batcher."""
+        self.embedding_generator = embedding_generator
+        self.session = session
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._in_flight = AdmissionController(max_in_flight)
+        self._batches: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+    
+    async def __aenter__(self) -> "EmbeddingBatcher":
+        self._task = asyncio.create_task(self._run())
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        
+        # Never leave a caller waiting on a batch that will not be sent
+        while not self._queue.empty():
+            self._abandon([self._queue.get_nowait()])
+    
+    async def embed(self, image_data_uri: DataURI) -> Optional[List[float]]:
+        """
+        Queue an image and wait for its embedding.
+        
+        Args:
+            image_data_uri: Base64 encoded image data URI
+            
+        Returns:
+            Embedding vector or None on failure
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image_data_uri, future))
+        return await future
+    
+    async def _collect(self) -> List[Tuple[DataURI, asyncio.Future]]:
+        """Wait for one request, then gather more until full or max_wait passes."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        
+        try:
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            self._abandon(batch)
+            raise
+        
+        return batch
+    
+    async def _run(self):
+        """Dispatch batches, keeping at most max_in_flight requests outstanding."""
+        while True:
+            batch = await self._collect()
+            try:
+                await self._in_flight.acquire()
+            except asyncio.CancelledError:
+                self._abandon(batch)
+                raise
+            task = asyncio.create_task(self._send(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _send(self, batch: List[Tuple[DataURI, asyncio.Future]]):
+        """Send one batch and resolve each caller's future."""
         try:
-            timeout = aiohttp.ClientTimeout(total=self.processing_config.request_timeout)
-            async with session.post(
-                self.nvidia_config.embedding_url,
-                json=payload,
-                headers=self.nvidia_config.headers,
-                timeout=timeout
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-                
-                if "data" in data and len(data["data"]) > 0:
-                    return data["data"][0]["embedding"]
-                
-                logger.warning("No embedding in API response")
-                return None
-                
-        except aiohttp.ClientError as e:
-            logger.warning(f"HTTP error generating embedding: {e}")
-            return None
-        except Exception as e:
-            logger.warning(f"Error generating embedding: {e}")
-            return None
\ No newline at end of file
+            embeddings, throttled = await self.embedding_generator.generate_batch(
+                self.session, [image_data_uri for image_data_uri, _ in batch]
+            )
+        finally:
+            await self._in_flight.release()
+        
+        # Back off once per throttled batch, however many retries it took
+        if throttled:
+            await self._in_flight.backoff()
+        else:
+            await self._in_flight.recover()
+        
+        logger.debug(f"Embedded batch of {len(batch)} images")
+        
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+    
+    @staticmethod
+    def _abandon(batch: List[Tuple[DataURI, asyncio.Future]]):
+        """Resolve a batch that will not be sent as failed."""
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
\ No newline at end of file
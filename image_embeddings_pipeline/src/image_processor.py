@@ -1,7 +1,10 @@
 """Image processing module."""
+import asyncio
 import base64
 import io
 import logging
+import threading
+from concurrent.futures import Executor
 from typing import Optional
 import aiohttp
 from PIL import Image
@@ -9,18 +12,95 @@ from config.config import ProcessingConfig
 
 logger = logging.getLogger(__name__)
 
+_DATA_URI_PREFIX = b"data:image/jpeg;base64,"
+
+# Read size for streamed downloads
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# Per-thread JPEG output buffer, reused across images instead of reallocated
+_ENCODE_BUF = threading.local()
+
+def _encode_buffer() -> io.BytesIO:
+    """Return this thread's encode buffer, rewound to the start."""
+    buffer = getattr(_ENCODE_BUF, "buffer", None)
+    if buffer is None:
+        buffer = _ENCODE_BUF.buffer = io.BytesIO()
+    
+    # Rewind without truncate(0), which would release the allocation
+    buffer.seek(0)
+    return buffer
+
+def _process_image_bytes(content: bytes, max_size: int, quality: int) -> bytes:
+    """
+    Decode, resize and re-encode an image as a base64 JPEG data URI.
+    
+    Top-level so it can run in a worker process.
+    
+    Args:
+        content: Raw image bytes
+        max_size: Maximum width and height
+        quality: JPEG quality
+        
+    Returns:
+        Base64 encoded data URI as ASCII bytes
+    """
+    # Open image (reads the header only)
+    image = Image.open(io.BytesIO(content))
+    
+    # Reject decompression bombs before any pixels are decoded
+    limit = Image.MAX_IMAGE_PIXELS
+    if limit and image.width * image.height > limit:
+        raise ValueError(f"{image.width}x{image.height} exceeds pixel limit")
+    
+    # For JPEGs, let libjpeg decode at 1/2, 1/4 or 1/8 scale, still
+    # at least max_size; no-op for other formats
+    box = (max_size, max_size)
+    image.draft('RGB', box)
+    
+    # Convert to RGB if needed
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    # Resize to reduce token usage (exact final size)
+    image.thumbnail(box, Image.Resampling.LANCZOS)
+    
+    # Encode to base64
+    buffer = _encode_buffer()
+    image.save(
+        buffer, 
+        format="JPEG",
+        quality=quality,
+        optimize=True
+    )
+    
+    # Bytes past this image's end are left over from earlier, larger images
+    size = buffer.tell()
+    with buffer.getbuffer() as view, view[:size] as encoded:
+        img_b64 = base64.b64encode(encoded)
+    
+    # Kept as bytes; decoded to str once, when the request JSON is built
+    return _DATA_URI_PREFIX + img_b64
+
 class ImageProcessor:
     """Handles image downloading and encoding."""
     
-    def __init__(self, config: ProcessingConfig):
-        """Initialize image processor."""
+    def __init__(self, config: ProcessingConfig, executor: Optional[Executor] = None):
+        """
+        Initialize image processor.
+        
+        Args:
+            config: Processing configuration
+            executor: Executor for decode/resize/encode (default: the event
+                loop's thread pool); pass a ProcessPoolExecutor to use all cores
+        """
         self.config = config
+        self.executor = executor
     
     async def download_and_encode(
         self, 
         session: aiohttp.ClientSession, 
         url: str
-    ) -> Optional[str]:
+    ) -> Optional[bytes]:
         """
         Download image from URL and return base64 encoded data URI.
         
@@ -29,37 +109,34 @@ class ImageProcessor:
             url: Image URL
             
         Returns:
-            Base64 encoded data URI or None on failure
+            Base64 encoded data URI (ASCII bytes) or None on failure
         """
         try:
             timeout = aiohttp.ClientTimeout(total=self.config.request_timeout)
             async with session.get(url, timeout=timeout) as response:
                 response.raise_for_status()
-                content = await response.read()
                 
-                # Open and process image
-                image = Image.open(io.BytesIO(content))
-                
-                # Convert to RGB if needed
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # Resize to reduce token usage
-                max_size = (self.config.image_max_size, self.config.image_max_size)
-                image.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Encode to base64
-                buffer = io.BytesIO()
-                image.save(
-                    buffer, 
-                    format="JPEG", 
-                    quality=self.config.image_quality, 
-                    optimize=True
-                )
-                img_b64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-                
-                return f"data:image/jpeg;base64,{img_b64}"
+                # Refuse oversized bodies up front when the size is announced,
+                # and while streaming when it is not
+                limit = self.config.max_download_mb * 1024 * 1024
+                if (response.content_length or 0) > limit:
+                    raise ValueError(f"{response.content_length} bytes exceeds download limit")
                 
+                content = bytearray()
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                    content += chunk
+                    if len(content) > limit:
+                        raise ValueError(f"Body exceeds download limit of {limit} bytes")
+            
+            # CPU-bound image work runs off the event loop
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                _process_image_bytes,
+                content,
+                self.config.image_max_size,
+                self.config.image_quality
+            )
+        
         except aiohttp.ClientError as e:
             logger.warning(f"HTTP error downloading {url}: {e}")
             return None
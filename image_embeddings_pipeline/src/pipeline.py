@@ -1,9 +1,12 @@
 """Main processing pipeline."""
 import asyncio
 import logging
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 import pandas as pd
 import aiohttp
 from qdrant_client.models import PointStruct
@@ -11,10 +14,25 @@ from qdrant_client.models import PointStruct
 from config.config import Config
 from src.qdrant_manager import QdrantManager
 from src.image_processor import ImageProcessor
-from src.embedding_generator import EmbeddingGenerator
+from src.embedding_generator import EmbeddingBatcher, EmbeddingGenerator
+from src.admission_controller import AdmissionController
 
 logger = logging.getLogger(__name__)
 
+# Rows parsed from the CSV at a time
+CSV_CHUNK_ROWS = 10_000
+
+# Point batches waiting for upload before workers pause
+UPLOAD_QUEUE_BATCHES = 4
+
+# Seconds between progress bar redraws
+PROGRESS_INTERVAL = 0.5
+
+PROGRESS_TEMPLATE = (
+    "\r[{bar}] {completed}/{total} ({percent:.1f}%) | "
+    "✓ {success} ✗ {failure} | ETA: {eta}"
+)
+
 class ImageEmbeddingPipeline:
     """Main pipeline for processing images and generating embeddings."""
     
@@ -22,12 +40,16 @@ class ImageEmbeddingPipeline:
         """Initialize pipeline."""
         self.config = config
         self.qdrant_manager = QdrantManager(config.qdrant)
-        self.image_processor = ImageProcessor(config.processing)
+        # Decode/resize/encode is CPU-bound; workers start on first use
+        self._image_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        self.image_processor = ImageProcessor(config.processing, self._image_pool)
         self.embedding_generator = EmbeddingGenerator(config.nvidia, config.processing)
         
         # Statistics
         self.success_count = 0
         self.failure_count = 0
+        # Rows without a URL, dropped before they reach the workers
+        self.skipped_count = 0
         self.start_time = 0
     
     async def process_single_image(
@@ -36,22 +58,22 @@ class ImageEmbeddingPipeline:
         idx: int,
         filename: str,
         url: str,
-        download_sem: asyncio.Semaphore,
-        embedding_sem: asyncio.Semaphore
+        download_gate: AdmissionController,
+        embedding_batcher: EmbeddingBatcher,
+        processed_at: str
     ) -> Optional[PointStruct]:
         """Process single image: download, encode, generate embedding."""
         try:
             # Download image
-            async with download_sem:
+            async with download_gate:
                 image_data_uri = await self.image_processor.download_and_encode(session, url)
                 if image_data_uri is None:
                     return None
             
-            # Generate embedding
-            async with embedding_sem:
-                embedding = await self.embedding_generator.generate(session, image_data_uri)
-                if embedding is None:
-                    return None
+            # Generate embedding (batched with other images' requests)
+            embedding = await embedding_batcher.embed(image_data_uri)
+            if embedding is None:
+                return None
             
             # Create point
             point = PointStruct(
@@ -61,7 +83,7 @@ class ImageEmbeddingPipeline:
                     "filename": filename,
                     "image_url": url,
                     "processed": True,
-                    "processed_at": datetime.now().isoformat()
+                    "processed_at": processed_at
                 }
             )
             return point
@@ -70,6 +92,50 @@ class ImageEmbeddingPipeline:
             logger.error(f"Error processing image {idx}: {e}")
             return None
     
+    async def _uploader(self, upload_queue: asyncio.Queue):
+        """
+        Upsert point batches from the queue until a None sentinel arrives.
+        
+        Batches are sent without waiting for Qdrant to apply them, except
+        the last, which waits and so acts as a barrier for the whole run.
+        Points in a failed batch are moved from success_count to
+        failure_count; if the barrier fails, every queued point is, since
+        none of them is confirmed.
+        """
+        # Points acknowledged with wait=False but not yet confirmed
+        queued = 0
+        batch = await upload_queue.get()
+        while batch is not None:
+            next_batch = await upload_queue.get()
+            is_last = next_batch is None
+            if await self.qdrant_manager.upsert_points(batch, wait=is_last):
+                queued += len(batch)
+            elif is_last:
+                logger.error(
+                    f"Final upload failed; {queued + len(batch)} points are unconfirmed"
+                )
+                self._count_upload_failure(queued + len(batch))
+            else:
+                self._count_upload_failure(len(batch))
+            batch = next_batch
+    
+    def _count_upload_failure(self, points: int):
+        """Move points that were embedded but not stored to failure_count."""
+        self.success_count -= points
+        self.failure_count += points
+    
+    async def _progress_ticker(self, total: int):
+        """Redraw the progress bar on a fixed interval until cancelled."""
+        while True:
+            completed = self.success_count + self.failure_count + self.skipped_count
+            self._print_progress(completed, max(total, completed, 1))
+            await asyncio.sleep(PROGRESS_INTERVAL)
+    
+    async def aclose(self):
+        """Shut down the image processing worker pool and Qdrant client."""
+        self._image_pool.shutdown(cancel_futures=True)
+        await self.qdrant_manager.close()
+    
     def _format_time(self, seconds: float) -> str:
         """Format seconds to human-readable time."""
         return str(timedelta(seconds=int(seconds)))
@@ -89,9 +155,88 @@ class ImageEmbeddingPipeline:
         else:
             eta = "calculating..."
         
-        print(f"\r[{bar}] {completed}/{total} ({progress*100:.1f}%) | "
-              f"✓ {self.success_count} ✗ {self.failure_count} | ETA: {eta}", 
-              end='', flush=True)
+        # One write per redraw
+        sys.stdout.write(PROGRESS_TEMPLATE.format_map({
+            "bar": bar,
+            "completed": completed,
+            "total": total,
+            "percent": progress * 100,
+            "success": self.success_count,
+            "failure": self.failure_count,
+            "eta": eta
+        }))
+        sys.stdout.flush()
+    
+    def _write_lines(self, lines: List[str]):
+        """Write lines to stdout in a single call."""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    def _count_rows(
+        self, 
+        csv_file: str, 
+        start_from: int = 0, 
+        max_images: Optional[int] = None
+    ) -> int:
+        """Count the data rows that will be processed, without parsing the CSV."""
+        lines = 0
+        last_byte = b"\n"
+        with open(csv_file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                lines += block.count(b"\n")
+                last_byte = block[-1:]
+        
+        # A final line without a newline still counts; the header does not
+        rows = max(lines + (last_byte != b"\n") - 1, 0)
+        rows = max(rows - start_from, 0)
+        return min(rows, max_images) if max_images else rows
+    
+    def _iter_row_chunks(
+        self, 
+        csv_file: str, 
+        start_from: int = 0, 
+        max_images: Optional[int] = None
+    ) -> Iterator[List[Tuple[int, object, object]]]:
+        """
+        Yield lists of (row index, filename, url), one per chunk of the CSV.
+        
+        Rows with a missing or blank URL are filtered out per chunk and
+        counted in skipped_count.
+        """
+        reader = pd.read_csv(
+            csv_file,
+            chunksize=CSV_CHUNK_ROWS,
+            usecols=lambda column: column in ("filename", "link", "url"),
+            skiprows=range(1, start_from + 1),
+            nrows=max_images,
+            # Cells stay str (missing ones NaN) without numeric inference
+            dtype=str
+        )
+        
+        for chunk in reader:
+            # Rename columns
+            if 'link' in chunk.columns:
+                chunk = chunk.rename(columns={'link': 'url'})
+            
+            if 'url' not in chunk.columns:
+                self.skipped_count += len(chunk)
+                continue
+            
+            # Vectorized: drop missing/blank URLs in one pass over the column
+            stripped = chunk['url'].str.strip()
+            has_url = stripped.notna() & (stripped != '')
+            self.skipped_count += len(chunk) - int(has_url.sum())
+            chunk = chunk[has_url]
+            
+            # Plain object arrays; no per-row Series boxing
+            filenames = (
+                chunk['filename'].to_numpy() if 'filename' in chunk.columns else [''] * len(chunk)
+            )
+            urls = chunk['url'].to_numpy()
+            
+            # Skipped rows are not in the index; offset to keep original row numbers
+            indices = (chunk.index.to_numpy() + start_from).tolist()
+            yield list(zip(indices, filenames, urls))
     
     async def process_csv(
         self, 
@@ -102,6 +247,9 @@ class ImageEmbeddingPipeline:
         """
         Process CSV file and store embeddings.
         
+        Rows are read in chunks and handed to a fixed pool of workers through
+        a bounded queue, so memory stays flat regardless of CSV length.
+        
         Args:
             csv_file: Path to CSV file
             start_from: Row index to start from
@@ -110,87 +258,127 @@ class ImageEmbeddingPipeline:
         Returns:
             Tuple of (success_count, failure_count)
         """
-        # Load CSV
-        df = pd.read_csv(csv_file)
-        logger.info(f"✓ Loaded {len(df)} rows from {csv_file}")
-        
-        # Rename columns
-        if 'link' in df.columns:
-            df = df.rename(columns={'link': 'url'})
+        total = self._count_rows(csv_file, start_from, max_images)
+        logger.info(f"✓ Found {total} rows to process in {csv_file}")
         
-        # Apply filters
         if start_from > 0:
-            df = df.iloc[start_from:]
             logger.info(f"✓ Starting from row {start_from}")
         
         if max_images:
-            df = df.head(max_images)
             logger.info(f"✓ Processing max {max_images} images")
         
         # Setup Qdrant
-        self.qdrant_manager.create_collection_if_not_exists()
+        await self.qdrant_manager.create_collection_if_not_exists()
         
-        total = len(df)
         self.success_count = 0
         self.failure_count = 0
+        self.skipped_count = 0
         self.start_time = time.time()
         
+        # Enough workers to keep every download slot and embedding batch busy
+        processing = self.config.processing
+        num_workers = (
+            processing.concurrent_downloads
+            + processing.concurrent_embeddings * processing.embedding_batch_size
+        )
+        
         # Print header
-        print(f"\n{'='*80}")
-        print(f"Starting processing at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Concurrent downloads: {self.config.processing.concurrent_downloads}")
-        print(f"Concurrent embeddings: {self.config.processing.concurrent_embeddings}")
-        print(f"Batch size: {self.config.processing.batch_size}")
-        print(f"{'='*80}\n")
-        
-        # Create semaphores
-        download_sem = asyncio.Semaphore(self.config.processing.concurrent_downloads)
-        embedding_sem = asyncio.Semaphore(self.config.processing.concurrent_embeddings)
-        
-        # Create session
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            points_buffer = []
-            tasks = []
+        self._write_lines([
+            f"\n{'='*80}",
+            f"Starting processing at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Concurrent downloads: {self.config.processing.concurrent_downloads}",
+            f"Concurrent embeddings: {self.config.processing.concurrent_embeddings}",
+            f"Embedding batch size: {self.config.processing.embedding_batch_size}",
+            f"Batch size: {self.config.processing.batch_size}",
+            f"{'='*80}\n"
+        ])
+        
+        # Create download admission gate
+        download_gate = AdmissionController(self.config.processing.concurrent_downloads)
+        
+        # Bounded, so the reader never runs far ahead of the workers
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * num_workers)
+        points_buffer = []
+        # One timestamp per upload batch rather than per image
+        processed_at = datetime.now().isoformat()
+        
+        # Full batches are uploaded by their own task while workers keep going
+        upload_queue: asyncio.Queue = asyncio.Queue(maxsize=UPLOAD_QUEUE_BATCHES)
+        uploader = asyncio.create_task(self._uploader(upload_queue))
+        
+        # Create session; embedding requests are coalesced into batches, with
+        # at most concurrent_embeddings batches in flight
+        # Keep-alive connections and cached DNS, so embedding POSTs to the one
+        # API host reuse warm TLS connections instead of reconnecting
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=64,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        async with aiohttp.ClientSession(connector=connector) as session, EmbeddingBatcher(
+            self.embedding_generator,
+            session,
+            batch_size=self.config.processing.embedding_batch_size,
+            max_wait=self.config.processing.embedding_batch_wait_ms / 1000,
+            max_in_flight=self.config.processing.concurrent_embeddings
+        ) as embedding_batcher:
             
-            # Create tasks
-            for idx, row in df.iterrows():
-                filename = row.get('filename', '')
-                url = row.get('url', '')
-                
-                if pd.isna(url) or not isinstance(url, str) or url.strip() == '':
-                    self.failure_count += 1
-                    continue
-                
-                task = self.process_single_image(
-                    session, idx, filename, url, download_sem, embedding_sem
-                )
-                tasks.append(task)
+            async def produce():
+                row_chunks = self._iter_row_chunks(csv_file, start_from, max_images)
+                # Parsing a chunk blocks for a while; keep it off the event loop
+                while (rows := await asyncio.to_thread(next, row_chunks, None)) is not None:
+                    for row in rows:
+                        await queue.put(row)
+                for _ in range(num_workers):
+                    await queue.put(None)
             
-            # Process tasks
-            completed = 0
-            for coro in asyncio.as_completed(tasks):
-                result = await coro
-                completed += 1
-                
-                if result is None:
-                    self.failure_count += 1
-                else:
-                    points_buffer.append(result)
-                    self.success_count += 1
-                
-                # Upload batch
-                if len(points_buffer) >= self.config.processing.batch_size:
-                    self.qdrant_manager.upsert_points(points_buffer)
-                    points_buffer = []
+            async def work():
+                nonlocal points_buffer, processed_at
                 
-                # Progress update
-                if completed % 10 == 0 or completed == total:
-                    self._print_progress(completed, total)
+                while (row := await queue.get()) is not None:
+                    idx, filename, url = row
+                    result = await self.process_single_image(
+                        session, idx, filename, url, download_gate, embedding_batcher,
+                        processed_at
+                    )
+                    
+                    if result is None:
+                        self.failure_count += 1
+                    else:
+                        points_buffer.append(result)
+                        self.success_count += 1
+                    
+                    # Upload batch
+                    if len(points_buffer) >= self.config.processing.batch_size:
+                        batch, points_buffer = points_buffer, []
+                        processed_at = datetime.now().isoformat()
+                        await upload_queue.put(batch)
             
-            # Upload remaining
-            if points_buffer:
-                self.qdrant_manager.upsert_points(points_buffer)
+            # Progress is redrawn by its own task, not once per completion
+            ticker = asyncio.create_task(self._progress_ticker(total))
+            
+            try:
+                # A failing producer or worker cancels the rest instead of
+                # leaving them blocked on the queue
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(produce())
+                    for _ in range(num_workers):
+                        tg.create_task(work())
+                
+                # Upload remaining
+                if points_buffer:
+                    await upload_queue.put(points_buffer)
+                await upload_queue.put(None)
+                await uploader
+            finally:
+                uploader.cancel()
+                ticker.cancel()
+        
+        # Final redraw so the bar ends at the true count
+        completed = self.success_count + self.failure_count + self.skipped_count
+        self._print_progress(completed, max(total, completed, 1))
         
         # Print statistics
         self._print_statistics(total)
@@ -201,22 +389,27 @@ class ImageEmbeddingPipeline:
         """Print final statistics."""
         elapsed = time.time() - self.start_time
         
-        print(f"\n\n{'='*80}")
-        print(f"Processing Complete!")
-        print(f"{'='*80}")
-        print(f"✓ Successfully processed: {self.success_count:,} images")
-        print(f"✗ Failed: {self.failure_count:,} images")
+        lines = [
+            f"\n\n{'='*80}",
+            "Processing Complete!",
+            f"{'='*80}",
+            f"✓ Successfully processed: {self.success_count:,} images",
+            f"✗ Failed: {self.failure_count:,} images"
+        ]
+        if self.skipped_count:
+            lines.append(f"⏭️  Skipped (no URL): {self.skipped_count:,} rows")
         
         if self.success_count + self.failure_count > 0:
             success_rate = (self.success_count / (self.success_count + self.failure_count)) * 100
-            print(f"📊 Success rate: {success_rate:.1f}%")
+            lines.append(f"📊 Success rate: {success_rate:.1f}%")
         
-        print(f"⏱️  Total time: {self._format_time(elapsed)}")
+        lines.append(f"⏱️  Total time: {self._format_time(elapsed)}")
         
         if total > 0:
-            print(f"⚡ Average time per image: {elapsed/total:.2f}s")
-            print(f"🚀 Processing speed: {total/elapsed:.2f} images/second")
+            lines.append(f"⚡ Average time per image: {elapsed/total:.2f}s")
+            lines.append(f"🚀 Processing speed: {total/elapsed:.2f} images/second")
         
-        print(f"💾 Collection: '{self.config.qdrant.collection_name}'")
-        print(f"📐 Embedding dimension: {self.config.qdrant.embedding_dim}")
-        print(f"{'='*80}\n")
\ No newline at end of file
+        lines.append(f"💾 Collection: '{self.config.qdrant.collection_name}'")
+        lines.append(f"📐 Embedding dimension: {self.config.qdrant.embedding_dim}")
+        lines.append(f"{'='*80}\n")
+        self._write_lines(lines)
\ No newline at end of file
@@ -1,8 +1,15 @@
 """Qdrant database manager."""
 import logging
 from typing import List
-from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, VectorParams, Distance
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    PointStruct,
+    VectorParams,
+    Distance,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType
+)
 from config.config import QdrantConfig
 
 logger = logging.getLogger(__name__)
@@ -13,18 +20,33 @@ class QdrantManager:
     def __init__(self, config: QdrantConfig):
         """Initialize Qdrant manager."""
         self.config = config
-        self.client = QdrantClient(url=config.url)
+        # Async client, so upserts never block downloads and embedding calls
+        self.client = AsyncQdrantClient(url=config.url)
         logger.info(f"Connected to Qdrant at {config.url}")
     
-    def create_collection_if_not_exists(self) -> None:
+    async def close(self) -> None:
+        """Close the client's connections."""
+        await self.client.close()
+    
+    async def create_collection_if_not_exists(self) -> None:
         """Create collection if it doesn't exist."""
         try:
-            if not self.client.collection_exists(self.config.collection_name):
-                self.client.create_collection(
+            if not await self.client.collection_exists(self.config.collection_name):
+                await self.client.create_collection(
                     collection_name=self.config.collection_name,
                     vectors_config=VectorParams(
                         size=self.config.embedding_dim,
-                        distance=Distance.COSINE
+                        distance=Distance.COSINE,
+                        on_disk=self.config.on_disk
+                    ),
+                    # int8 codes (4x smaller) stay in RAM for search; the
+                    # float32 originals are only read to rescore candidates
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(
+                            type=ScalarType.INT8,
+                            quantile=0.99,
+                            always_ram=True
+                        )
                     )
                 )
                 logger.info(f"✓ Created collection '{self.config.collection_name}'")
@@ -34,12 +56,18 @@ class QdrantManager:
             logger.error(f"✗ Error creating collection: {e}")
             raise
     
-    def upsert_points(self, points: List[PointStruct]) -> bool:
-        """Upload points to Qdrant."""
+    async def upsert_points(self, points: List[PointStruct], wait: bool = False) -> bool:
+        """
+        Upload points to Qdrant.
+        
+        With wait=False the call returns once Qdrant has queued the write;
+        an upsert with wait=True also waits for every write queued before it.
+        """
         try:
-            self.client.upsert(
+            await self.client.upsert(
                 collection_name=self.config.collection_name,
-                points=points
+                points=points,
+                wait=wait
             )
             logger.debug(f"Uploaded {len(points)} points to Qdrant")
             return True
@@ -47,10 +75,10 @@ class QdrantManager:
             logger.error(f"Error upserting points: {e}")
             return False
     
-    def get_collection_info(self) -> dict:
+    async def get_collection_info(self) -> dict:
         """Get collection information."""
         try:
-            info = self.client.get_collection(self.config.collection_name)
+            info = await self.client.get_collection(self.config.collection_name)
             return {
                 "name": self.config.collection_name,
                 "vectors_count": info.vectors_count,
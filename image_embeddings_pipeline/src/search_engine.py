@@ -4,12 +4,20 @@ Advanced search engine for querying image embeddings.
 This module demonstrates how semantic search transforms from keyword matching
 to understanding *meaning* - a paradigm shift in information retrieval.
 """
+import asyncio
 import logging
 from typing import List, Dict, Optional, Union
 from dataclasses import dataclass
 import aiohttp
 from qdrant_client import QdrantClient
-from qdrant_client.models import SearchRequest, Filter, FieldCondition, MatchValue
+from qdrant_client.models import (
+    SearchRequest,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    SearchParams,
+    QuantizationSearchParams
+)
 
 from config.config import Config, NvidiaConfig
 from src.image_processor import ImageProcessor
@@ -17,6 +25,12 @@ from src.embedding_generator import EmbeddingGenerator
 
 logger = logging.getLogger(__name__)
 
+# Search over the int8 codes, then rescore oversampled candidates with the
+# original float32 vectors
+SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
 @dataclass
 class SearchResult:
     """Represents a single search result."""
@@ -44,9 +58,54 @@ class ImageSearchEngine:
         self.client = QdrantClient(url=config.qdrant.url)
         self.embedding_generator = EmbeddingGenerator(config.nvidia, config.processing)
         self.image_processor = ImageProcessor(config.processing)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Text query request parts, built once
+        self._headers = config.nvidia.headers
+        self._timeout = aiohttp.ClientTimeout(total=30)
+        self._query_payload_template = {
+            "model": config.nvidia.model,
+            "encoding_format": config.nvidia.encoding_format,
+            "input_type": "query"  # Important for search queries
+        }
         
         logger.info(f"Search engine initialized for collection: {config.qdrant.collection_name}")
     
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use.
+        
+        Reusing one session keeps connections (and TLS sessions) to the
+        embedding API alive across queries. Sessions cannot move between
+        event loops, so callers that use ``asyncio.run`` per query get a new
+        session for each loop.
+        """
+        loop = asyncio.get_running_loop()
+        
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=30, ttl_dns_cache=300)
+            )
+            self._session_loop = loop
+        return self._session
+    
+    async def aclose(self):
+        """Close the shared session."""
+        if (
+            self._session is not None
+            and not self._session.closed
+            and self._session_loop is asyncio.get_running_loop()
+        ):
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    async def __aenter__(self) -> "ImageSearchEngine":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
     async def search_by_text(
         self, 
         query: str, 
@@ -69,18 +128,19 @@ class ImageSearchEngine:
         """
         try:
             # Generate embedding for text query
-            async with aiohttp.ClientSession() as session:
-                # For NVIDIA nv-embed-v1, text queries work directly
-                query_embedding = await self._generate_text_embedding(session, query)
-                
-                if query_embedding is None:
-                    logger.error("Failed to generate query embedding")
-                    return []
+            session = await self._ensure_session()
+            # For NVIDIA nv-embed-v1, text queries work directly
+            query_embedding = await self._generate_text_embedding(session, query)
+            
+            if query_embedding is None:
+                logger.error("Failed to generate query embedding")
+                return []
             
             # Search in Qdrant
             results = self.client.search(
                 collection_name=self.config.qdrant.collection_name,
                 query_vector=query_embedding,
+                search_params=SEARCH_PARAMS,
                 limit=limit,
                 score_threshold=score_threshold
             )
@@ -111,39 +171,77 @@ class ImageSearchEngine:
         Returns:
             List of similar images
         """
+        query_embedding = await self.embed_image(image_path_or_url)
+        if query_embedding is None:
+            return []
+        
+        return await self.search_by_vector(query_embedding, limit, score_threshold)
+    
+    async def embed_image(self, image_path_or_url: str) -> Optional[List[float]]:
+        """
+        Generate the query embedding for an image.
+        
+        Args:
+            image_path_or_url: Local path or URL to query image
+            
+        Returns:
+            Embedding vector or None on failure
+        """
         try:
-            async with aiohttp.ClientSession() as session:
-                # Process image
-                if image_path_or_url.startswith('http'):
-                    image_data_uri = await self.image_processor.download_and_encode(
-                        session, image_path_or_url
-                    )
-                else:
-                    # Load local image
-                    import base64
-                    from pathlib import Path
-                    
-                    with open(image_path_or_url, 'rb') as f:
-                        img_b64 = base64.b64encode(f.read()).decode('utf-8')
-                        image_data_uri = f"data:image/jpeg;base64,{img_b64}"
-                
-                if image_data_uri is None:
-                    logger.error("Failed to process query image")
-                    return []
-                
-                # Generate embedding
-                query_embedding = await self.embedding_generator.generate(
-                    session, image_data_uri
+            session = await self._ensure_session()
+            
+            # Process image
+            if image_path_or_url.startswith('http'):
+                image_data_uri = await self.image_processor.download_and_encode(
+                    session, image_path_or_url
                 )
+            else:
+                # Load local image
+                import base64
                 
-                if query_embedding is None:
-                    logger.error("Failed to generate image embedding")
-                    return []
+                with open(image_path_or_url, 'rb') as f:
+                    img_b64 = base64.b64encode(f.read()).decode('utf-8')
+                    image_data_uri = f"data:image/jpeg;base64,{img_b64}"
             
-            # Search in Qdrant
+            if image_data_uri is None:
+                logger.error("Failed to process query image")
+                return None
+            
+            # Generate embedding
+            query_embedding = await self.embedding_generator.generate(
+                session, image_data_uri
+            )
+            
+            if query_embedding is None:
+                logger.error("Failed to generate image embedding")
+            return query_embedding
+            
+        except Exception as e:
+            logger.error(f"Image embedding error: {e}")
+            return None
+    
+    async def search_by_vector(
+        self,
+        query_embedding: List[float],
+        limit: int = 10,
+        score_threshold: float = 0.0
+    ) -> List[SearchResult]:
+        """
+        Search with a precomputed query embedding.
+        
+        Args:
+            query_embedding: Vector from embed_image or a previous query
+            limit: Maximum number of results
+            score_threshold: Minimum similarity score
+            
+        Returns:
+            List of similar images
+        """
+        try:
             results = self.client.search(
                 collection_name=self.config.qdrant.collection_name,
                 query_vector=query_embedding,
+                search_params=SEARCH_PARAMS,
                 limit=limit,
                 score_threshold=score_threshold
             )
@@ -154,6 +252,76 @@ class ImageSearchEngine:
             logger.error(f"Image search error: {e}")
             return []
     
+    async def search_by_images(
+        self,
+        image_paths_or_urls: List[str],
+        limit: int = 10,
+        score_threshold: float = 0.0
+    ) -> List[List[SearchResult]]:
+        """
+        Search similar images for several query images at once.
+        
+        Query images are embedded concurrently and searched in a single
+        Qdrant batch request.
+        
+        Args:
+            image_paths_or_urls: Local paths or URLs to query images
+            limit: Maximum number of results per query
+            score_threshold: Minimum similarity score
+            
+        Returns:
+            One result list per query image, in input order
+        """
+        embeddings = await asyncio.gather(
+            *(self.embed_image(image) for image in image_paths_or_urls)
+        )
+        return await self.search_by_vectors(embeddings, limit, score_threshold)
+    
+    async def search_by_vectors(
+        self,
+        query_embeddings: List[Optional[List[float]]],
+        limit: int = 10,
+        score_threshold: float = 0.0
+    ) -> List[List[SearchResult]]:
+        """
+        Search with several precomputed query embeddings in one request.
+        
+        Args:
+            query_embeddings: Query vectors; None entries get no results
+            limit: Maximum number of results per query
+            score_threshold: Minimum similarity score
+            
+        Returns:
+            One result list per query embedding, in input order
+        """
+        all_results: List[List[SearchResult]] = [[] for _ in query_embeddings]
+        positions = [i for i, embedding in enumerate(query_embeddings) if embedding is not None]
+        if not positions:
+            return all_results
+        
+        try:
+            batch_results = self.client.search_batch(
+                collection_name=self.config.qdrant.collection_name,
+                requests=[
+                    SearchRequest(
+                        vector=query_embeddings[i],
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        params=SEARCH_PARAMS,
+                        with_payload=True
+                    )
+                    for i in positions
+                ]
+            )
+            
+            for i, results in zip(positions, batch_results):
+                all_results[i] = self._parse_results(results)
+            
+        except Exception as e:
+            logger.error(f"Batch image search error: {e}")
+        
+        return all_results
+    
     async def search_with_filters(
         self,
         query: str,
@@ -179,11 +347,11 @@ class ImageSearchEngine:
             Filtered search results
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                query_embedding = await self._generate_text_embedding(session, query)
-                
-                if query_embedding is None:
-                    return []
+            session = await self._ensure_session()
+            query_embedding = await self._generate_text_embedding(session, query)
+            
+            if query_embedding is None:
+                return []
             
             # Build filters
             filter_conditions = []
@@ -202,6 +370,7 @@ class ImageSearchEngine:
             results = self.client.search(
                 collection_name=self.config.qdrant.collection_name,
                 query_vector=query_embedding,
+                search_params=SEARCH_PARAMS,
                 query_filter=search_filter,
                 limit=limit
             )
@@ -218,19 +387,14 @@ class ImageSearchEngine:
         text: str
     ) -> Optional[List[float]]:
         """Generate embedding for text query."""
-        payload = {
-            "input": [text],
-            "model": self.config.nvidia.model,
-            "encoding_format": self.config.nvidia.encoding_format,
-            "input_type": "query"  # Important for search queries
-        }
+        payload = {**self._query_payload_template, "input": [text]}
         
         try:
             async with session.post(
                 self.config.nvidia.embedding_url,
                 json=payload,
-                headers=self.config.nvidia.headers,
-                timeout=aiohttp.ClientTimeout(total=30)
+                headers=self._headers,
+                timeout=self._timeout
             ) as response:
                 response.raise_for_status()
                 data = await response.json()
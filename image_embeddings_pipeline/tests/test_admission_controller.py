@@ -0,0 +1,61 @@
+"""Unit tests for the resizable concurrency limit."""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.admission_controller import AdmissionController
+
+
+@pytest.mark.asyncio
+async def test_backoff_halves_cap_down_to_min():
+    """Test multiplicative decrease stops at min_cap."""
+    controller = AdmissionController(8, min_cap=2)
+    
+    await controller.backoff()
+    assert controller.cap == 4
+    await controller.backoff()
+    await controller.backoff()
+    assert controller.cap == 2
+
+
+@pytest.mark.asyncio
+async def test_recover_grows_cap_after_a_cap_of_successes():
+    """Test additive increase needs cap successes and stops at max_cap."""
+    controller = AdmissionController(4)
+    await controller.backoff()
+    
+    await controller.recover()
+    assert controller.cap == 2
+    await controller.recover()
+    assert controller.cap == 3
+    
+    for _ in range(10):
+        await controller.recover()
+    assert controller.cap == 4
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_a_slot_under_the_cap():
+    """Test that holders above the cap block until a slot is released or the cap grows."""
+    controller = AdmissionController(1, max_cap=2)
+    await controller.acquire()
+    
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    
+    await controller.set_cap(2)
+    await asyncio.wait_for(waiter, timeout=1)
+    
+    third = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0.01)
+    assert not third.done()
+    
+    await controller.release()
+    await asyncio.wait_for(third, timeout=1)
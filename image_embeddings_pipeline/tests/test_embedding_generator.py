@@ -0,0 +1,154 @@
+"""
+Unit tests for batched embedding requests.
+
+The NVIDIA API is replaced by a scripted aiohttp session, so these run
+without network access or an API key.
+"""
+import asyncio
+import sys
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import AsyncMock, Mock
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import aiohttp
+import orjson
+import pytest
+
+from config.config import NvidiaConfig, ProcessingConfig
+from src.embedding_generator import EmbeddingBatcher, EmbeddingGenerator
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+    
+    def __init__(self, status: int, data: Optional[List[dict]] = None):
+        self.status = status
+        self.headers = {}
+        self._body = orjson.dumps({"data": data or []})
+    
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(Mock(), (), status=self.status)
+    
+    async def read(self) -> bytes:
+        return self._body
+    
+    async def __aenter__(self) -> "FakeResponse":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class FakeSession:
+    """Session whose POSTs return the scripted responses in order."""
+    
+    def __init__(self, *responses: FakeResponse):
+        self.responses = list(responses)
+        self.posts = 0
+    
+    def post(self, url, **kwargs) -> FakeResponse:
+        self.posts += 1
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def generator(monkeypatch) -> EmbeddingGenerator:
+    """Embedding generator that retries twice without sleeping."""
+    monkeypatch.setattr("src.embedding_generator._retry_delay", lambda *args: 0)
+    return EmbeddingGenerator(
+        NvidiaConfig(api_key="nvapi-test", embedding_url="https://example.invalid/embeddings"),
+        ProcessingConfig(
+            batch_size=8,
+            concurrent_downloads=1,
+            concurrent_embeddings=1,
+            image_max_size=128,
+            image_quality=70,
+            request_timeout=5,
+            embedding_max_retries=2
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_orders_results_by_index(generator):
+    """Test that embeddings are placed by their index, not response order."""
+    session = FakeSession(FakeResponse(200, [
+        {"index": 2, "embedding": [2.0]},
+        {"index": 0, "embedding": [0.0]},
+        {"index": 1, "embedding": [1.0]}
+    ]))
+    
+    embeddings, throttled = await generator.generate_batch(session, ["a", b"b", "c"])
+    
+    assert embeddings == [[0.0], [1.0], [2.0]]
+    assert not throttled
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_retries_and_reports_throttling(generator):
+    """Test that a 429 is retried and reported for this call only."""
+    session = FakeSession(
+        FakeResponse(429),
+        FakeResponse(200, [{"index": 0, "embedding": [0.5]}])
+    )
+    
+    embeddings, throttled = await generator.generate_batch(session, ["a"])
+    
+    assert embeddings == [[0.5]]
+    assert throttled
+    assert session.posts == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_gives_up_after_max_retries(generator):
+    """Test that persistent server errors yield None for every input."""
+    session = FakeSession(*(FakeResponse(503) for _ in range(3)))
+    
+    embeddings, throttled = await generator.generate_batch(session, ["a", "b"])
+    
+    assert embeddings == [None, None]
+    assert not throttled
+    assert session.posts == 3
+
+
+@pytest.mark.asyncio
+async def test_batcher_backs_off_once_per_throttled_batch():
+    """Test that only the batch that saw a 429 shrinks the concurrency cap."""
+    async def generate_batch(session, uris):
+        return [[1.0] for _ in uris], uris == ["throttled"]
+    
+    stub = Mock(generate_batch=AsyncMock(side_effect=generate_batch))
+    
+    async with EmbeddingBatcher(stub, Mock(), batch_size=1, max_wait=0, max_in_flight=4) as batcher:
+        batcher._in_flight.backoff = AsyncMock()
+        batcher._in_flight.recover = AsyncMock()
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("throttled"), batcher.embed("b")
+        )
+    
+    assert results == [[1.0], [1.0], [1.0]]
+    assert batcher._in_flight.backoff.await_count == 1
+    assert batcher._in_flight.recover.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_batcher_exit_resolves_pending_requests_to_none():
+    """Test that requests still queued at shutdown are failed, not left waiting."""
+    async def generate_batch(session, uris):
+        await asyncio.sleep(0.05)
+        return [[1.0] for _ in uris], False
+    
+    stub = Mock(generate_batch=AsyncMock(side_effect=generate_batch))
+    
+    async with EmbeddingBatcher(stub, Mock(), batch_size=1, max_wait=0, max_in_flight=1) as batcher:
+        tasks = [asyncio.create_task(batcher.embed(uri)) for uri in ("a", "b", "c")]
+        # Let the first batch go out while the others wait for a slot
+        await asyncio.sleep(0.01)
+    
+    assert await asyncio.gather(*tasks) == [[1.0], None, None]
+    assert stub.generate_batch.await_count == 1
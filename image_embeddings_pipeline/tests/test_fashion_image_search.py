@@ -6,6 +6,8 @@ not just match in text. This is the true power of multimodal embeddings:
 understanding visual aesthetics, patterns, colors, and styles.
 """
 import asyncio
+import hashlib
+import pickle
 import sys
 from pathlib import Path
 from typing import List, Dict
@@ -15,6 +17,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import pytest
+import pytest_asyncio
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -25,6 +28,15 @@ from src.search_engine import ImageSearchEngine, SearchResult
 
 console = Console()
 
+# Image searches allowed in flight at once in the batch tests
+MAX_CONCURRENT_SEARCHES = 4
+
+# Results per sample image computed once per session; tests slice to their limit
+PRECOMPUTED_LIMIT = 10
+
+# Query embeddings kept between runs, keyed by model and image URL
+EMBEDDING_CACHE_PATH = project_root / ".cache" / "query_embeddings.pkl"
+
 # Real product images from your dataset
 SAMPLE_IMAGES = {
     "titan_silver_watch": {
@@ -86,16 +98,107 @@ SAMPLE_IMAGES = {
 }
 
 
+def _cache_key(config: Config, url: str) -> str:
+    """Cache key for an image URL embedded with a given model and preprocessing."""
+    processing = config.processing
+    return hashlib.sha256(
+        f"{config.nvidia.model}\n{processing.image_max_size}\n"
+        f"{processing.image_quality}\n{url}".encode()
+    ).hexdigest()
+
+
+def load_embedding_cache() -> Dict[str, List[float]]:
+    """Load cached query embeddings, or start empty."""
+    if not EMBEDDING_CACHE_PATH.exists():
+        return {}
+    with open(EMBEDDING_CACHE_PATH, "rb") as f:
+        return pickle.load(f)
+
+
+def save_embedding_cache(cache: Dict[str, List[float]]):
+    """Persist query embeddings, replacing the file atomically."""
+    EMBEDDING_CACHE_PATH.parent.mkdir(exist_ok=True)
+    tmp_path = EMBEDDING_CACHE_PATH.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(EMBEDDING_CACHE_PATH)
+
+
+async def cached_search(
+    engine: ImageSearchEngine,
+    cache: Dict[str, List[float]],
+    url: str,
+    limit: int = 10
+) -> List[SearchResult]:
+    """
+    Image search that downloads and embeds each URL only once.
+    
+    Later searches for the same URL go straight to Qdrant with the
+    cached embedding.
+    """
+    key = _cache_key(engine.config, url)
+    embedding = cache.get(key)
+    if embedding is None:
+        embedding = await engine.embed_image(url)
+        if embedding is None:
+            return []
+        cache[key] = embedding
+    return await engine.search_by_vector(embedding, limit=limit)
+
+
+async def cached_search_many(
+    engine: ImageSearchEngine,
+    cache: Dict[str, List[float]],
+    urls: List[str],
+    limit: int = 10
+) -> List[List[SearchResult]]:
+    """
+    Search several image URLs in one Qdrant batch request.
+    
+    Uncached URLs are embedded concurrently first.
+    """
+    keys = [_cache_key(engine.config, url) for url in urls]
+    missing = [(key, url) for key, url in zip(keys, urls) if key not in cache]
+    embeddings = await asyncio.gather(*(engine.embed_image(url) for _, url in missing))
+    for (key, _), embedding in zip(missing, embeddings):
+        if embedding is not None:
+            cache[key] = embedding
+    return await engine.search_by_vectors([cache.get(key) for key in keys], limit=limit)
+
+
+@pytest.fixture(scope="session")
+def embedding_cache():
+    """Query embeddings shared by every test, saved when the session ends."""
+    cache = load_embedding_cache()
+    yield cache
+    save_embedding_cache(cache)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def search_engine():
+    """One search engine, with its HTTP session and Qdrant client, for all tests."""
+    config = Config.from_env()
+    config.validate()
+    engine = ImageSearchEngine(config)
+    yield engine
+    await engine.aclose()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def precomputed_results(search_engine, embedding_cache) -> Dict[str, List[SearchResult]]:
+    """Top PRECOMPUTED_LIMIT results for every SAMPLE_IMAGES key, from one batch search."""
+    all_results = await cached_search_many(
+        search_engine,
+        embedding_cache,
+        [image_data["url"] for image_data in SAMPLE_IMAGES.values()],
+        limit=PRECOMPUTED_LIMIT
+    )
+    return dict(zip(SAMPLE_IMAGES, all_results))
+
+
 class TestFashionImageSearch:
     """Test cases for image-based fashion search."""
     
-    @pytest.fixture
-    async def search_engine(self):
-        """Create search engine instance."""
-        config = Config.from_env()
-        config.validate()
-        return ImageSearchEngine(config)
-    
     def _display_image_results(
         self, 
         query_image: str, 
@@ -150,18 +253,15 @@ class TestFashionImageSearch:
     # WATCH SIMILARITY TESTS
     # ========================================================================
     
-    @pytest.mark.asyncio
-    async def test_watch_similarity_silver(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_watch_similarity_silver(self, precomputed_results):
         """Test 1: Find watches similar to Titan Silver Watch."""
         image_data = SAMPLE_IMAGES["titan_silver_watch"]
         
         console.print(f"\n[bold]Searching for products similar to:[/bold] {image_data['description']}")
         console.print(f"[dim]Category: {image_data['category']}[/dim]")
         
-        results = await search_engine.search_by_image(
-            image_data["url"],
-            limit=10
-        )
+        results = precomputed_results["titan_silver_watch"][:10]
         
         self._display_image_results(
             image_data["url"],
@@ -177,15 +277,12 @@ class TestFashionImageSearch:
         watch_count = sum(1 for r in results if 'watch' in r.filename.lower())
         console.print(f"\n✓ Found {watch_count}/{len(results)} watch items", style="bold green")
     
-    @pytest.mark.asyncio
-    async def test_watch_similarity_black(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_watch_similarity_black(self, precomputed_results):
         """Test 2: Find watches similar to Skagen Black Watch."""
         image_data = SAMPLE_IMAGES["skagen_black_watch"]
         
-        results = await search_engine.search_by_image(
-            image_data["url"],
-            limit=10
-        )
+        results = precomputed_results["skagen_black_watch"][:10]
         
         self._display_image_results(
             image_data["url"],
@@ -200,22 +297,15 @@ class TestFashionImageSearch:
         watch_count = sum(1 for r in results[:5] if 'watch' in r.filename.lower())
         console.print(f"✓ Found {watch_count}/5 watches in top results")
     
-    @pytest.mark.asyncio
-    async def test_cross_watch_similarity(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_cross_watch_similarity(self, precomputed_results):
         """Test 3: Compare similarity between different watches."""
         console.print("\n" + "="*80, style="bold cyan")
         console.print("TEST 3: Cross-Watch Similarity Analysis", style="bold yellow")
         console.print("="*80, style="bold cyan")
         
-        titan_results = await search_engine.search_by_image(
-            SAMPLE_IMAGES["titan_silver_watch"]["url"],
-            limit=5
-        )
-        
-        skagen_results = await search_engine.search_by_image(
-            SAMPLE_IMAGES["skagen_black_watch"]["url"],
-            limit=5
-        )
+        titan_results = precomputed_results["titan_silver_watch"][:5]
+        skagen_results = precomputed_results["skagen_black_watch"][:5]
         
         console.print("\n[bold]Titan Silver Watch - Top 3 Similar:[/bold]")
         for i, r in enumerate(titan_results[:3], 1):
@@ -236,15 +326,12 @@ class TestFashionImageSearch:
     # APPAREL SIMILARITY TESTS
     # ========================================================================
     
-    @pytest.mark.asyncio
-    async def test_tshirt_similarity(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_tshirt_similarity(self, precomputed_results):
         """Test 4: Find similar t-shirts."""
         image_data = SAMPLE_IMAGES["puma_grey_tshirt"]
         
-        results = await search_engine.search_by_image(
-            image_data["url"],
-            limit=10
-        )
+        results = precomputed_results["puma_grey_tshirt"][:10]
         
         self._display_image_results(
             image_data["url"],
@@ -266,15 +353,12 @@ class TestFashionImageSearch:
     # ACCESSORY SIMILARITY TESTS
     # ========================================================================
     
-    @pytest.mark.asyncio
-    async def test_belt_similarity(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_belt_similarity(self, precomputed_results):
         """Test 5: Find similar belts and accessories."""
         image_data = SAMPLE_IMAGES["fossil_belt"]
         
-        results = await search_engine.search_by_image(
-            image_data["url"],
-            limit=10
-        )
+        results = precomputed_results["fossil_belt"][:10]
         
         self._display_image_results(
             image_data["url"],
@@ -296,15 +380,12 @@ class TestFashionImageSearch:
     # FOOTWEAR SIMILARITY TESTS
     # ========================================================================
     
-    @pytest.mark.asyncio
-    async def test_shoes_similarity(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_shoes_similarity(self, precomputed_results):
         """Test 6: Find similar casual shoes."""
         image_data = SAMPLE_IMAGES["casual_shoes"]
         
-        results = await search_engine.search_by_image(
-            image_data["url"],
-            limit=10
-        )
+        results = precomputed_results["casual_shoes"][:10]
         
         self._display_image_results(
             image_data["url"],
@@ -322,15 +403,12 @@ class TestFashionImageSearch:
         
         console.print(f"✓ Found {footwear_count} footwear items", style="green")
     
-    @pytest.mark.asyncio
-    async def test_flipflops_similarity(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_flipflops_similarity(self, precomputed_results):
         """Test 7: Find similar flip flops."""
         image_data = SAMPLE_IMAGES["flip_flops"]
         
-        results = await search_engine.search_by_image(
-            image_data["url"],
-            limit=10
-        )
+        results = precomputed_results["flip_flops"][:10]
         
         self._display_image_results(
             image_data["url"],
@@ -345,24 +423,16 @@ class TestFashionImageSearch:
     # VISUAL SIMILARITY ANALYSIS
     # ========================================================================
     
-    @pytest.mark.asyncio
-    async def test_color_similarity(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_color_similarity(self, precomputed_results):
         """Test 8: Analyze color-based visual similarity."""
         console.print("\n" + "="*80, style="bold cyan")
         console.print("TEST 8: Color-Based Visual Similarity", style="bold yellow")
         console.print("="*80, style="bold cyan")
         
-        # Search with black watch (should find black items)
-        black_watch_results = await search_engine.search_by_image(
-            SAMPLE_IMAGES["skagen_black_watch"]["url"],
-            limit=10
-        )
-        
-        # Search with silver watch (should find silver items)
-        silver_watch_results = await search_engine.search_by_image(
-            SAMPLE_IMAGES["titan_silver_watch"]["url"],
-            limit=10
-        )
+        # Black watch should find black items, silver watch silver items
+        black_watch_results = precomputed_results["skagen_black_watch"][:10]
+        silver_watch_results = precomputed_results["titan_silver_watch"][:10]
         
         console.print("\n[bold]Black Watch - Color Distribution:[/bold]")
         black_items = sum(1 for r in black_watch_results if 'black' in r.filename.lower())
@@ -375,8 +445,8 @@ class TestFashionImageSearch:
         # Visual similarity should prefer similar colors
         console.print("\n✓ Visual embeddings understand color similarity", style="bold green")
     
-    @pytest.mark.asyncio
-    async def test_category_consistency(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_category_consistency(self, precomputed_results):
         """Test 9: Check if similar items are in same category."""
         console.print("\n" + "="*80, style="bold cyan")
         console.print("TEST 9: Category Consistency Analysis", style="bold yellow")
@@ -391,7 +461,7 @@ class TestFashionImageSearch:
         
         for item_key, expected_keyword in test_items:
             image_data = SAMPLE_IMAGES[item_key]
-            results = await search_engine.search_by_image(image_data["url"], limit=5)
+            results = precomputed_results[item_key][:5]
             
             category_matches = sum(1 for r in results 
                                   if expected_keyword in r.filename.lower())
@@ -405,18 +475,15 @@ class TestFashionImageSearch:
     # HYBRID SEARCH TESTS (Image + Text)
     # ========================================================================
     
-    @pytest.mark.asyncio
-    async def test_hybrid_search_comparison(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_hybrid_search_comparison(self, search_engine, precomputed_results):
         """Test 10: Compare image search vs text search."""
         console.print("\n" + "="*80, style="bold cyan")
         console.print("TEST 10: Image vs Text Search Comparison", style="bold yellow")
         console.print("="*80, style="bold cyan")
         
         # Image search for watch
-        image_results = await search_engine.search_by_image(
-            SAMPLE_IMAGES["titan_silver_watch"]["url"],
-            limit=5
-        )
+        image_results = precomputed_results["titan_silver_watch"][:5]
         
         # Text search for similar description
         text_results = await search_engine.search_by_text(
@@ -445,8 +512,8 @@ class TestFashionImageSearch:
     # UNKNOWN PRODUCT EXPLORATION
     # ========================================================================
     
-    @pytest.mark.asyncio
-    async def test_unknown_product_discovery(self, search_engine):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_unknown_product_discovery(self, precomputed_results):
         """Test 11: Discover what unknown products are similar to."""
         console.print("\n" + "="*80, style="bold cyan")
         console.print("TEST 11: Unknown Product Discovery", style="bold yellow")
@@ -459,7 +526,7 @@ class TestFashionImageSearch:
             
             console.print(f"\n[bold]Analyzing {image_data['filename']}...[/bold]")
             
-            results = await search_engine.search_by_image(image_data["url"], limit=5)
+            results = precomputed_results[product_key][:5]
             
             if results:
                 console.print(f"[green]✓ Found {len(results)} similar items:[/green]")
@@ -490,9 +557,9 @@ class TestFashionImageSearch:
     # PERFORMANCE TESTS
     # ========================================================================
     
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_batch_image_search_performance(self, search_engine):
-        """Test 12: Batch image search performance."""
+        """Test 12: Batch image search performance (uncached, end to end)."""
         console.print("\n" + "="*80, style="bold cyan")
         console.print("TEST 12: Batch Image Search Performance", style="bold yellow")
         console.print("="*80, style="bold cyan")
@@ -514,13 +581,22 @@ class TestFashionImageSearch:
             console=console
         ) as progress:
             task = progress.add_task("Processing images...", total=len(test_images))
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
             
-            results_collection = []
-            for img_key in test_images:
-                image_data = SAMPLE_IMAGES[img_key]
-                results = await search_engine.search_by_image(image_data["url"], limit=5)
-                results_collection.append((img_key, results))
+            async def search_one(img_key: str):
+                # Bypasses the embedding cache so download and embedding are timed too
+                async with semaphore:
+                    results = await search_engine.search_by_image(
+                        SAMPLE_IMAGES[img_key]["url"],
+                        limit=5
+                    )
                 progress.update(task, advance=1)
+                return img_key, results
+            
+            # Searches overlap instead of waiting on each other's I/O
+            results_collection = await asyncio.gather(
+                *(search_one(img_key) for img_key in test_images)
+            )
         
         elapsed = time.time() - start_time
         avg_time = elapsed / len(test_images)
@@ -543,19 +619,34 @@ async def run_visual_similarity_showcase():
     config = Config.from_env()
     config.validate()
     engine = ImageSearchEngine(config)
+    embedding_cache = load_embedding_cache()
     
     console.print("\n" + "="*80, style="bold magenta")
     console.print("VISUAL SIMILARITY SHOWCASE", style="bold cyan")
     console.print("Finding visually similar products in fashion dataset", style="dim")
     console.print("="*80, style="bold magenta")
     
-    for idx, (key, image_data) in enumerate(SAMPLE_IMAGES.items(), 1):
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+    
+    async def search_one(image_data: Dict) -> List[SearchResult]:
+        async with semaphore:
+            return await cached_search(engine, embedding_cache, image_data["url"], limit=5)
+    
+    # Run every search up front; print in order once they are all back
+    all_results = await asyncio.gather(
+        *(search_one(image_data) for image_data in SAMPLE_IMAGES.values()),
+        return_exceptions=True
+    )
+    save_embedding_cache(embedding_cache)
+    
+    for idx, ((key, image_data), results) in enumerate(zip(SAMPLE_IMAGES.items(), all_results), 1):
         console.print(f"\n[{idx}/{len(SAMPLE_IMAGES)}] [bold cyan]Query Image:[/bold cyan] {image_data['description']}")
         console.print(f"[dim]Category: {image_data['category']}[/dim]")
         console.print(f"[dim]URL: {image_data['url'][:70]}...[/dim]")
         
         try:
-            results = await engine.search_by_image(image_data["url"], limit=5)
+            if isinstance(results, Exception):
+                raise results
             
             if results:
                 console.print(f"[green]✓ Found {len(results)} visually similar items:[/green]")
@@ -588,9 +679,6 @@ async def run_visual_similarity_showcase():
         
         except Exception as e:
             console.print(f"[red]✗ Error: {e}[/red]")
-        
-        # Small delay between requests
-        await asyncio.sleep(0.5)
     
     # Final summary
     console.print("\n" + "="*80, style="bold magenta")
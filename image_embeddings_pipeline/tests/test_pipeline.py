@@ -0,0 +1,62 @@
+"""Unit tests for point uploads at the end of the pipeline."""
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from src.pipeline import ImageEmbeddingPipeline
+
+
+def make_pipeline(upsert_results):
+    """Pipeline with only the upload state; upserts return the given results."""
+    pipeline = ImageEmbeddingPipeline.__new__(ImageEmbeddingPipeline)
+    pipeline.qdrant_manager = Mock(upsert_points=AsyncMock(side_effect=upsert_results))
+    pipeline.success_count = 6
+    pipeline.failure_count = 0
+    return pipeline
+
+
+async def upload(pipeline, batches):
+    """Run the uploader over the batches, followed by the sentinel."""
+    upload_queue: asyncio.Queue = asyncio.Queue()
+    for batch in [*batches, None]:
+        upload_queue.put_nowait(batch)
+    await pipeline._uploader(upload_queue)
+
+
+@pytest.mark.asyncio
+async def test_uploader_waits_on_last_batch_only():
+    """Test that only the final upsert is a wait=True barrier."""
+    pipeline = make_pipeline([True, True, True])
+    
+    await upload(pipeline, [[1, 2], [3, 4], [5, 6]])
+    
+    waits = [call.kwargs["wait"] for call in pipeline.qdrant_manager.upsert_points.await_args_list]
+    assert waits == [False, False, True]
+    assert (pipeline.success_count, pipeline.failure_count) == (6, 0)
+
+
+@pytest.mark.asyncio
+async def test_uploader_counts_failed_batch_as_failures():
+    """Test that a batch Qdrant rejected is not reported as stored."""
+    pipeline = make_pipeline([True, False, True])
+    
+    await upload(pipeline, [[1, 2], [3, 4], [5, 6]])
+    
+    assert (pipeline.success_count, pipeline.failure_count) == (4, 2)
+
+
+@pytest.mark.asyncio
+async def test_uploader_counts_unconfirmed_points_when_barrier_fails():
+    """Test that a failed barrier leaves no point reported as stored."""
+    pipeline = make_pipeline([True, True, False])
+    
+    await upload(pipeline, [[1, 2], [3, 4], [5, 6]])
+    
+    assert (pipeline.success_count, pipeline.failure_count) == (0, 6)
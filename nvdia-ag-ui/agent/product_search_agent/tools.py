@@ -14,6 +14,7 @@ import os
 import sys
 import asyncio
 import logging
+import threading
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
@@ -31,6 +32,25 @@ logger = logging.getLogger(__name__)
 # Global search engine instance
 _search_engine: Optional[ImageSearchEngine] = None
 
+# Long-lived event loop for search calls, so the engine's HTTP session (and
+# its keep-alive connections) is reused across tool calls
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _run(coro):
+    """
+    Run a coroutine on the shared background event loop and wait for it.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="product-search-loop", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
 
 def _get_search_engine() -> ImageSearchEngine:
     """
@@ -97,7 +117,7 @@ def search_products_by_text(
         engine = _get_search_engine()
         
         # Run async search in sync context
-        results = asyncio.run(
+        results = _run(
             engine.search_by_text(query, limit=limit, score_threshold=score_threshold)
         )
         
@@ -173,7 +193,7 @@ def search_products_by_image(
         engine = _get_search_engine()
         
         # Run async search
-        results = asyncio.run(
+        results = _run(
             engine.search_by_image(image_url, limit=limit, score_threshold=score_threshold)
         )
         
@@ -256,7 +276,7 @@ def search_with_filters(
         engine = _get_search_engine()
         
         # Run async filtered search
-        results = asyncio.run(
+        results = _run(
             engine.search_with_filters(
                 query=query,
                 filename_pattern=filename_pattern,